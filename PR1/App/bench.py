@@ -0,0 +1,158 @@
+import argparse
+import random
+import threading
+import time
+from datetime import date, timedelta
+
+from gg import Database, SQLiteBackend, QueryStats
+
+DEPARTMENTS = (
+    'Отдел продаж', 'Бухгалтерия', 'IT отдел', 'Отдел кадров', 'Юридический отдел',
+    'Склад', 'Маркетинг', 'Служба безопасности', 'Производство', 'Логистика'
+)
+SUBJECTS = (
+    'Внедрение CRM системы', 'Обновление 1С', 'Покупка серверного оборудования',
+    'Автоматизация документооборота', 'Модернизация сети', 'Система видеонаблюдения',
+    'Портал самообслуживания', 'Резервное копирование', 'Аналитическая платформа', 'Электронный архив'
+)
+WORKLOAD = {'list': 40, 'get': 30, 'add': 10, 'update': 10, 'delete': 5, 'report': 5}
+
+def make_proposal(rng):
+    return {
+        'department': rng.choice(DEPARTMENTS),
+        'proposal_text': f"{rng.choice(SUBJECTS)} №{rng.randint(1, 100000)}",
+        'priority': rng.choice(Database.PRIORITIES),
+        'cost': round(rng.uniform(10000, 5000000), 2),
+        'justification': ' '.join(rng.choice(SUBJECTS).lower() for _ in range(rng.randint(3, 15))),
+        'implementation_date': (date(2024, 1, 1) + timedelta(days=rng.randint(0, 1095))).isoformat()
+    }
+
+def populate(db, count, seed, batch_size=1000):
+    rng = random.Random(seed)
+    
+    def batches():
+        for start in range(0, count, batch_size):
+            yield [db.proposal_values(make_proposal(rng)) for _ in range(min(batch_size, count - start))]
+    
+    start = time.perf_counter()
+    inserted = db.backend.insert_many(batches())
+    return inserted, time.perf_counter() - start
+
+class Worker(threading.Thread):
+    def __init__(self, db, operations, max_id, seed, deadline=None):
+        super().__init__(daemon=True)
+        self.db = db
+        self.operations = operations
+        self.max_id = max_id
+        self.deadline = deadline
+        self.rng = random.Random(seed)
+        self.added = []
+        self.latencies = {name: [] for name in WORKLOAD}
+        self.failures = {name: 0 for name in WORKLOAD}
+    
+    def run(self):
+        names = list(WORKLOAD)
+        weights = [WORKLOAD[name] for name in names]
+        done = 0
+        while done < self.operations and (self.deadline is None or time.perf_counter() < self.deadline):
+            name = self.rng.choices(names, weights)[0]
+            if name == 'delete' and not self.added:
+                name = 'add'
+            start = time.perf_counter()
+            ok = getattr(self, f"op_{name}")()
+            self.latencies[name].append(time.perf_counter() - start)
+            if not ok:
+                self.failures[name] += 1
+            done += 1
+    
+    def op_list(self):
+        after_id = self.rng.randint(0, self.max_id)
+        filters = {'priority': self.rng.choice(Database.PRIORITIES)} if self.rng.random() < 0.3 else None
+        self.db.get_proposals_page(after_id=after_id, limit=100, filters=filters)
+        return True
+    
+    def op_get(self):
+        return self.db.get_proposal(self.rng.randint(1, self.max_id)) is not None
+    
+    def op_add(self):
+        proposal_id = self.db.add_proposal(make_proposal(self.rng))
+        if proposal_id is not None:
+            self.added.append(proposal_id)
+        return proposal_id is not None
+    
+    def op_update(self):
+        return self.db.update_proposal(self.rng.randint(1, self.max_id), make_proposal(self.rng))
+    
+    def op_delete(self):
+        return self.db.delete_proposal(self.added.pop(self.rng.randrange(len(self.added))))
+    
+    def op_report(self):
+        summary = self.db.get_report_summary()
+        for _ in self.db.iter_proposals():
+            pass
+        return summary is not None
+
+def run_workload(db, threads, operations, max_id, seed, duration=None):
+    deadline = time.perf_counter() + duration if duration else None
+    workers = [Worker(db, operations, max_id, seed + index, deadline) for index in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    
+    latencies = {name: [] for name in WORKLOAD}
+    failures = {name: 0 for name in WORKLOAD}
+    for worker in workers:
+        for name in WORKLOAD:
+            latencies[name].extend(worker.latencies[name])
+            failures[name] += worker.failures[name]
+    return latencies, failures, elapsed
+
+def print_report(latencies, failures, elapsed):
+    print(f"{'Операция':<10}{'Кол-во':>9}{'Ошибок':>8}{'оп/с':>10}{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}{'Макс, мс':>10}")
+    total = 0
+    for name, samples in latencies.items():
+        total += len(samples)
+        if not samples:
+            continue
+        samples.sort()
+        print(f"{name:<10}{len(samples):>9}{failures[name]:>8}{len(samples) / elapsed:>10.1f}"
+              f"{QueryStats.percentile(samples, 0.50) * 1000:>10.2f}"
+              f"{QueryStats.percentile(samples, 0.95) * 1000:>10.2f}"
+              f"{QueryStats.percentile(samples, 0.99) * 1000:>10.2f}"
+              f"{samples[-1] * 1000:>10.2f}")
+    print(f"Всего: {total} операций за {elapsed:.2f} с ({total / elapsed:.1f} оп/с)")
+
+def print_query_stats(db):
+    print(f"\n{'Тип':<8}{'Запрос':<24}{'Вызовов':>9}{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}")
+    for entry in db.get_query_stats():
+        print(f"{entry['kind']:<8}{entry['name']:<24}{entry['count']:>9}"
+              f"{entry['p50'] * 1000:>10.2f}{entry['p95'] * 1000:>10.2f}{entry['p99'] * 1000:>10.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест базы предложений")
+    parser.add_argument('--proposals', type=int, default=10000, help="количество синтетических предложений")
+    parser.add_argument('--threads', type=int, default=4, help="количество потоков нагрузки")
+    parser.add_argument('--operations', type=int, default=2000, help="операций на поток")
+    parser.add_argument('--duration', type=float, default=None, help="ограничение по времени, с")
+    parser.add_argument('--db', default=':memory:', help="файл SQLite (по умолчанию в памяти)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--queries', action='store_true', help="вывести статистику по запросам")
+    args = parser.parse_args()
+    
+    db = Database(backend=SQLiteBackend(args.db))
+    inserted, elapsed = populate(db, args.proposals, args.seed)
+    print(f"Сгенерировано предложений: {inserted} за {elapsed:.2f} с ({inserted / elapsed:.0f} строк/с)")
+    max_id = db.backend.count()
+    db.stats.reset()
+    
+    latencies, failures, elapsed = run_workload(db, args.threads, args.operations, max_id, args.seed, args.duration)
+    print_report(latencies, failures, elapsed)
+    if args.queries:
+        print_query_stats(db)
+    db.backend.close()
+
+if __name__ == "__main__":
+    main()
@@ -3,170 +3,1835 @@ from tkinter import ttk, messagebox, scrolledtext
 import pymysql
 from datetime import datetime
 from tkinter import filedialog
+import threading
+import bisect
+import time
+import uuid
+import csv
+import os
+import json
+import sqlite3
+import queue
+import re
+import zipfile
+import logging
+import functools
+from logging.handlers import RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from collections import OrderedDict, deque
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+class ConnectionPool:
+    def __init__(self, max_size=5, checkout_timeout=10, health_check_interval=30, **connect_args):
+        self.connect_args = connect_args
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+        self.idle = []
+        self.size = 0
+        self.lock = threading.Condition()
+        self.stats = {
+            'checkouts': 0,
+            'created': 0,
+            'reused': 0,
+            'reconnects': 0,
+            'discarded': 0,
+            'wait_total': 0.0,
+            'wait_max': 0.0
+        }
+    
+    def acquire(self):
+        start = time.perf_counter()
+        deadline = start + self.checkout_timeout
+        with self.lock:
+            while not self.idle and self.size >= self.max_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise pymysql.OperationalError(0, "Превышено время ожидания свободного соединения")
+                self.lock.wait(remaining)
+            
+            waited = time.perf_counter() - start
+            self.stats['checkouts'] += 1
+            self.stats['wait_total'] += waited
+            self.stats['wait_max'] = max(self.stats['wait_max'], waited)
+            
+            if self.idle:
+                connection, released_at = self.idle.pop()
+                self.stats['reused'] += 1
+            else:
+                connection, released_at = None, None
+                self.size += 1
+        
+        try:
+            if connection is None:
+                connection = self.create_connection()
+            elif time.monotonic() - released_at > self.health_check_interval:
+                connection = self.check_health(connection)
+        except pymysql.Error:
+            self.release(None, broken=True)
+            raise
+        return connection
+    
+    def create_connection(self):
+        connection = pymysql.connect(**self.connect_args)
+        with self.lock:
+            self.stats['created'] += 1
+        return connection
+    
+    def check_health(self, connection):
+        try:
+            connection.ping(reconnect=False)
+            return connection
+        except pymysql.Error:
+            try:
+                connection.close()
+            except pymysql.Error:
+                pass
+            with self.lock:
+                self.stats['reconnects'] += 1
+            return self.create_connection()
+    
+    def release(self, connection, broken=False):
+        with self.lock:
+            if broken or connection is None or not connection.open:
+                self.size -= 1
+                if connection is not None:
+                    self.stats['discarded'] += 1
+                    try:
+                        connection.close()
+                    except pymysql.Error:
+                        pass
+            else:
+                self.idle.append((connection, time.monotonic()))
+            self.lock.notify()
+    
+    @contextmanager
+    def connection(self):
+        connection = self.acquire()
+        broken = False
+        try:
+            yield connection
+        except (pymysql.OperationalError, pymysql.InterfaceError):
+            broken = True
+            raise
+        except BaseException:
+            # любая ошибка внутри транзакции: соединение возвращается в пул без открытой транзакции
+            try:
+                connection.rollback()
+            except pymysql.Error:
+                broken = True
+            raise
+        finally:
+            self.release(connection, broken)
+    
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['size'] = self.size
+            stats['idle'] = len(self.idle)
+        stats['wait_avg'] = stats['wait_total'] / stats['checkouts'] if stats['checkouts'] else 0.0
+        return stats
+    
+    def close_all(self):
+        with self.lock:
+            while self.idle:
+                connection, _ = self.idle.pop()
+                self.size -= 1
+                try:
+                    connection.close()
+                except pymysql.Error:
+                    pass
+
+class ProposalCache:
+    def __init__(self, max_size=256, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'evictions': 0}
+    
+    def get(self, key, validator=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            value, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self.entries[key]
+                self.stats['misses'] += 1
+                return None
+            self.entries.move_to_end(key)
+        
+        if validator is not None and not validator(value):
+            with self.lock:
+                self.entries.pop(key, None)
+                self.stats['stale'] += 1
+                self.stats['misses'] += 1
+            return None
+        
+        with self.lock:
+            self.stats['hits'] += 1
+        return dict(value)
+    
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (dict(value), time.monotonic())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.stats['evictions'] += 1
+    
+    def invalidate(self, key=None):
+        with self.lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+    
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self.entries)
+        requests = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / requests if requests else 0.0
+        return stats
+
+class QueryStats:
+    def __init__(self, slow_threshold=0.5, log_path=None, max_samples=1000, max_bytes=1024 * 1024, backup_count=3):
+        self.slow_threshold = slow_threshold
+        self.max_samples = max_samples
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.slow_log = None
+        if log_path:
+            self.slow_log = logging.getLogger(f"slow_queries.{os.path.abspath(log_path)}")
+            self.slow_log.propagate = False
+            self.slow_log.setLevel(logging.INFO)
+            if not self.slow_log.handlers:
+                handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+                handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+                self.slow_log.addHandler(handler)
+    
+    @staticmethod
+    def classify(sql):
+        words = sql.split(None, 1)
+        verb = words[0].upper() if words else '?'
+        match = re.search(r'\b(?:FROM|INTO|UPDATE)\s+(\w+)', sql, re.IGNORECASE)
+        return f"{verb} {match.group(1)}" if match else verb
+    
+    @staticmethod
+    def measure(rows):
+        size = 0
+        for row in rows:
+            for value in (row.values() if isinstance(row, dict) else row):
+                if isinstance(value, str):
+                    size += len(value.encode('utf-8'))
+                elif isinstance(value, bytes):
+                    size += len(value)
+                elif value is not None:
+                    size += 8
+        return size
+    
+    def record(self, kind, name, elapsed, rows=0, size=0):
+        with self.lock:
+            entry = self.entries.get((kind, name))
+            if entry is None:
+                entry = self.entries[(kind, name)] = {
+                    'samples': deque(maxlen=self.max_samples),
+                    'count': 0, 'total': 0.0, 'max': 0.0, 'rows': 0, 'bytes': 0, 'slow': 0
+                }
+            entry['samples'].append(elapsed)
+            entry['count'] += 1
+            entry['total'] += elapsed
+            entry['max'] = max(entry['max'], elapsed)
+            entry['rows'] += rows
+            entry['bytes'] += size
+            slow = elapsed >= self.slow_threshold
+            if slow:
+                entry['slow'] += 1
+        return slow
+    
+    def log_slow(self, name, elapsed, sql, params, rows, plan):
+        if not self.slow_log:
+            return
+        lines = [f"{elapsed*1000:.1f} мс [{name}] строк: {rows}", ' '.join(sql.split())]
+        if params:
+            lines.append(f"параметры: {repr(params)[:500]}")
+        lines.extend(f"  {step}" for step in plan)
+        self.slow_log.info('\n'.join(lines))
+    
+    @staticmethod
+    def percentile(samples, fraction):
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+    
+    def get_stats(self):
+        with self.lock:
+            snapshot = [(key, dict(entry, samples=sorted(entry['samples']))) for key, entry in self.entries.items()]
+        stats = []
+        for (kind, name), entry in sorted(snapshot):
+            samples = entry.pop('samples')
+            entry.update(
+                kind=kind,
+                name=name,
+                avg=entry['total'] / entry['count'],
+                p50=self.percentile(samples, 0.50),
+                p95=self.percentile(samples, 0.95),
+                p99=self.percentile(samples, 0.99)
+            )
+            stats.append(entry)
+        return stats
+    
+    def reset(self):
+        with self.lock:
+            self.entries.clear()
+
+class TimedCursor:
+    EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+    
+    def __init__(self, cursor, stats, explain_prefix='EXPLAIN'):
+        self.cursor = cursor
+        self.stats = stats
+        self.explain_prefix = explain_prefix
+        self.current = None
+    
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+    
+    def execute(self, sql, params=None):
+        self.finish()
+        start = time.perf_counter()
+        result = self.cursor.execute(sql, params) if params is not None else self.cursor.execute(sql)
+        self.current = {'sql': sql, 'params': params, 'elapsed': time.perf_counter() - start, 'rows': 0, 'bytes': 0}
+        if self.cursor.description is None:
+            self.current['rows'] = max(self.cursor.rowcount, 0)
+            self.finish()
+        return self if result is self.cursor else result
+    
+    def executemany(self, sql, seq_of_params):
+        self.finish()
+        seq_of_params = list(seq_of_params)
+        start = time.perf_counter()
+        result = self.cursor.executemany(sql, seq_of_params)
+        elapsed = time.perf_counter() - start
+        self.stats.record('sql', self.stats.classify(sql), elapsed, rows=len(seq_of_params))
+        return self if result is self.cursor else result
+    
+    def add_fetched(self, rows, start):
+        if self.current is not None:
+            self.current['elapsed'] += time.perf_counter() - start
+            self.current['rows'] += len(rows)
+            self.current['bytes'] += self.stats.measure(rows)
+    
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self.cursor.fetchone()
+        self.add_fetched([row] if row is not None else [], start)
+        self.finish()
+        return row
+    
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self.cursor.fetchall()
+        self.add_fetched(rows, start)
+        self.finish()
+        return rows
+    
+    def fetchmany(self, size):
+        start = time.perf_counter()
+        rows = self.cursor.fetchmany(size)
+        self.add_fetched(rows, start)
+        if not rows:
+            self.finish()
+        return rows
+    
+    def explain(self, sql, params):
+        if sql.split(None, 1)[0].upper() not in self.EXPLAINABLE:
+            return []
+        try:
+            self.cursor.execute(f"{self.explain_prefix} {sql}", params if params is not None else ())
+            return [' | '.join(str(value) for value in (row.values() if isinstance(row, dict) else row))
+                    for row in self.cursor.fetchall()]
+        except DB_ERRORS as e:
+            return [f"EXPLAIN недоступен: {e}"]
+    
+    def finish(self):
+        current, self.current = self.current, None
+        if current is None:
+            return
+        name = self.stats.classify(current['sql'])
+        if self.stats.record('sql', name, current['elapsed'], current['rows'], current['bytes']) and self.stats.slow_log:
+            plan = self.explain(current['sql'], current['params'])
+            self.stats.log_slow(name, current['elapsed'], current['sql'], current['params'], current['rows'], plan)
+    
+    def close(self):
+        self.finish()
+        self.cursor.close()
+
+def timed(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        result = method(self, *args, **kwargs)
+        rows = len(result) if isinstance(result, list) else int(result is not None)
+        self.stats.record('method', method.__name__, time.perf_counter() - start, rows=rows)
+        return result
+    return wrapper
+
+DB_ERRORS = (pymysql.Error, sqlite3.Error)
+
+class StorageBackend(ABC):
+    name = 'base'
+    placeholder = '%s'
+    explain_prefix = 'EXPLAIN'
+    online = True
+    listener = None
+    error_handler = None
+    stats = None
+    EDITABLE_COLUMNS = ('department', 'proposal_text', 'priority', 'cost', 'justification', 'implementation_date')
+    
+    def connect(self):
+        pass
+    
+    @abstractmethod
+    def create_schema(self):
+        pass
+    
+    @abstractmethod
+    def count(self):
+        pass
+    
+    @abstractmethod
+    def get_all(self):
+        pass
+    
+    @abstractmethod
+    def get_page(self, after_id=None, before_id=None, limit=100, filters=None):
+        pass
+    
+    @abstractmethod
+    def search(self, text, filters=None, limit=100, offset=0):
+        pass
+    
+    @abstractmethod
+    def get_departments(self):
+        pass
+    
+    @abstractmethod
+    def get_summary(self):
+        pass
+    
+    @abstractmethod
+    def iter_rows(self, batch_size=500, after_id=None):
+        pass
+    
+    @abstractmethod
+    def get_row(self, proposal_id):
+        pass
+    
+    @abstractmethod
+    def get_version(self, proposal_id):
+        pass
+    
+    @abstractmethod
+    def insert(self, values):
+        pass
+    
+    @abstractmethod
+    def insert_many(self, batches):
+        pass
+    
+    @abstractmethod
+    def update(self, proposal_id, changes, expected_version=None):
+        pass
+    
+    @abstractmethod
+    def update_many(self, ids, changes):
+        pass
+    
+    @abstractmethod
+    def delete(self, proposal_id):
+        pass
+    
+    def get_pool_stats(self):
+        return None
+    
+    def instrument(self, stats):
+        self.stats = stats
+    
+    def timed_cursor(self, cursor):
+        if self.stats is None:
+            return cursor
+        return TimedCursor(cursor, self.stats, self.explain_prefix)
+    
+    def get_status(self):
+        return {'backend': self.name, 'online': self.online, 'pending': 0}
+    
+    def notify(self, action, proposal_id, row=None):
+        if self.listener:
+            self.listener(action, proposal_id, row)
+    
+    def report_error(self, title, message):
+        if self.error_handler:
+            self.error_handler(title, message)
+    
+    def close(self):
+        pass
+    
+    def build_filters(self, filters):
+        conditions = []
+        params = []
+        mark = self.placeholder
+        if filters.get('department'):
+            conditions.append(f"department = {mark}")
+            params.append(filters['department'])
+        if filters.get('priority'):
+            conditions.append(f"priority = {mark}")
+            params.append(filters['priority'])
+        if filters.get('cost_min') is not None:
+            conditions.append(f"cost >= {mark}")
+            params.append(filters['cost_min'])
+        if filters.get('cost_max') is not None:
+            conditions.append(f"cost <= {mark}")
+            params.append(filters['cost_max'])
+        if filters.get('date_from'):
+            conditions.append(f"implementation_date >= {mark}")
+            params.append(filters['date_from'])
+        if filters.get('date_to'):
+            conditions.append(f"implementation_date <= {mark}")
+            params.append(filters['date_to'])
+        return conditions, params
+    
+    def prepare_changes(self, changes):
+        unknown = set(changes) - set(self.EDITABLE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Недопустимые поля: {', '.join(sorted(unknown))}")
+        return dict(changes)
+    
+    def build_update_query(self, proposal_id, changes, expected_version=None):
+        mark = self.placeholder
+        changes = self.prepare_changes(changes)
+        assignments = [f"{column} = {mark}" for column in changes] + ["version = version + 1"]
+        params = list(changes.values()) + [proposal_id]
+        conditions = [f"id = {mark}"]
+        if expected_version is not None:
+            conditions.append(f"version = {mark}")
+            params.append(expected_version)
+        return f"UPDATE proposals SET {', '.join(assignments)} WHERE {' AND '.join(conditions)}", params
+    
+    def build_batch_update_query(self, ids, changes):
+        mark = self.placeholder
+        changes = self.prepare_changes(changes)
+        assignments = [f"{column} = {mark}" for column in changes] + ["version = version + 1"]
+        query = f"UPDATE proposals SET {', '.join(assignments)} WHERE id IN ({', '.join(mark for _ in ids)})"
+        return query, list(changes.values()) + list(ids)
+    
+    def execute_update(self, cursor, proposal_id, changes, expected_version=None):
+        query, params = self.build_update_query(proposal_id, changes, expected_version)
+        cursor.execute(query, params)
+        return cursor.rowcount > 0
+    
+    def execute_batch_update(self, cursor, ids, changes, chunk_size=500):
+        updated = 0
+        for start in range(0, len(ids), chunk_size):
+            query, params = self.build_batch_update_query(ids[start:start + chunk_size], changes)
+            cursor.execute(query, params)
+            updated += cursor.rowcount
+        return updated
+    
+    def build_page_query(self, list_columns, after_id, before_id, limit, filters):
+        mark = self.placeholder
+        conditions, params = self.build_filters(filters or {})
+        order = "ASC"
+        if before_id is not None:
+            conditions.append(f"id < {mark}")
+            params.append(before_id)
+            order = "DESC"
+        elif after_id is not None:
+            conditions.append(f"id > {mark}")
+            params.append(after_id)
+        # без нижней границы: несинхронизированные записи автономного режима имеют отрицательные id
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+        query = f"SELECT {list_columns} FROM proposals {where} ORDER BY id {order} LIMIT {mark}"
+        return query, params
+
+class MySQLBackend(StorageBackend):
+    name = 'mysql'
+    LIST_COLUMNS = "id, department, LEFT(proposal_text, 255) AS proposal_text, priority, cost"
+    INDEXES = {
+        'ft_proposals_text': "ALTER TABLE proposals ADD FULLTEXT INDEX ft_proposals_text (proposal_text, justification)",
+        'idx_department_priority': "CREATE INDEX idx_department_priority ON proposals (department, priority)",
+        'idx_priority_cost': "CREATE INDEX idx_priority_cost ON proposals (priority, cost)",
+        'idx_cost': "CREATE INDEX idx_cost ON proposals (cost)",
+        'idx_implementation_date': "CREATE INDEX idx_implementation_date ON proposals (implementation_date)",
+        'idx_updated_at': "CREATE INDEX idx_updated_at ON proposals (updated_at, id)"
+    }
+    EXTRA_COLUMNS = {
+        'updated_at': "ALTER TABLE proposals ADD COLUMN updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)",
+        'version': "ALTER TABLE proposals ADD COLUMN version INT NOT NULL DEFAULT 1",
+        'client_key': "ALTER TABLE proposals ADD COLUMN client_key VARCHAR(64) NULL UNIQUE"
+    }
+    INSERT_QUERY = """
+        INSERT INTO proposals (department, proposal_text, priority, cost, justification, implementation_date)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """
+    UPDATE_QUERY = """
+        UPDATE proposals 
+        SET department=%s, proposal_text=%s, priority=%s,
+            cost=%s, justification=%s, implementation_date=%s
+        WHERE id=%s
+    """
+    # повторная отправка записи журнала не создает дубликат: строка с тем же client_key остается
+    SYNC_INSERT_QUERY = """
+        INSERT INTO proposals (department, proposal_text, priority, cost, justification, implementation_date, client_key)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE client_key = client_key
+    """
+    DELETE_QUERY = "DELETE FROM proposals WHERE id = %s"
+    
+    def __init__(self, pool_size=5, **connect_args):
+        settings = {
+            'host': 'localhost',
+            'user': 'root',
+            'password': 'root',
+            'database': 'expansion_proposals',
+            'charset': 'utf8mb4',
+            'cursorclass': pymysql.cursors.DictCursor
+        }
+        settings.update(connect_args)
+        self.pool = ConnectionPool(max_size=pool_size, **settings)
+    
+    @contextmanager
+    def transaction(self):
+        with self.pool.connection() as connection:
+            with self.timed_cursor(connection.cursor()) as cursor:
+                yield cursor
+            connection.commit()
+    
+    def query(self, sql, params=None, one=False):
+        with self.pool.connection() as connection:
+            with self.timed_cursor(connection.cursor()) as cursor:
+                cursor.execute(sql, params)
+                return cursor.fetchone() if one else cursor.fetchall()
+    
+    def connect(self):
+        with self.pool.connection():
+            pass
+    
+    def create_schema(self):
+        with self.transaction() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS proposals (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    department VARCHAR(100) NOT NULL,
+                    proposal_text TEXT NOT NULL,
+                    priority ENUM('Высокий', 'Средний', 'Низкий') DEFAULT 'Средний',
+                    cost DECIMAL(10, 2),
+                    justification TEXT,
+                    implementation_date DATE,
+                    created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+                    version INT NOT NULL DEFAULT 1,
+                    client_key VARCHAR(64) UNIQUE
+                )
+            """)
+            # журнал удалений: клиенты с локальной копией узнают о строках, удаленных другими
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS proposal_deletions (
+                    seq BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    id INT NOT NULL,
+                    deleted_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6)
+                )
+            """)
+            self.create_columns(cursor)
+            self.create_indexes(cursor)
+            self.create_triggers(cursor)
+    
+    def create_triggers(self, cursor):
+        cursor.execute("""
+            SELECT TRIGGER_NAME AS name
+            FROM information_schema.TRIGGERS
+            WHERE TRIGGER_SCHEMA = DATABASE() AND EVENT_OBJECT_TABLE = 'proposals'
+        """)
+        if 'trg_proposals_deleted' not in {row['name'] for row in cursor.fetchall()}:
+            cursor.execute("""
+                CREATE TRIGGER trg_proposals_deleted AFTER DELETE ON proposals
+                FOR EACH ROW INSERT INTO proposal_deletions (id) VALUES (OLD.id)
+            """)
+    
+    def create_columns(self, cursor):
+        cursor.execute("""
+            SELECT COLUMN_NAME AS name
+            FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'proposals'
+        """)
+        existing = {row['name'] for row in cursor.fetchall()}
+        for name, ddl in self.EXTRA_COLUMNS.items():
+            if name not in existing:
+                cursor.execute(ddl)
+    
+    def create_indexes(self, cursor):
+        cursor.execute("""
+            SELECT DISTINCT INDEX_NAME AS name
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'proposals'
+        """)
+        existing = {row['name'] for row in cursor.fetchall()}
+        for name, ddl in self.INDEXES.items():
+            if name not in existing:
+                cursor.execute(ddl)
+    
+    def count(self):
+        return self.query("SELECT COUNT(*) AS count FROM proposals", one=True)['count']
+    
+    def get_all(self):
+        return self.query("SELECT * FROM proposals ORDER BY id")
+    
+    def get_page(self, after_id=None, before_id=None, limit=100, filters=None):
+        query, params = self.build_page_query(self.LIST_COLUMNS, after_id, before_id, limit, filters)
+        rows = self.query(query, params)
+        return list(reversed(rows)) if before_id is not None else rows
+    
+    def search(self, text, filters=None, limit=100, offset=0):
+        match = "MATCH(proposal_text, justification) AGAINST (%s IN NATURAL LANGUAGE MODE)"
+        conditions, params = self.build_filters(filters or {})
+        conditions.insert(0, match)
+        query = f"""
+            SELECT {self.LIST_COLUMNS}, {match} AS relevance
+            FROM proposals
+            WHERE {' AND '.join(conditions)}
+            ORDER BY relevance DESC, id
+            LIMIT %s OFFSET %s
+        """
+        return self.query(query, [text, text] + params + [limit, offset])
+    
+    def get_departments(self):
+        rows = self.query("SELECT DISTINCT department FROM proposals ORDER BY department")
+        return [row['department'] for row in rows]
+    
+    def get_summary(self):
+        with self.transaction() as cursor:
+            cursor.execute("""
+                SELECT COUNT(*) AS total,
+                       COALESCE(SUM(priority = 'Высокий'), 0) AS high_priority,
+                       COALESCE(SUM(cost), 0) AS total_cost
+                FROM proposals
+            """)
+            summary = cursor.fetchone()
+            
+            cursor.execute("""
+                SELECT priority, COUNT(*) AS count, COALESCE(SUM(cost), 0) AS total_cost
+                FROM proposals
+                GROUP BY priority
+                ORDER BY priority
+            """)
+            summary['by_priority'] = cursor.fetchall()
+            
+            cursor.execute("""
+                SELECT department, COUNT(*) AS count,
+                       COALESCE(SUM(priority = 'Высокий'), 0) AS high_priority,
+                       COALESCE(SUM(cost), 0) AS total_cost
+                FROM proposals
+                GROUP BY department
+                ORDER BY total_cost DESC
+            """)
+            summary['by_department'] = cursor.fetchall()
+            
+            cursor.execute("""
+                SELECT DATE_FORMAT(implementation_date, '%Y-%m') AS month,
+                       COUNT(*) AS count, COALESCE(SUM(cost), 0) AS total_cost
+                FROM proposals
+                WHERE implementation_date IS NOT NULL
+                GROUP BY month
+                ORDER BY month
+            """)
+            summary['by_month'] = cursor.fetchall()
+        return summary
+    
+    def iter_rows(self, batch_size=500, after_id=None):
+        with self.pool.connection() as connection:
+            cursor = self.timed_cursor(connection.cursor(pymysql.cursors.SSDictCursor))
+            try:
+                if after_id is None:
+                    cursor.execute("SELECT * FROM proposals ORDER BY id")
+                else:
+                    cursor.execute("SELECT * FROM proposals WHERE id > %s ORDER BY id", (after_id,))
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+                cursor.close()
+            except GeneratorExit:
+                try:
+                    connection.close()
+                except pymysql.Error:
+                    pass
+                raise
+    
+    def get_row(self, proposal_id):
+        return self.query("SELECT * FROM proposals WHERE id = %s", (proposal_id,), one=True)
+    
+    def get_version(self, proposal_id):
+        row = self.query("SELECT version FROM proposals WHERE id = %s", (proposal_id,), one=True)
+        return row['version'] if row else None
+    
+    def get_changed_since(self, updated_at, last_id, limit=1000):
+        if updated_at is None:
+            return self.query("SELECT * FROM proposals ORDER BY updated_at, id LIMIT %s", (limit,))
+        return self.query("""
+            SELECT * FROM proposals
+            WHERE updated_at > %s OR (updated_at = %s AND id > %s)
+            ORDER BY updated_at, id
+            LIMIT %s
+        """, (updated_at, updated_at, last_id, limit))
+    
+    def get_deleted_since(self, seq, limit=1000):
+        return self.query("SELECT seq, id FROM proposal_deletions WHERE seq > %s ORDER BY seq LIMIT %s", (seq, limit))
+    
+    def get_last_deletion(self):
+        return self.query("SELECT COALESCE(MAX(seq), 0) AS seq FROM proposal_deletions", one=True)['seq']
+    
+    def insert(self, values):
+        with self.transaction() as cursor:
+            cursor.execute(self.INSERT_QUERY, values)
+            return cursor.lastrowid
+    
+    def insert_many(self, batches):
+        inserted = 0
+        with self.transaction() as cursor:
+            for batch in batches:
+                cursor.executemany(self.INSERT_QUERY, batch)
+                inserted += len(batch)
+        return inserted
+    
+    def update(self, proposal_id, changes, expected_version=None):
+        with self.transaction() as cursor:
+            return self.execute_update(cursor, proposal_id, changes, expected_version)
+    
+    def update_many(self, ids, changes):
+        with self.transaction() as cursor:
+            return self.execute_batch_update(cursor, ids, changes)
+    
+    def delete(self, proposal_id):
+        with self.transaction() as cursor:
+            cursor.execute(self.DELETE_QUERY, (proposal_id,))
+    
+    def get_pool_stats(self):
+        return self.pool.get_stats()
+    
+    def close(self):
+        self.pool.close_all()
+
+class SQLiteBackend(StorageBackend):
+    name = 'sqlite'
+    placeholder = '?'
+    explain_prefix = 'EXPLAIN QUERY PLAN'
+    LIST_COLUMNS = "id, department, substr(proposal_text, 1, 255) AS proposal_text, priority, cost"
+    COLUMNS = ('id', 'department', 'proposal_text', 'priority', 'cost', 'justification',
+               'implementation_date', 'created_date', 'updated_at', 'version')
+    INSERT_QUERY = """
+        INSERT INTO proposals (id, department, proposal_text, priority, cost, justification, implementation_date, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        self.connection.row_factory = self.dict_factory
+        self.connection.create_function('match_score', 3, self.match_score, deterministic=True)
+    
+    @staticmethod
+    def dict_factory(cursor, row):
+        return {column[0]: value for column, value in zip(cursor.description, row)}
+    
+    @staticmethod
+    def match_score(proposal_text, justification, text):
+        haystack = f"{proposal_text or ''} {justification or ''}".lower()
+        return sum(haystack.count(term) for term in text.lower().split())
+    
+    @staticmethod
+    def adapt(values):
+        return tuple(float(value) if isinstance(value, Decimal) else value for value in values)
+    
+    @contextmanager
+    def transaction(self):
+        with self.lock:
+            cursor = self.timed_cursor(self.connection.cursor())
+            try:
+                yield cursor
+                self.connection.commit()
+            except BaseException:
+                self.connection.rollback()
+                raise
+            finally:
+                cursor.close()
+    
+    def query(self, sql, params=(), one=False):
+        with self.lock:
+            cursor = self.timed_cursor(self.connection.cursor())
+            try:
+                cursor.execute(sql, params)
+                return cursor.fetchone() if one else cursor.fetchall()
+            finally:
+                cursor.close()
+    
+    def create_schema(self):
+        with self.transaction() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS proposals (
+                    id INTEGER PRIMARY KEY,
+                    department TEXT NOT NULL,
+                    proposal_text TEXT NOT NULL,
+                    priority TEXT DEFAULT 'Средний' CHECK (priority IN ('Высокий', 'Средний', 'Низкий')),
+                    cost REAL,
+                    justification TEXT,
+                    implementation_date DATE,
+                    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP,
+                    version INTEGER DEFAULT 1
+                )
+            """)
+            cursor.execute("PRAGMA table_info(proposals)")
+            if 'version' not in {row['name'] for row in cursor.fetchall()}:
+                cursor.execute("ALTER TABLE proposals ADD COLUMN version INTEGER DEFAULT 1")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_department_priority ON proposals (department, priority)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_priority_cost ON proposals (priority, cost)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cost ON proposals (cost)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_implementation_date ON proposals (implementation_date)")
+    
+    def count(self):
+        return self.query("SELECT COUNT(*) AS count FROM proposals", one=True)['count']
+    
+    def get_all(self):
+        return self.query("SELECT * FROM proposals ORDER BY id")
+    
+    def get_page(self, after_id=None, before_id=None, limit=100, filters=None):
+        query, params = self.build_page_query(self.LIST_COLUMNS, after_id, before_id, limit, filters)
+        rows = self.query(query, params)
+        return list(reversed(rows)) if before_id is not None else rows
+    
+    def search(self, text, filters=None, limit=100, offset=0):
+        conditions, params = self.build_filters(filters or {})
+        conditions.insert(0, "match_score(proposal_text, justification, ?) > 0")
+        query = f"""
+            SELECT {self.LIST_COLUMNS}, match_score(proposal_text, justification, ?) AS relevance
+            FROM proposals
+            WHERE {' AND '.join(conditions)}
+            ORDER BY relevance DESC, id
+            LIMIT ? OFFSET ?
+        """
+        return self.query(query, [text, text] + params + [limit, offset])
+    
+    def get_departments(self):
+        rows = self.query("SELECT DISTINCT department FROM proposals ORDER BY department")
+        return [row['department'] for row in rows]
+    
+    def get_summary(self):
+        summary = self.query("""
+            SELECT COUNT(*) AS total,
+                   COALESCE(SUM(priority = 'Высокий'), 0) AS high_priority,
+                   COALESCE(SUM(cost), 0) AS total_cost
+            FROM proposals
+        """, one=True)
+        summary['by_priority'] = self.query("""
+            SELECT priority, COUNT(*) AS count, COALESCE(SUM(cost), 0) AS total_cost
+            FROM proposals
+            GROUP BY priority
+            ORDER BY priority
+        """)
+        summary['by_department'] = self.query("""
+            SELECT department, COUNT(*) AS count,
+                   COALESCE(SUM(priority = 'Высокий'), 0) AS high_priority,
+                   COALESCE(SUM(cost), 0) AS total_cost
+            FROM proposals
+            GROUP BY department
+            ORDER BY total_cost DESC
+        """)
+        summary['by_month'] = self.query("""
+            SELECT strftime('%Y-%m', implementation_date) AS month,
+                   COUNT(*) AS count, COALESCE(SUM(cost), 0) AS total_cost
+            FROM proposals
+            WHERE implementation_date IS NOT NULL
+            GROUP BY month
+            ORDER BY month
+        """)
+        return summary
+    
+    def iter_rows(self, batch_size=500, after_id=None):
+        last_id = after_id
+        while True:
+            if last_id is None:
+                rows = self.query("SELECT * FROM proposals ORDER BY id LIMIT ?", (batch_size,))
+            else:
+                rows = self.query("SELECT * FROM proposals WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size))
+            if not rows:
+                break
+            yield rows
+            last_id = rows[-1]['id']
+    
+    def get_row(self, proposal_id):
+        return self.query("SELECT * FROM proposals WHERE id = ?", (proposal_id,), one=True)
+    
+    def get_version(self, proposal_id):
+        row = self.query("SELECT version FROM proposals WHERE id = ?", (proposal_id,), one=True)
+        return row['version'] if row else None
+    
+    def write_row(self, cursor, values, proposal_id=None):
+        cursor.execute(self.INSERT_QUERY, (proposal_id,) + self.adapt(values) + (datetime.now(),))
+        return cursor.lastrowid
+    
+    def write_rows(self, cursor, batch, first_id=None):
+        """Пакет строк одним executemany; first_id - id первой строки, далее по убыванию"""
+        now = datetime.now()
+        ids = [None] * len(batch) if first_id is None else range(first_id, first_id - len(batch), -1)
+        cursor.executemany(self.INSERT_QUERY, [(proposal_id,) + self.adapt(values) + (now,)
+                                               for proposal_id, values in zip(ids, batch)])
+    
+    def prepare_changes(self, changes):
+        changes = super().prepare_changes(changes)
+        changes = dict(zip(changes, self.adapt(changes.values())))
+        changes['updated_at'] = datetime.now()
+        return changes
+    
+    def upsert_row(self, cursor, row):
+        cursor.execute(f"""
+            INSERT OR REPLACE INTO proposals ({', '.join(self.COLUMNS)})
+            VALUES ({', '.join('?' for _ in self.COLUMNS)})
+        """, self.adapt(row.get(column) for column in self.COLUMNS))
+    
+    def insert(self, values):
+        with self.transaction() as cursor:
+            return self.write_row(cursor, values)
+    
+    def insert_many(self, batches):
+        inserted = 0
+        with self.transaction() as cursor:
+            for batch in batches:
+                self.write_rows(cursor, batch)
+                inserted += len(batch)
+        return inserted
+    
+    def update(self, proposal_id, changes, expected_version=None):
+        with self.transaction() as cursor:
+            return self.execute_update(cursor, proposal_id, changes, expected_version)
+    
+    def update_many(self, ids, changes):
+        with self.transaction() as cursor:
+            return self.execute_batch_update(cursor, ids, changes)
+    
+    def delete(self, proposal_id):
+        with self.transaction() as cursor:
+            cursor.execute("DELETE FROM proposals WHERE id = ?", (proposal_id,))
+    
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+class WriteBehindBackend(StorageBackend):
+    name = 'write_behind'
+    log = logging.getLogger('write_behind')
+    
+    def __init__(self, local, remote, sync_interval=5, batch_size=200):
+        self.local = local
+        self.remote = remote
+        self.sync_interval = sync_interval
+        self.batch_size = batch_size
+        self.online = False
+        self.remote_ready = False
+        self.sync_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+    
+    def connect(self):
+        try:
+            self.remote.connect()
+            self.online = True
+        except DB_ERRORS as e:
+            self.report_error("Автономный режим", f"Сервер БД недоступен, изменения будут отправлены позже:\n{e}")
+            self.online = False
+    
+    def create_schema(self):
+        self.local.create_schema()
+        with self.local.transaction() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS journal (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    action TEXT NOT NULL,
+                    proposal_id INTEGER NOT NULL,
+                    payload TEXT
+                )
+            """)
+            cursor.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT)")
+            # ключ клиента вместе с номером записи журнала делает вставку на сервер идемпотентной
+            cursor.execute("INSERT OR IGNORE INTO sync_state (key, value) VALUES ('client_id', ?)", (json.dumps(uuid.uuid4().hex),))
+        if self.online:
+            self.sync_once()
+        self.start()
+    
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+    
+    def run(self):
+        while not self.stop_event.wait(self.sync_interval):
+            self.sync_once()
+    
+    def sync_once(self):
+        with self.sync_lock:
+            try:
+                if not self.remote_ready:
+                    self.remote.connect()
+                    self.remote.create_schema()
+                    self.remote_ready = True
+                    if not self.pending_count() and self.get_state('last_pull') is None:
+                        self.pull_snapshot()
+                if not self.online:
+                    self.log.info("Соединение с сервером БД восстановлено")
+                self.online = True
+                while self.push_journal():
+                    pass
+                self.pull_changes()
+            except DB_ERRORS as e:
+                if self.online:
+                    self.report_error("Автономный режим", f"Синхронизация прервана, изменения будут отправлены позже:\n{e}")
+                self.online = False
+            except Exception:
+                # поток синхронизации не должен завершаться из-за непредвиденной ошибки
+                self.log.exception("Ошибка синхронизации")
+    
+    def get_state(self, key):
+        row = self.local.query("SELECT value FROM sync_state WHERE key = ?", (key,), one=True)
+        return json.loads(row['value']) if row else None
+    
+    def set_state(self, cursor, key, value):
+        cursor.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, json.dumps(value, default=str)))
+    
+    def pending_count(self):
+        return self.local.query("SELECT COUNT(*) AS count FROM journal", one=True)['count']
+    
+    def journal(self, cursor, action, proposal_id, values=None):
+        payload = json.dumps(values, default=str) if values is not None else None
+        cursor.execute("INSERT INTO journal (action, proposal_id, payload) VALUES (?, ?, ?)", (action, proposal_id, payload))
+    
+    def pull_snapshot(self):
+        last = None
+        # удаления, сделанные во время загрузки снимка, придут следующим pull_changes
+        last_deletion = self.remote.get_last_deletion()
+        with self.local.transaction() as cursor:
+            cursor.execute("DELETE FROM proposals")
+            for rows in self.remote.iter_rows(self.batch_size):
+                for row in rows:
+                    self.local.upsert_row(cursor, row)
+                    if row.get('updated_at') and (last is None or (row['updated_at'], row['id']) > last):
+                        last = (row['updated_at'], row['id'])
+            self.set_state(cursor, 'last_pull', list(last) if last else [None, 0])
+            self.set_state(cursor, 'last_deletion', last_deletion)
+        self.notify('reload', None)
+    
+    def pull_changes(self):
+        updated_at, last_id = self.get_state('last_pull') or (None, 0)
+        while True:
+            rows = self.remote.get_changed_since(updated_at, last_id, self.batch_size)
+            if not rows:
+                break
+            changes = []
+            with self.local.transaction() as cursor:
+                for row in rows:
+                    cursor.execute("SELECT 1 FROM proposals WHERE id = ?", (row['id'],))
+                    changes.append(('update' if cursor.fetchone() else 'insert', row))
+                    self.local.upsert_row(cursor, row)
+                updated_at, last_id = str(rows[-1]['updated_at']), rows[-1]['id']
+                self.set_state(cursor, 'last_pull', [updated_at, last_id])
+            for action, row in changes:
+                self.notify(action, row['id'], row)
+        self.pull_deletions()
+    
+    def pull_deletions(self):
+        seq = self.get_state('last_deletion') or 0
+        while True:
+            rows = self.remote.get_deleted_since(seq, self.batch_size)
+            if not rows:
+                return
+            deleted = []
+            with self.local.transaction() as cursor:
+                for row in rows:
+                    cursor.execute("DELETE FROM proposals WHERE id = ?", (row['id'],))
+                    if cursor.rowcount:
+                        deleted.append(row['id'])
+                seq = rows[-1]['seq']
+                self.set_state(cursor, 'last_deletion', seq)
+            for proposal_id in deleted:
+                self.notify('delete', proposal_id)
+    
+    def push_journal(self):
+        entries = self.local.query("SELECT * FROM journal ORDER BY seq LIMIT ?", (self.batch_size,))
+        if not entries:
+            return 0
+        
+        client_id = self.get_state('client_id')
+        remapped = {}
+        conflicts = set()
+        inserts = []
+        with self.remote.transaction() as cursor:
+            for entry in entries:
+                if entry['action'] == 'insert':
+                    inserts.append(entry)
+                    continue
+                # вставки перед этой записью должны получить id на сервере: она может на них ссылаться
+                self.push_inserts(cursor, inserts, client_id, remapped)
+                inserts = []
+                values = json.loads(entry['payload']) if entry['payload'] else None
+                proposal_id = remapped.get(entry['proposal_id'], entry['proposal_id'])
+                if entry['action'] == 'update_many':
+                    ids = [remapped.get(item_id, item_id) for item_id in values['ids']]
+                    self.remote.execute_batch_update(cursor, [item_id for item_id in ids if item_id > 0], values['changes'])
+                elif proposal_id > 0 and entry['action'] == 'update' and isinstance(values, list):
+                    cursor.execute(self.remote.UPDATE_QUERY, values + [proposal_id])
+                elif proposal_id > 0 and entry['action'] == 'update' and proposal_id not in conflicts:
+                    if not self.remote.execute_update(cursor, proposal_id, values['changes'], values['version']):
+                        conflicts.add(proposal_id)
+                elif proposal_id > 0 and entry['action'] == 'delete':
+                    cursor.execute(self.remote.DELETE_QUERY, (proposal_id,))
+            self.push_inserts(cursor, inserts, client_id, remapped)
+        
+        # отклоненная правка остается в локальной копии, а pull_changes строку не вернет:
+        # версия сервера перечитывается до удаления журнала
+        server_rows = {proposal_id: self.remote.get_row(proposal_id) for proposal_id in conflicts}
+        
+        with self.local.transaction() as cursor:
+            cursor.execute("DELETE FROM journal WHERE seq <= ?", (entries[-1]['seq'],))
+            for local_id, remote_id in remapped.items():
+                cursor.execute("UPDATE proposals SET id = ? WHERE id = ?", (remote_id, local_id))
+                cursor.execute("UPDATE journal SET proposal_id = ? WHERE proposal_id = ?", (remote_id, local_id))
+            if remapped:
+                cursor.execute("SELECT seq, payload FROM journal WHERE action = 'update_many'")
+                for entry in cursor.fetchall():
+                    payload = json.loads(entry['payload'])
+                    payload['ids'] = [remapped.get(item_id, item_id) for item_id in payload['ids']]
+                    cursor.execute("UPDATE journal SET payload = ? WHERE seq = ?", (json.dumps(payload, default=str), entry['seq']))
+            for proposal_id, row in server_rows.items():
+                if row:
+                    self.local.upsert_row(cursor, row)
+                else:
+                    cursor.execute("DELETE FROM proposals WHERE id = ?", (proposal_id,))
+        
+        for proposal_id, row in server_rows.items():
+            self.notify('update' if row else 'delete', proposal_id, row)
+            self.report_error("Конфликт изменений", f"Предложение {proposal_id} изменено на сервере другим пользователем.\n"
+                                                   "Ваши изменения отменены, показана версия сервера.")
+        for local_id, remote_id in remapped.items():
+            row = self.local.get_row(remote_id)
+            self.notify('delete', local_id)
+            if row:
+                self.notify('insert', remote_id, row)
+        return len(entries)
+    
+    def push_inserts(self, cursor, entries, client_id, remapped):
+        """Подряд идущие вставки журнала - одним executemany, id на сервере находятся по client_key"""
+        if not entries:
+            return
+        keys = {f"{client_id}:{entry['seq']}": entry['proposal_id'] for entry in entries}
+        cursor.executemany(self.remote.SYNC_INSERT_QUERY, [
+            json.loads(entry['payload']) + [key] for key, entry in zip(keys, entries)
+        ])
+        cursor.execute(f"SELECT id, client_key FROM proposals WHERE client_key IN ({', '.join(['%s'] * len(keys))})",
+                       list(keys))
+        for row in cursor.fetchall():
+            remapped[keys[row['client_key']]] = row['id']
+    
+    def next_local_id(self, cursor):
+        cursor.execute("SELECT MIN(id) AS min_id FROM proposals")
+        return min(cursor.fetchone()['min_id'] or 0, 0) - 1
+    
+    def reader(self):
+        """Пока сервер доступен и журнал отправлен, списки, поиск и отчеты читаются с MySQL
+        (пул соединений, FULLTEXT, агрегаты и потоковый курсор); локальная копия - только
+        в автономном режиме и пока в журнале есть неотправленные изменения"""
+        if self.online and self.remote_ready and not self.pending_count():
+            return self.remote
+        return self.local
+    
+    def read(self, method, *args):
+        backend = self.reader()
+        if backend is self.remote:
+            try:
+                return getattr(self.remote, method)(*args)
+            except DB_ERRORS as e:
+                # до следующей синхронизации читаем локальную копию
+                self.log.warning("Сервер БД недоступен, чтение из локальной копии: %s", e)
+                self.online = False
+        return getattr(self.local, method)(*args)
+    
+    def count(self):
+        return self.read('count')
+    
+    def get_all(self):
+        return self.read('get_all')
+    
+    def get_page(self, after_id=None, before_id=None, limit=100, filters=None):
+        return self.read('get_page', after_id, before_id, limit, filters)
+    
+    def search(self, text, filters=None, limit=100, offset=0):
+        return self.read('search', text, filters, limit, offset)
+    
+    def get_departments(self):
+        return self.read('get_departments')
+    
+    def get_summary(self):
+        return self.read('get_summary')
+    
+    def iter_rows(self, batch_size=500, after_id=None):
+        return self.reader().iter_rows(batch_size, after_id)
+    
+    # строка и ее версия - из локальной копии: по ней же проверяется версия при изменении
+    def get_row(self, proposal_id):
+        return self.local.get_row(proposal_id)
+    
+    def get_version(self, proposal_id):
+        return self.local.get_version(proposal_id)
+    
+    def insert(self, values):
+        with self.local.transaction() as cursor:
+            proposal_id = self.local.write_row(cursor, values, self.next_local_id(cursor))
+            self.journal(cursor, 'insert', proposal_id, values)
+        return proposal_id
+    
+    def insert_many(self, batches):
+        inserted = 0
+        with self.local.transaction() as cursor:
+            proposal_id = self.next_local_id(cursor)
+            for batch in batches:
+                self.local.write_rows(cursor, batch, proposal_id)
+                cursor.executemany(
+                    "INSERT INTO journal (action, proposal_id, payload) VALUES ('insert', ?, ?)",
+                    [(proposal_id - index, json.dumps(values, default=str)) for index, values in enumerate(batch)]
+                )
+                proposal_id -= len(batch)
+                inserted += len(batch)
+        return inserted
+    
+    def update(self, proposal_id, changes, expected_version=None):
+        with self.local.transaction() as cursor:
+            if not self.local.execute_update(cursor, proposal_id, changes, expected_version):
+                return False
+            self.journal(cursor, 'update', proposal_id, {'changes': changes, 'version': expected_version})
+        return True
+    
+    def update_many(self, ids, changes):
+        with self.local.transaction() as cursor:
+            updated = self.local.execute_batch_update(cursor, ids, changes)
+            self.journal(cursor, 'update_many', 0, {'ids': list(ids), 'changes': changes})
+        return updated
+    
+    def delete(self, proposal_id):
+        with self.local.transaction() as cursor:
+            cursor.execute("DELETE FROM proposals WHERE id = ?", (proposal_id,))
+            self.journal(cursor, 'delete', proposal_id)
+    
+    def get_pool_stats(self):
+        return self.remote.get_pool_stats()
+    
+    def get_status(self):
+        return {'backend': self.name, 'online': self.online, 'pending': self.pending_count()}
+    
+    def instrument(self, stats):
+        self.stats = stats
+        self.local.instrument(stats)
+        self.remote.instrument(stats)
+    
+    def close(self):
+        self.stop_event.set()
+        self.remote.close()
 
 class Database:
-    def __init__(self):
-        self.connection = None
-        self.connect()
+    PRIORITIES = ('Высокий', 'Средний', 'Низкий')
+    IMPORT_COLUMNS = ('department', 'proposal_text', 'priority', 'cost', 'justification', 'implementation_date')
+    TEST_DATA = [
+        ('Отдел продаж', 'Внедрение CRM системы', 'Высокий', 500000, 'Для автоматизации продаж и улучшения взаимодействия с клиентами', '2024-12-31'),
+        ('Бухгалтерия', 'Обновление 1С', 'Средний', 200000, 'Требуется обновление до последней версии для соответствия законодательству', '2024-10-15'),
+        ('IT отдел', 'Покупка серверного оборудования', 'Высокий', 1000000, 'Требуется для обработки возрастающего объема данных', '2024-11-30')
+    ]
+    
+    def __init__(self, backend=None, cache_size=256, cache_ttl=60, validate_cache=True, autoconnect=True,
+                 slow_query_threshold=0.5, slow_query_log=None):
+        self.backend = backend or self.create_default_backend()
+        self.backend.listener = self.on_backend_change
+        self.backend.error_handler = self.report_error
+        self.stats = QueryStats(slow_query_threshold, slow_query_log)
+        self.backend.instrument(self.stats)
+        self.cache = ProposalCache(cache_size, cache_ttl)
+        self.validate_cache = validate_cache
+        self.listeners = []
+        self.error_handler = None
+        if autoconnect:
+            self.connect()
+    
+    @staticmethod
+    def create_default_backend(pool_size=5):
+        local_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'proposals_local.db')
+        return WriteBehindBackend(SQLiteBackend(local_path), MySQLBackend(pool_size))
+    
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+    
+    def unsubscribe(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+    
+    def report_error(self, title, message):
+        if self.error_handler:
+            self.error_handler(title, message)
+        elif threading.current_thread() is threading.main_thread():
+            messagebox.showerror(title, message)
+    
+    def emit_change(self, action, proposal_id, row=None):
+        for listener in list(self.listeners):
+            listener(action, proposal_id, row)
+    
+    def on_backend_change(self, action, proposal_id, row=None):
+        if action == 'reload':
+            self.cache.invalidate()
+        else:
+            self.cache.invalidate(proposal_id)
+        self.emit_change(action, proposal_id, row)
     
     def connect(self):
         try:
-            self.connection = pymysql.connect(
-                host='localhost',
-                user='root',
-                password='root',
-                database='expansion_proposals',
-                charset='utf8mb4',
-                cursorclass=pymysql.cursors.DictCursor
-            )
-            print("Подключение к БД успешно")
+            self.backend.connect()
+            if self.backend.online:
+                print("Подключение к БД успешно")
             self.create_table()
-        except pymysql.Error as e:
+        except DB_ERRORS as e:
             print(f"Ошибка подключения: {e}")
-            messagebox.showerror("Ошибка БД", f"Не удалось подключиться к БД:\n{e}")
-            self.connection = None
+            self.report_error("Ошибка БД", f"Не удалось подключиться к БД:\n{e}")
     
     def create_table(self):
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS proposals (
-                        id INT AUTO_INCREMENT PRIMARY KEY,
-                        department VARCHAR(100) NOT NULL,
-                        proposal_text TEXT NOT NULL,
-                        priority ENUM('Высокий', 'Средний', 'Низкий') DEFAULT 'Средний',
-                        cost DECIMAL(10, 2),
-                        justification TEXT,
-                        implementation_date DATE,
-                        created_date DATETIME DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                self.connection.commit()
-                
-                cursor.execute("SELECT COUNT(*) as count FROM proposals")
-                result = cursor.fetchone()
-                if result['count'] == 0:
-                    self.insert_test_data()
-        except pymysql.Error as e:
+            self.backend.create_schema()
+            if self.backend.online and self.backend.count() == 0:
+                self.insert_test_data()
+        except DB_ERRORS as e:
             print(f"Ошибка создания таблицы: {e}")
     
     def insert_test_data(self):
         try:
-            with self.connection.cursor() as cursor:
-                test_data = [
-                    ('Отдел продаж', 'Внедрение CRM системы', 'Высокий', 500000, 'Для автоматизации продаж и улучшения взаимодействия с клиентами', '2024-12-31'),
-                    ('Бухгалтерия', 'Обновление 1С', 'Средний', 200000, 'Требуется обновление до последней версии для соответствия законодательству', '2024-10-15'),
-                    ('IT отдел', 'Покупка серверного оборудования', 'Высокий', 1000000, 'Требуется для обработки возрастающего объема данных', '2024-11-30')
-                ]
-                for data in test_data:
-                    cursor.execute("""
-                        INSERT INTO proposals (department, proposal_text, priority, cost, justification, implementation_date)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    """, data)
-                self.connection.commit()
-        except pymysql.Error as e:
+            self.backend.insert_many([self.TEST_DATA])
+        except DB_ERRORS as e:
             print(f"Ошибка вставки тестовых данных: {e}")
     
+    @timed
     def get_all_proposals(self):
-        if self.connection:
-            try:
-                with self.connection.cursor() as cursor:
-                    cursor.execute("SELECT * FROM proposals ORDER BY id")
-                    return cursor.fetchall()
-            except pymysql.Error as e:
-                print(f"Ошибка получения данных: {e}")
-                return []
-        return []
+        try:
+            return self.backend.get_all()
+        except DB_ERRORS as e:
+            print(f"Ошибка получения данных: {e}")
+            return []
+    
+    @timed
+    def get_proposals_page(self, after_id=None, before_id=None, limit=100, filters=None):
+        try:
+            return self.backend.get_page(after_id, before_id, limit, filters)
+        except DB_ERRORS as e:
+            print(f"Ошибка получения страницы: {e}")
+            return []
+    
+    @timed
+    def search_proposals(self, text, filters=None, limit=100, offset=0):
+        try:
+            return self.backend.search(text, filters, limit, offset)
+        except DB_ERRORS as e:
+            print(f"Ошибка поиска: {e}")
+            return []
     
+    @timed
+    def get_departments(self):
+        try:
+            return self.backend.get_departments()
+        except DB_ERRORS as e:
+            print(f"Ошибка получения подразделений: {e}")
+            return []
+    
+    @timed
+    def get_report_summary(self):
+        try:
+            return self.backend.get_summary()
+        except DB_ERRORS as e:
+            print(f"Ошибка получения сводки: {e}")
+            return None
+    
+    def iter_proposals(self, batch_size=500, after_id=None):
+        try:
+            yield from self.backend.iter_rows(batch_size, after_id)
+        except DB_ERRORS as e:
+            print(f"Ошибка потокового чтения: {e}")
+    
+    @timed
+    def get_proposal_version(self, proposal_id):
+        try:
+            return self.backend.get_version(proposal_id)
+        except DB_ERRORS as e:
+            print(f"Ошибка проверки версии: {e}")
+            return None
+    
+    @timed
     def get_proposal(self, proposal_id):
-        if self.connection:
-            try:
-                with self.connection.cursor() as cursor:
-                    cursor.execute("SELECT * FROM proposals WHERE id = %s", (proposal_id,))
-                    return cursor.fetchone()
-            except pymysql.Error as e:
-                print(f"Ошибка получения предложения: {e}")
-                return None
-        return None
+        validator = None
+        if self.validate_cache:
+            validator = lambda row: self.get_proposal_version(proposal_id) == row.get('version')
+        cached = self.cache.get(proposal_id, validator)
+        if cached is not None:
+            return cached
+        
+        try:
+            proposal = self.backend.get_row(proposal_id)
+        except DB_ERRORS as e:
+            print(f"Ошибка получения предложения: {e}")
+            return None
+        
+        if proposal:
+            self.cache.put(proposal_id, proposal)
+        return proposal
     
+    def proposal_values(self, data):
+        return tuple(data[column] for column in self.IMPORT_COLUMNS)
+    
+    @timed
     def add_proposal(self, data):
-        if self.connection:
+        try:
+            proposal_id = self.backend.insert(self.proposal_values(data))
+            self.emit_change('insert', proposal_id, dict(data, id=proposal_id))
+            return proposal_id
+        except DB_ERRORS as e:
+            print(f"Ошибка добавления: {e}")
+            self.report_error("Ошибка", f"Не удалось добавить запись:\n{e}")
+            return None
+    
+    @staticmethod
+    def normalize(value):
+        if isinstance(value, Decimal):
+            return float(value)
+        if isinstance(value, date):
+            return value.strftime('%Y-%m-%d')
+        return None if value == '' else value
+    
+    def dirty_fields(self, data, original):
+        return {column: data[column] for column in self.IMPORT_COLUMNS
+                if column in data and self.normalize(data[column]) != self.normalize(original.get(column))}
+    
+    @timed
+    def update_proposal(self, proposal_id, data, original=None):
+        if original is not None:
+            changes = self.dirty_fields(data, original)
+            expected_version = original.get('version')
+        else:
+            changes = {column: data[column] for column in self.IMPORT_COLUMNS}
+            expected_version = None
+        if not changes:
+            return True
+        
+        try:
+            updated = self.backend.update(proposal_id, changes, expected_version)
+        except DB_ERRORS as e:
+            print(f"Ошибка обновления: {e}")
+            self.report_error("Ошибка", f"Не удалось обновить запись:\n{e}")
+            return False
+        
+        self.cache.invalidate(proposal_id)
+        if not updated:
+            print(f"Конфликт обновления записи {proposal_id}")
+            self.report_error("Конфликт", "Запись была изменена или удалена другим пользователем.\n"
+                                          "Откройте ее заново и повторите изменения.")
+            return False
+        row = dict(original or {})
+        row.update(data, id=proposal_id)
+        self.emit_change('update', proposal_id, row)
+        return True
+    
+    @timed
+    def update_proposals(self, ids, changes):
+        try:
+            updated = self.backend.update_many(list(ids), changes)
+        except DB_ERRORS as e:
+            print(f"Ошибка пакетного обновления: {e}")
+            self.report_error("Ошибка", f"Не удалось обновить записи:\n{e}")
+            return None
+        
+        for proposal_id in ids:
+            self.cache.invalidate(proposal_id)
+            self.emit_change('update', proposal_id, dict(changes, id=proposal_id))
+        return updated
+    
+    @timed
+    def delete_proposal(self, proposal_id):
+        try:
+            self.backend.delete(proposal_id)
+            self.cache.invalidate(proposal_id)
+            self.emit_change('delete', proposal_id)
+            return True
+        except DB_ERRORS as e:
+            print(f"Ошибка удаления: {e}")
+            self.report_error("Ошибка", f"Не удалось удалить запись:\n{e}")
+            return False
+    
+    def read_import_rows(self, path):
+        if path.lower().endswith('.xlsx'):
+            from openpyxl import load_workbook
+            from openpyxl.utils.exceptions import InvalidFileException
             try:
-                with self.connection.cursor() as cursor:
-                    query = """
-                        INSERT INTO proposals (department, proposal_text, priority, cost, justification, implementation_date)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    """
-                    cursor.execute(query, (
-                        data['department'], data['proposal_text'], data['priority'],
-                        data['cost'], data['justification'], data['implementation_date']
-                    ))
-                    self.connection.commit()
-                    return cursor.lastrowid
-            except pymysql.Error as e:
-                print(f"Ошибка добавления: {e}")
-                messagebox.showerror("Ошибка", f"Не удалось добавить запись:\n{e}")
-                return None
-        return None
+                workbook = load_workbook(path, read_only=True, data_only=True)
+            except (InvalidFileException, zipfile.BadZipFile, KeyError) as e:
+                raise ValueError(f"файл не является книгой Excel: {e}")
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                header = [str(cell).strip() if cell is not None else '' for cell in next(rows, ())]
+                for row in rows:
+                    yield dict(zip(header, row))
+            finally:
+                workbook.close()
+        else:
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                sample = f.read(4096)
+                f.seek(0)
+                try:
+                    dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+                except csv.Error:
+                    dialect = csv.excel
+                yield from csv.DictReader(f, dialect=dialect)
     
-    def update_proposal(self, proposal_id, data):
-        if self.connection:
+    @staticmethod
+    def parse_import_date(value):
+        if value in (None, ''):
+            return None
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        for date_format in ('%Y-%m-%d', '%d.%m.%Y'):
             try:
-                with self.connection.cursor() as cursor:
-                    query = """
-                        UPDATE proposals 
-                        SET department=%s, proposal_text=%s, priority=%s,
-                            cost=%s, justification=%s, implementation_date=%s
-                        WHERE id=%s
-                    """
-                    cursor.execute(query, (
-                        data['department'], data['proposal_text'], data['priority'],
-                        data['cost'], data['justification'], data['implementation_date'], proposal_id
-                    ))
-                    self.connection.commit()
-                    return True
-            except pymysql.Error as e:
-                print(f"Ошибка обновления: {e}")
-                messagebox.showerror("Ошибка", f"Не удалось обновить запись:\n{e}")
-                return False
-        return False
+                return datetime.strptime(str(value).strip(), date_format).date()
+            except ValueError:
+                pass
+        raise ValueError(f"неверная дата '{value}'")
+    
+    def validate_import_row(self, row):
+        department = str(row.get('department') or '').strip()
+        proposal_text = str(row.get('proposal_text') or '').strip()
+        priority = str(row.get('priority') or 'Средний').strip()
+        justification = str(row.get('justification') or '').strip()
+        
+        if not department or len(department) > 100:
+            raise ValueError("подразделение не указано или длиннее 100 символов")
+        if not proposal_text:
+            raise ValueError("не указан текст предложения")
+        if priority not in self.PRIORITIES:
+            raise ValueError(f"недопустимый приоритет '{priority}'")
+        
+        cost = row.get('cost')
+        if cost in (None, ''):
+            cost = None
+        else:
+            try:
+                cost = Decimal(str(cost).replace(' ', '').replace('₽', '').replace(',', '.')).quantize(Decimal('0.01'))
+            except InvalidOperation:
+                raise ValueError(f"неверная стоимость '{cost}'")
+            if abs(cost) >= Decimal('100000000'):
+                raise ValueError("стоимость не помещается в DECIMAL(10, 2)")
+        
+        implementation_date = self.parse_import_date(row.get('implementation_date'))
+        return (department, proposal_text, priority, cost, justification, implementation_date)
+    
+    @timed
+    def bulk_import(self, path, batch_size=1000):
+        start = time.perf_counter()
+        errors = []
+        
+        def batches():
+            batch = []
+            for line, row in enumerate(self.read_import_rows(path), start=2):
+                try:
+                    batch.append(self.validate_import_row(row))
+                except ValueError as e:
+                    errors.append((line, str(e)))
+                    continue
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        
+        try:
+            imported = self.backend.insert_many(batches())
+        except DB_ERRORS + (OSError, ImportError, ValueError, csv.Error) as e:
+            print(f"Ошибка импорта: {e}")
+            self.report_error("Ошибка", f"Не удалось импортировать данные:\n{e}")
+            return None
+        
+        elapsed = time.perf_counter() - start
+        if imported:
+            self.emit_change('reload', None)
+        return {
+            'imported': imported,
+            'errors': errors,
+            'elapsed': elapsed,
+            'rows_per_second': imported / elapsed if elapsed > 0 else 0.0
+        }
+    
+    @timed
+    def bulk_export(self, path, batch_size=1000):
+        start = time.perf_counter()
+        exported = 0
+        try:
+            if path.lower().endswith('.xlsx'):
+                from openpyxl import Workbook
+                workbook = Workbook(write_only=True)
+                sheet = workbook.create_sheet()
+                sheet.append(self.IMPORT_COLUMNS)
+                for rows in self.iter_proposals(batch_size):
+                    for row in rows:
+                        sheet.append([row[column] for column in self.IMPORT_COLUMNS])
+                    exported += len(rows)
+                workbook.save(path)
+            else:
+                with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+                    writer = csv.writer(f, delimiter=';')
+                    writer.writerow(self.IMPORT_COLUMNS)
+                    for rows in self.iter_proposals(batch_size):
+                        writer.writerows([row[column] for column in self.IMPORT_COLUMNS] for row in rows)
+                        exported += len(rows)
+        except (OSError, ImportError) as e:
+            print(f"Ошибка экспорта: {e}")
+            self.report_error("Ошибка", f"Не удалось экспортировать данные:\n{e}")
+            return None
+        
+        elapsed = time.perf_counter() - start
+        return {
+            'exported': exported,
+            'elapsed': elapsed,
+            'rows_per_second': exported / elapsed if elapsed > 0 else 0.0
+        }
+    
+    def get_pool_stats(self):
+        return self.backend.get_pool_stats()
+    
+    def get_cache_stats(self):
+        return self.cache.get_stats()
+    
+    def get_query_stats(self):
+        return self.stats.get_stats()
+    
+    def get_backend_status(self):
+        try:
+            return self.backend.get_status()
+        except DB_ERRORS:
+            return {'backend': self.backend.name, 'online': False, 'pending': 0}
+    
+    def __del__(self):
+        if hasattr(self, 'backend'):
+            self.backend.close()
+
+class DBTask:
+    def __init__(self, future):
+        self.future = future
+        self.cancelled = False
+    
+    def cancel(self):
+        self.cancelled = True
+        self.future.cancel()
+    
+    def done(self):
+        return self.future.done()
+
+class DBExecutor:
+    def __init__(self, root, max_workers=4, poll_interval=15):
+        self.root = root
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='db')
+        self.results = queue.Queue()
+        self.poll_interval = poll_interval
+        self.pending = 0
+        self.busy_listeners = []
+        self.closed = False
+        self.poll()
+    
+    def submit(self, func, *args, on_done=None, on_error=None, **kwargs):
+        task = DBTask(self.pool.submit(func, *args, **kwargs))
+        self.pending += 1
+        self.notify_busy()
+        task.future.add_done_callback(lambda future: self.results.put(lambda: self.finish(task, on_done, on_error)))
+        return task
+    
+    def call_soon(self, func, *args):
+        self.results.put(lambda: func(*args))
+    
+    def finish(self, task, on_done, on_error):
+        self.pending -= 1
+        self.notify_busy()
+        if task.cancelled or task.future.cancelled():
+            return
+        error = task.future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                print(f"Ошибка фоновой операции: {error}")
+        elif on_done:
+            on_done(task.future.result())
     
-    def delete_proposal(self, proposal_id):
-        if self.connection:
-            try:
-                with self.connection.cursor() as cursor:
-                    cursor.execute("DELETE FROM proposals WHERE id = %s", (proposal_id,))
-                    self.connection.commit()
-                    return True
-            except pymysql.Error as e:
-                print(f"Ошибка удаления: {e}")
-                messagebox.showerror("Ошибка", f"Не удалось удалить запись:\n{e}")
-                return False
-        return False
+    def notify_busy(self):
+        for listener in self.busy_listeners:
+            listener(self.pending)
     
-    def __del__(self):
-        if hasattr(self, 'connection') and self.connection:
-            self.connection.close()
+    def poll(self):
+        if self.closed:
+            return
+        try:
+            while True:
+                try:
+                    callback = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    callback()
+                except tk.TclError:
+                    pass
+        finally:
+            self.root.after(self.poll_interval, self.poll)
+    
+    def shutdown(self):
+        self.closed = True
+        self.pool.shutdown(wait=False, cancel_futures=True)
 
 class AddProposalForm:
-    def __init__(self, parent, db, callback, proposal_id=None):
+    def __init__(self, parent, db, executor, proposal_id=None):
         self.window = tk.Toplevel(parent)
         self.window.title("Добавление нового предложения" if not proposal_id else "Редактирование предложения")
         self.window.geometry("500x550")
         self.window.resizable(False, False)
         
         self.db = db
-        self.callback = callback
+        self.executor = executor
         self.proposal_id = proposal_id
         self.proposal_data = None
         
-        if proposal_id:
-            self.proposal_data = db.get_proposal(proposal_id)
-        
         self.setup_ui()
         
-        if self.proposal_data:
-            self.fill_fields()
+        if proposal_id:
+            self.save_button.config(state=tk.DISABLED)
+            self.executor.submit(db.get_proposal, proposal_id, on_done=self.on_loaded)
     
     def setup_ui(self):
         main_frame = ttk.Frame(self.window, padding="20")
@@ -201,9 +1866,18 @@ class AddProposalForm:
         btn_frame = ttk.Frame(main_frame)
         btn_frame.grid(row=6, column=0, columnspan=2, pady=20)
         
-        ttk.Button(btn_frame, text="Сохранить", command=self.save_proposal, width=15).pack(side=tk.LEFT, padx=5)
+        self.save_button = ttk.Button(btn_frame, text="Сохранить", command=self.save_proposal, width=15)
+        self.save_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Отмена", command=self.window.destroy, width=15).pack(side=tk.LEFT, padx=5)
     
+    def on_loaded(self, proposal_data):
+        if not self.window.winfo_exists():
+            return
+        self.proposal_data = proposal_data
+        self.save_button.config(state=tk.NORMAL)
+        if self.proposal_data:
+            self.fill_fields()
+    
     def fill_fields(self):
         if self.proposal_data:
             self.department_entry.insert(0, self.proposal_data['department'])
@@ -213,7 +1887,7 @@ class AddProposalForm:
             self.justification_text.insert('1.0', self.proposal_data['justification'] or '')
             if self.proposal_data['implementation_date']:
                 date_obj = self.proposal_data['implementation_date']
-                if isinstance(date_obj, datetime):
+                if isinstance(date_obj, date):
                     self.date_entry.delete(0, tk.END)
                     self.date_entry.insert(0, date_obj.strftime('%d.%m.%Y'))
     
@@ -249,28 +1923,111 @@ class AddProposalForm:
             'implementation_date': mysql_date
         }
         
+        self.save_button.config(state=tk.DISABLED)
         if self.proposal_id:
-            if self.db.update_proposal(self.proposal_id, data):
-                messagebox.showinfo("Успех", "Предложение обновлено")
-                self.callback()
-                self.window.destroy()
+            self.executor.submit(self.db.update_proposal, self.proposal_id, data, self.proposal_data,
+                                 on_done=lambda ok: self.on_saved(ok, "Предложение обновлено"))
+        else:
+            self.executor.submit(self.db.add_proposal, data,
+                                 on_done=lambda proposal_id: self.on_saved(proposal_id, "Предложение добавлено"))
+    
+    def on_saved(self, result, message):
+        if not self.window.winfo_exists():
+            return
+        if result:
+            messagebox.showinfo("Успех", message)
+            self.window.destroy()
         else:
-            if self.db.add_proposal(data):
-                messagebox.showinfo("Успех", "Предложение добавлено")
-                self.callback()
-                self.window.destroy()
+            self.save_button.config(state=tk.NORMAL)
+
+class BatchEditForm:
+    def __init__(self, parent, db, executor, ids):
+        self.window = tk.Toplevel(parent)
+        self.window.title("Пакетное изменение")
+        self.window.geometry("400x230")
+        self.window.resizable(False, False)
+        
+        self.db = db
+        self.executor = executor
+        self.ids = ids
+        
+        self.setup_ui()
+    
+    def setup_ui(self):
+        main_frame = ttk.Frame(self.window, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(main_frame, text=f"Выбрано записей: {len(self.ids)}", font=('Arial', 10, 'bold')).grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=5)
+        ttk.Label(main_frame, text="Пустые поля не изменяются", font=('Arial', 9)).grid(row=1, column=0, columnspan=2, sticky=tk.W)
+        
+        ttk.Label(main_frame, text="Приоритет:", font=('Arial', 10)).grid(row=2, column=0, sticky=tk.W, pady=5)
+        self.priority_combo = ttk.Combobox(main_frame, values=('',) + Database.PRIORITIES, width=25, state='readonly')
+        self.priority_combo.grid(row=2, column=1, sticky=tk.W, pady=5)
+        
+        ttk.Label(main_frame, text="Подразделение:", font=('Arial', 10)).grid(row=3, column=0, sticky=tk.W, pady=5)
+        self.department_entry = ttk.Entry(main_frame, width=28)
+        self.department_entry.grid(row=3, column=1, sticky=tk.W, pady=5)
+        
+        ttk.Label(main_frame, text="Срок реализации:", font=('Arial', 10)).grid(row=4, column=0, sticky=tk.W, pady=5)
+        self.date_entry = ttk.Entry(main_frame, width=28)
+        self.date_entry.grid(row=4, column=1, sticky=tk.W, pady=5)
+        
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.grid(row=5, column=0, columnspan=2, pady=15)
+        
+        self.save_button = ttk.Button(btn_frame, text="Применить", command=self.apply, width=15)
+        self.save_button.pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Отмена", command=self.window.destroy, width=15).pack(side=tk.LEFT, padx=5)
+    
+    def apply(self):
+        changes = {}
+        if self.priority_combo.get():
+            changes['priority'] = self.priority_combo.get()
+        if self.department_entry.get().strip():
+            changes['department'] = self.department_entry.get().strip()
+        date_str = self.date_entry.get().strip()
+        if date_str:
+            try:
+                changes['implementation_date'] = datetime.strptime(date_str, '%d.%m.%Y').strftime('%Y-%m-%d')
+            except ValueError:
+                messagebox.showwarning("Предупреждение", "Неверный формат даты. Используйте ДД.ММ.ГГГГ")
+                return
+        if not changes:
+            messagebox.showwarning("Предупреждение", "Укажите хотя бы одно значение")
+            return
+        
+        self.save_button.config(state=tk.DISABLED)
+        self.executor.submit(self.db.update_proposals, self.ids, changes, on_done=self.on_saved)
+    
+    def on_saved(self, updated):
+        if not self.window.winfo_exists():
+            return
+        if updated is None:
+            self.save_button.config(state=tk.NORMAL)
+            return
+        messagebox.showinfo("Успех", f"Изменено записей: {updated}")
+        self.window.destroy()
 
 class DetailsForm:
-    def __init__(self, parent, db, proposal_id, callback):
+    def __init__(self, parent, db, executor, proposal_id):
         self.window = tk.Toplevel(parent)
         self.window.title("ПОДРОБНАЯ ИНФОРМАЦИЯ О ПРЕДЛОЖЕНИИ")
         self.window.geometry("500x450")
         
         self.db = db
+        self.executor = executor
         self.proposal_id = proposal_id
-        self.callback = callback
-        self.proposal = db.get_proposal(proposal_id)
+        self.proposal = None
         
+        self.loading_label = ttk.Label(self.window, text="Загрузка...", font=('Arial', 10))
+        self.loading_label.pack(pady=20)
+        self.executor.submit(db.get_proposal, proposal_id, on_done=self.on_loaded)
+    
+    def on_loaded(self, proposal):
+        if not self.window.winfo_exists():
+            return
+        self.loading_label.destroy()
+        self.proposal = proposal
         if self.proposal:
             self.setup_ui()
         else:
@@ -308,22 +2065,33 @@ ID: {self.proposal['id']}
     
     def edit_proposal(self):
         self.window.destroy()
-        AddProposalForm(self.window.master, self.db, self.callback, self.proposal_id)
+        AddProposalForm(self.window.master, self.db, self.executor, self.proposal_id)
     
     def delete_proposal(self):
         if messagebox.askyesno("Подтверждение", "Удалить это предложение?"):
-            if self.db.delete_proposal(self.proposal_id):
-                messagebox.showinfo("Успех", "Предложение удалено")
-                self.callback()
-                self.window.destroy()
+            self.executor.submit(self.db.delete_proposal, self.proposal_id, on_done=self.on_deleted)
+    
+    def on_deleted(self, ok):
+        if ok and self.window.winfo_exists():
+            messagebox.showinfo("Успех", "Предложение удалено")
+            self.window.destroy()
 
 class ReportForm:
-    def __init__(self, parent, db):
+    def __init__(self, parent, db, executor, batch_size=200):
         self.window = tk.Toplevel(parent)
         self.window.title("Отчет по предложениям")
         self.window.geometry("700x600")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
         
         self.db = db
+        self.executor = executor
+        self.batch_size = batch_size
+        self.stream = None
+        self.stream_job = None
+        self.stream_task = None
+        self.summary_task = None
+        self.paginator = None
+        self.rows_loaded = 0
         self.setup_ui()
         self.load_data()
     
@@ -336,66 +2104,411 @@ class ReportForm:
         self.report_text = scrolledtext.ScrolledText(main_frame, width=80, height=25, wrap=tk.WORD, font=('Courier', 10))
         self.report_text.pack(fill=tk.BOTH, expand=True, pady=10)
         
+        progress_frame = ttk.Frame(main_frame)
+        progress_frame.pack(fill=tk.X)
+        
+        self.progress = ttk.Progressbar(progress_frame, mode='determinate')
+        self.progress.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.progress_label = ttk.Label(progress_frame, text="", width=25)
+        self.progress_label.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(progress_frame, text="Отмена", command=self.cancel_stream, width=10, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        
         btn_frame = ttk.Frame(main_frame)
         btn_frame.pack(pady=10)
         
         ttk.Button(btn_frame, text="Обновить", command=self.load_data, width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Экспорт", command=self.export_report, width=12).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Печать", command=self.open_print_dialog, width=12).pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="Закрыть", command=self.window.destroy, width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Закрыть", command=self.close, width=12).pack(side=tk.LEFT, padx=5)
     
-    def load_data(self):
-        self.report_text.delete('1.0', tk.END)
-        
-        proposals = self.db.get_all_proposals()
-        
-        if not proposals:
-            self.report_text.insert(tk.END, "Нет данных для отображения")
-            return
-        
-        total = len(proposals)
-        high_priority = sum(1 for p in proposals if p['priority'] == 'Высокий')
-        total_cost = sum(p['cost'] for p in proposals if p['cost'])
-        
+    def build_header(self, summary):
+        total_cost = summary['total_cost']
         total_cost_str = f"{int(total_cost):,} ₽".replace(',', ' ') if total_cost else '0 ₽'
         
         report = f"""
 ОТЧЕТ ПО ПРЕДЛОЖЕНИЯМ О РАСШИРЕНИИ ИС
 Дата формирования: {datetime.now().strftime('%d.%m.%Y %H:%M')}
-Всего предложений: {total}
-Высокоприоритетных: {high_priority}
+Всего предложений: {summary['total']}
+Высокоприоритетных: {int(summary['high_priority'])}
 Общая стоимость: {total_cost_str}
 
 {'='*70}
 
+ПО ПРИОРИТЕТАМ:
+"""
+        for row in summary['by_priority']:
+            cost_str = f"{int(row['total_cost']):,} ₽".replace(',', ' ')
+            report += f"{row['priority']:<12} {row['count']:>8} шт. {cost_str:>20}\n"
+        
+        report += "\nПО ПОДРАЗДЕЛЕНИЯМ:\n"
+        for row in summary['by_department']:
+            cost_str = f"{int(row['total_cost']):,} ₽".replace(',', ' ')
+            report += f"{row['department'][:30]:<30} {row['count']:>6} шт. (выс.: {int(row['high_priority'])}) {cost_str:>18}\n"
+        
+        report += "\nПО МЕСЯЦАМ РЕАЛИЗАЦИИ:\n"
+        for row in summary['by_month']:
+            cost_str = f"{int(row['total_cost']):,} ₽".replace(',', ' ')
+            report += f"{row['month']:<12} {row['count']:>8} шт. {cost_str:>20}\n"
+        
+        report += f"""
+{'='*70}
+
 СПИСОК ПРЕДЛОЖЕНИЙ:
 
 """
-        self.report_text.insert(tk.END, report)
+        return report
+    
+    @staticmethod
+    def format_item(prop):
+        cost_str = f"{int(prop['cost']):,} ₽".replace(',', ' ') if prop['cost'] else '0 ₽'
+        date_str = prop['implementation_date'].strftime('%d.%m.%Y') if prop['implementation_date'] else 'Не указан'
         
-        for prop in proposals:
-            cost_str = f"{int(prop['cost']):,} ₽".replace(',', ' ') if prop['cost'] else '0 ₽'
-            date_str = prop['implementation_date'].strftime('%d.%m.%Y') if prop['implementation_date'] else 'Не указан'
-            
-            item = f"""
+        return f"""
 [ID: {prop['id']}] {prop['department']}
 Предложение: {prop['proposal_text']}
 Приоритет: {prop['priority']} | Стоимость: {cost_str}
 Срок: {date_str}
 {'-'*50}
 """
-            self.report_text.insert(tk.END, item)
+    
+    def generate_report(self, summary):
+        yield 0, self.build_header(summary)
+        for rows in self.db.iter_proposals(self.batch_size):
+            yield len(rows), ''.join(self.format_item(prop) for prop in rows)
+    
+    def load_data(self):
+        self.cancel_stream()
+        if self.summary_task:
+            self.summary_task.cancel()
+        self.report_text.delete('1.0', tk.END)
+        self.report_text.insert(tk.END, "Загрузка...")
+        self.summary_task = self.executor.submit(self.db.get_report_summary, on_done=self.on_summary)
+    
+    def on_summary(self, summary):
+        self.summary_task = None
+        self.report_text.delete('1.0', tk.END)
+        
+        if not summary or not summary['total']:
+            self.paginator = None
+            self.report_text.insert(tk.END, "Нет данных для отображения")
+            return
+        
+        self.paginator = ReportPaginator(self.db, self.build_header(summary), self.format_item, batch_size=self.batch_size)
+        
+        self.rows_loaded = 0
+        self.progress.configure(maximum=summary['total'], value=0)
+        self.progress_label.config(text=f"Загружено 0 из {summary['total']}")
+        self.cancel_button.config(state=tk.NORMAL)
+        self.stream = self.generate_report(summary)
+        self.render_slice(summary['total'])
+    
+    @staticmethod
+    def read_chunks(stream, count):
+        chunks = []
+        for _ in range(count):
+            try:
+                chunks.append(next(stream))
+            except StopIteration:
+                return chunks, True
+        return chunks, False
+    
+    def render_slice(self, total, chunks_per_slice=5):
+        self.stream_job = None
+        self.stream_task = self.executor.submit(
+            self.read_chunks, self.stream, chunks_per_slice,
+            on_done=lambda result: self.on_chunks(result, total)
+        )
+    
+    def on_chunks(self, result, total):
+        self.stream_task = None
+        chunks, finished = result
+        if chunks:
+            self.report_text.insert(tk.END, ''.join(text for _, text in chunks))
+            self.rows_loaded += sum(count for count, _ in chunks)
+        
+        self.progress.configure(value=self.rows_loaded)
+        self.progress_label.config(text=f"Загружено {self.rows_loaded} из {total}")
+        if finished:
+            self.stream = None
+            self.cancel_button.config(state=tk.DISABLED)
+        else:
+            self.stream_job = self.window.after(1, self.render_slice, total)
+    
+    def cancel_stream(self):
+        if self.stream_job:
+            self.window.after_cancel(self.stream_job)
+            self.stream_job = None
+        if self.stream:
+            stream = self.stream
+            if self.stream_task and not self.stream_task.done():
+                self.stream_task.cancel()
+                self.stream_task.future.add_done_callback(lambda future: stream.close())
+            else:
+                self.executor.submit(stream.close)
+            self.stream = None
+            self.stream_task = None
+            self.progress_label.config(text=f"Отменено ({self.rows_loaded} строк)")
+        self.cancel_button.config(state=tk.DISABLED)
+    
+    def write_report(self, filename):
+        summary = self.db.get_report_summary()
+        if not summary:
+            raise OSError("Не удалось получить данные для отчета")
+        with open(filename, 'w', encoding='utf-8') as f:
+            for _, text in self.generate_report(summary):
+                f.write(text)
+        return filename
+    
+    def export_report(self):
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        
+        self.executor.submit(
+            self.write_report, filename,
+            on_done=lambda name: messagebox.showinfo("Успех", f"Отчет сохранен в файл:\n{name}"),
+            on_error=lambda e: messagebox.showerror("Ошибка", f"Не удалось сохранить файл:\n{e}")
+        )
+    
+    def close(self):
+        self.cancel_stream()
+        if self.summary_task:
+            self.summary_task.cancel()
+        self.window.destroy()
     
     def open_print_dialog(self):
-        PrintDialog(self.window, self.report_text)
+        PrintDialog(self.window, self.report_text, self.executor, self.paginator)
+
+class ReportPaginator:
+    def __init__(self, db, header, format_item, lines_per_page=60, width=85, batch_size=200):
+        self.db = db
+        self.header = header
+        self.format_item = format_item
+        self.lines_per_page = lines_per_page
+        self.width = width
+        self.batch_size = batch_size
+        self.starts = [(True, None, 0)]
+        self.complete = False
+        self.lock = threading.Lock()
+    
+    def wrap(self, line):
+        return [line[i:i + self.width] for i in range(0, len(line), self.width)] or ['']
+    
+    def height(self, line_length):
+        return max(1, -(-line_length // self.width))
+    
+    def text_height(self, text):
+        return sum(self.height(len(line)) for line in text.splitlines()) or 1
+    
+    def measure_item(self, prop):
+        return (
+            1
+            + self.text_height(f"[ID: {prop['id']}] {prop['department']}")
+            + self.text_height(f"Предложение: {prop['proposal_text']}")
+            + 3
+        )
+    
+    def measure(self, in_header, after_id):
+        if in_header:
+            yield True, None, self.text_height(self.header)
+        for rows in self.db.iter_proposals(self.batch_size, after_id):
+            for prop in rows:
+                yield False, prop['id'], self.measure_item(prop)
+    
+    def scan(self, target):
+        in_header, previous, skip = self.starts[-1]
+        line = 0
+        first = True
+        for is_header, item_id, height in self.measure(in_header, previous):
+            position = skip if first else 0
+            first = False
+            while line + height - position > self.lines_per_page:
+                position += self.lines_per_page - line
+                line = 0
+                self.starts.append((is_header, previous, position))
+                if len(self.starts) >= target:
+                    return
+            line += height - position
+            previous = item_id
+        self.complete = True
+    
+    def locate(self, page):
+        with self.lock:
+            if page > len(self.starts) and not self.complete:
+                self.scan(page)
+            return self.starts[page - 1] if page <= len(self.starts) else None
+    
+    def page_count(self):
+        with self.lock:
+            if not self.complete:
+                self.scan(float('inf'))
+            return len(self.starts)
+    
+    def lines_from(self, state):
+        in_header, after_id, skip = state
+        if in_header:
+            for line in self.header.splitlines():
+                yield from self.wrap(line)
+        for rows in self.db.iter_proposals(self.batch_size, after_id):
+            for prop in rows:
+                for line in self.format_item(prop).splitlines():
+                    yield from self.wrap(line)
+    
+    def iter_pages(self, first_page, last_page=None):
+        state = self.locate(first_page)
+        if state is None:
+            return
+        lines = self.lines_from(state)
+        try:
+            for _ in range(state[2]):
+                next(lines)
+            page = first_page
+            while last_page is None or page <= last_page:
+                chunk = [line for _, line in zip(range(self.lines_per_page), lines)]
+                if not chunk:
+                    return
+                yield page, chunk
+                page += 1
+        finally:
+            lines.close()
+
+class TextPageWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.pages = 0
+    
+    def write_page(self, lines):
+        if self.pages:
+            self.file.write('\f')
+        self.file.write('\n'.join(lines) + '\n')
+        self.pages += 1
+    
+    def close(self):
+        self.file.close()
+
+class PostScriptWriter:
+    PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+    MARGIN = 40
+    FONT_SIZE = 10
+    LEADING = 12
+    SUBSTITUTIONS = {'₽': 'руб.'}
+    
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='ascii')
+        self.pages = 0
+        self.file.write(
+            "%!PS-Adobe-3.0\n"
+            f"%%BoundingBox: 0 0 {self.PAGE_WIDTH} {self.PAGE_HEIGHT}\n"
+            "%%Pages: (atend)\n"
+            "%%EndComments\n"
+            f"/F /Courier findfont {self.FONT_SIZE} scalefont def\n"
+            "%%EndProlog\n"
+        )
+    
+    @staticmethod
+    def glyph_name(char):
+        code = ord(char)
+        if 0x0410 <= code <= 0x0415:
+            return f"afii{10017 + code - 0x0410}"
+        if 0x0416 <= code <= 0x042F:
+            return f"afii{10024 + code - 0x0416}"
+        if 0x0430 <= code <= 0x0435:
+            return f"afii{10065 + code - 0x0430}"
+        if 0x0436 <= code <= 0x044F:
+            return f"afii{10072 + code - 0x0436}"
+        return {0x0401: 'afii10023', 0x0451: 'afii10071', 0x2116: 'afii61352'}.get(code, f"uni{code:04X}")
+    
+    def encode(self, line):
+        for old, new in self.SUBSTITUTIONS.items():
+            line = line.replace(old, new)
+        parts = []
+        run = ''
+        for char in line:
+            if ' ' <= char <= '~':
+                run += '\\' + char if char in '()\\' else char
+                continue
+            if run:
+                parts.append(f"({run}) show")
+                run = ''
+            parts.append(f"/{self.glyph_name(char)} glyphshow")
+        if run:
+            parts.append(f"({run}) show")
+        return ' '.join(parts)
+    
+    def write_page(self, lines):
+        self.pages += 1
+        self.file.write(f"%%Page: {self.pages} {self.pages}\nF setfont\n")
+        y = self.PAGE_HEIGHT - self.MARGIN - self.FONT_SIZE
+        for line in lines:
+            if line:
+                self.file.write(f"{self.MARGIN} {y} moveto {self.encode(line)}\n")
+            y -= self.LEADING
+        self.file.write("showpage\n")
+    
+    def close(self):
+        self.file.write(f"%%Trailer\n%%Pages: {self.pages}\n%%EOF\n")
+        self.file.close()
+
+class PdfWriter:
+    FONT_PATHS = (
+        '/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf',
+        '/usr/share/fonts/TTF/DejaVuSansMono.ttf',
+        'C:/Windows/Fonts/cour.ttf'
+    )
+    MARGIN = 40
+    FONT_SIZE = 10
+    LEADING = 12
+    
+    def __init__(self, path):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+        
+        self.font = 'Courier'
+        for font_path in self.FONT_PATHS:
+            if os.path.exists(font_path):
+                pdfmetrics.registerFont(TTFont('ReportMono', font_path))
+                self.font = 'ReportMono'
+                break
+        self.page_height = A4[1]
+        self.canvas = canvas.Canvas(path, pagesize=A4, pageCompression=1)
+        self.pages = 0
+    
+    def write_page(self, lines):
+        text = self.canvas.beginText(self.MARGIN, self.page_height - self.MARGIN - self.FONT_SIZE)
+        text.setFont(self.font, self.FONT_SIZE, self.LEADING)
+        for line in lines:
+            text.textLine(line)
+        self.canvas.drawText(text)
+        self.canvas.showPage()
+        self.pages += 1
+    
+    def close(self):
+        self.canvas.save()
+
+def create_page_writer(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.pdf':
+        return PdfWriter(path)
+    if extension == '.ps':
+        return PostScriptWriter(path)
+    return TextPageWriter(path)
 
 class PrintDialog:
-    def __init__(self, parent, report_text_widget):
+    def __init__(self, parent, report_text_widget, executor, paginator=None):
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Печать")
         self.dialog.geometry("450x450")
         self.dialog.resizable(False, False)
         
         self.report_text = report_text_widget
+        self.executor = executor
+        self.paginator = paginator
         self.setup_ui()
         
         self.dialog.transient(parent)
@@ -466,45 +2579,387 @@ class PrintDialog:
     def properties(self):
         messagebox.showinfo("Свойства принтера", "Свойства принтера Pantum M6500W-series")
     
+    def read_range(self):
+        if self.print_range.get() != "pages":
+            return 1, None
+        try:
+            first = int(self.from_entry.get())
+            last = int(self.to_entry.get()) if self.to_entry.get().strip() else None
+        except ValueError:
+            messagebox.showwarning("Предупреждение", "Неверный номер страницы")
+            return None
+        if first < 1 or (last is not None and last < first):
+            messagebox.showwarning("Предупреждение", "Неверный диапазон страниц")
+            return None
+        return first, last
+    
+    @staticmethod
+    def text_pages(text, first_page, last_page=None, lines_per_page=60, width=85):
+        lines = [line[i:i + width] for line in text.splitlines() for i in range(0, max(len(line), 1), width)]
+        page = first_page
+        while last_page is None or page <= last_page:
+            chunk = lines[(page - 1) * lines_per_page:page * lines_per_page]
+            if not chunk:
+                return
+            yield page, chunk
+            page += 1
+    
+    @staticmethod
+    def write_document(filename, pages, copies, collate):
+        writer = create_page_writer(filename)
+        try:
+            if collate:
+                for _ in range(copies):
+                    for _, lines in pages():
+                        writer.write_page(lines)
+            else:
+                for _, lines in pages():
+                    for _ in range(copies):
+                        writer.write_page(lines)
+        finally:
+            writer.close()
+        if not writer.pages:
+            raise ValueError("В выбранном диапазоне нет страниц")
+        return writer.pages
+    
     def print_ok(self):
+        page_range = self.read_range()
+        if page_range is None:
+            return
+        first, last = page_range
+        try:
+            copies = max(1, int(self.copies_spinbox.get()))
+        except ValueError:
+            copies = 1
+        
+        if self.print_range.get() == "selection" or self.paginator is None:
+            try:
+                text = self.report_text.get(tk.SEL_FIRST, tk.SEL_LAST) if self.print_range.get() == "selection" else None
+            except tk.TclError:
+                text = None
+            text = text or self.report_text.get('1.0', tk.END)
+            pages = lambda: self.text_pages(text, first, last)
+        else:
+            paginator = self.paginator
+            pages = lambda: paginator.iter_pages(first, last)
+        
         if self.print_to_file.get():
             filename = filedialog.asksaveasfilename(
-                defaultextension=".txt",
-                filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+                defaultextension=".pdf",
+                filetypes=[("PDF files", "*.pdf"), ("PostScript files", "*.ps"), ("Text files", "*.txt"), ("All files", "*.*")]
             )
-            if filename:
-                try:
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        if self.print_range.get() == "selection":
-                            try:
-                                text = self.report_text.get(tk.SEL_FIRST, tk.SEL_LAST)
-                            except tk.TclError:
-                                text = self.report_text.get('1.0', tk.END)
-                        else:
-                            text = self.report_text.get('1.0', tk.END)
-                        f.write(text)
-                    messagebox.showinfo("Успех", f"Отчет сохранен в файл:\n{filename}")
-                except Exception as e:
-                    messagebox.showerror("Ошибка", f"Не удалось сохранить файл:\n{e}")
-            else:
+            if not filename:
                 return
+            self.executor.submit(
+                self.write_document, filename, pages, copies, self.collate.get(),
+                on_done=lambda count: messagebox.showinfo("Успех", f"Отчет сохранен в файл:\n{filename}\nСтраниц: {count}"),
+                on_error=lambda e: messagebox.showerror("Ошибка", f"Не удалось сохранить файл:\n{e}")
+            )
         else:
-            messagebox.showinfo("Печать", f"Отчет отправлен на печать\nПринтер: Pantum M6500W-series\nКопий: {self.copies_spinbox.get()}")
+            pages_str = f"{first}–{last}" if last else f"с {first}" if first > 1 else "все"
+            messagebox.showinfo("Печать", f"Отчет отправлен на печать\nПринтер: Pantum M6500W-series\n"
+                                          f"Страницы: {pages_str}\nКопий: {copies}")
         
         self.dialog.destroy()
 
+class DiagnosticsForm:
+    COLUMNS = ('Тип', 'Запрос', 'Вызовов', 'p50, мс', 'p95, мс', 'p99, мс', 'Макс, мс', 'Строк', 'Байт', 'Медленных')
+    
+    def __init__(self, parent, db, refresh_interval=1000):
+        self.window = tk.Toplevel(parent)
+        self.window.title("Диагностика запросов")
+        self.window.geometry("900x400")
+        
+        self.db = db
+        self.refresh_interval = refresh_interval
+        self.refresh_job = None
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.setup_ui()
+        self.refresh()
+    
+    def setup_ui(self):
+        main_frame = ttk.Frame(self.window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.tree = ttk.Treeview(main_frame, columns=self.COLUMNS, show='headings')
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=70, anchor=tk.E)
+        self.tree.column('Тип', width=60, anchor=tk.W)
+        self.tree.column('Запрос', width=200, anchor=tk.W)
+        
+        scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        btn_frame = ttk.Frame(self.window, padding="5")
+        btn_frame.pack(fill=tk.X)
+        threshold = self.db.stats.slow_threshold * 1000
+        ttk.Label(btn_frame, text=f"Порог медленного запроса: {threshold:.0f} мс").pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Закрыть", command=self.close).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(btn_frame, text="Сбросить", command=self.reset).pack(side=tk.RIGHT, padx=5)
+    
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        for entry in self.db.get_query_stats():
+            self.tree.insert('', tk.END, values=(
+                entry['kind'],
+                entry['name'],
+                entry['count'],
+                f"{entry['p50']*1000:.2f}",
+                f"{entry['p95']*1000:.2f}",
+                f"{entry['p99']*1000:.2f}",
+                f"{entry['max']*1000:.2f}",
+                entry['rows'],
+                entry['bytes'],
+                entry['slow']
+            ))
+        self.refresh_job = self.window.after(self.refresh_interval, self.refresh)
+    
+    def reset(self):
+        self.db.stats.reset()
+        self.tree.delete(*self.tree.get_children())
+    
+    def close(self):
+        if self.refresh_job:
+            self.window.after_cancel(self.refresh_job)
+        self.window.destroy()
+
+class VirtualProposalList:
+    LIST_FIELDS = ('id', 'department', 'proposal_text', 'priority', 'cost')
+    EMPTY_ROW = {'id': None, 'department': '', 'proposal_text': '', 'priority': '', 'cost': None}
+    
+    def __init__(self, tree, db, executor, page_size=100, max_pages=5, threshold=0.1):
+        self.tree = tree
+        self.db = db
+        self.executor = executor
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.threshold = threshold
+        self.pages = []
+        self.has_more_before = False
+        self.has_more_after = False
+        self.loading = False
+        self.generation = 0
+        self.scrollbar = None
+        self.text = ''
+        self.filters = {}
+        self.first_offset = 0
+        self.deferred = None
+    
+    def attach_scrollbar(self, scrollbar):
+        self.scrollbar = scrollbar
+        self.tree.configure(yscrollcommand=self.on_scroll)
+    
+    @staticmethod
+    def format_row(prop):
+        cost_str = f"{int(prop['cost']):,} ₽".replace(',', ' ') if prop['cost'] else '0 ₽'
+        return (
+            prop['id'],
+            prop['department'],
+            prop['proposal_text'][:255],
+            prop['priority'],
+            cost_str
+        )
+    
+    def set_query(self, text='', filters=None):
+        self.text = text
+        self.filters = filters or {}
+        self.reload()
+    
+    def fetch_rows(self, text, filters, after_id=None, before_id=None, offset=0, limit=None):
+        limit = limit or self.page_size
+        if text:
+            return self.db.search_proposals(text, filters, limit=limit, offset=offset)
+        return self.db.get_proposals_page(after_id=after_id, before_id=before_id, limit=limit, filters=filters)
+    
+    def request(self, handler, **kwargs):
+        generation = self.generation
+        self.loading = True
+        self.executor.submit(
+            self.fetch_rows, self.text, dict(self.filters), **kwargs,
+            on_done=lambda rows: self.on_fetched(generation, handler, rows),
+            on_error=lambda e: self.on_fetch_error(generation, e)
+        )
+    
+    def on_fetched(self, generation, handler, rows):
+        if generation != self.generation:
+            return
+        self.loading = False
+        handler(rows)
+    
+    def on_fetch_error(self, generation, error):
+        if generation == self.generation:
+            self.loading = False
+            self.deferred = None
+        print(f"Ошибка загрузки списка: {error}")
+    
+    def reload(self):
+        self.generation += 1
+        self.tree.delete(*self.tree.get_children())
+        self.pages = []
+        self.first_offset = 0
+        self.has_more_before = False
+        self.has_more_after = False
+        # изменения, пришедшие до загрузки первой страницы, применяются после нее
+        self.deferred = []
+        self.request(self.on_reloaded)
+    
+    def on_reloaded(self, rows):
+        self.has_more_after = len(rows) == self.page_size
+        if rows:
+            self.insert_page(rows)
+            self.pages.append([row['id'] for row in rows])
+        deferred, self.deferred = self.deferred or [], None
+        for change in deferred:
+            self.apply_change(*change)
+    
+    def insert_page(self, rows, at_top=False):
+        position = 0 if at_top else tk.END
+        for row in (reversed(rows) if at_top else rows):
+            if not self.tree.exists(str(row['id'])):
+                self.tree.insert('', position, iid=str(row['id']), values=self.format_row(row))
+    
+    def drop_page(self, page):
+        self.tree.delete(*[str(proposal_id) for proposal_id in page if self.tree.exists(str(proposal_id))])
+    
+    def top_item(self):
+        return self.tree.identify_row(1) or None
+    
+    def restore_top(self, item):
+        children = self.tree.get_children()
+        if item and children and self.tree.exists(item):
+            self.tree.yview_moveto(self.tree.index(item) / len(children))
+    
+    def load_next(self):
+        offset = self.first_offset + sum(len(page) for page in self.pages)
+        self.request(self.on_next_loaded, after_id=self.pages[-1][-1], offset=offset)
+    
+    def on_next_loaded(self, rows):
+        self.has_more_after = len(rows) == self.page_size
+        if not rows or not self.pages:
+            return
+        top = self.top_item()
+        self.insert_page(rows)
+        self.pages.append([row['id'] for row in rows])
+        if len(self.pages) > self.max_pages:
+            dropped = self.pages.pop(0)
+            self.drop_page(dropped)
+            self.first_offset += len(dropped)
+            self.has_more_before = True
+        self.restore_top(top)
+    
+    def load_previous(self):
+        if self.text:
+            offset = max(0, self.first_offset - self.page_size)
+            self.request(
+                lambda rows: self.on_previous_loaded(rows, offset),
+                offset=offset, limit=self.first_offset - offset
+            )
+        else:
+            self.request(lambda rows: self.on_previous_loaded(rows), before_id=self.pages[0][0])
+    
+    def on_previous_loaded(self, rows, offset=None):
+        if offset is not None:
+            self.first_offset = offset
+            self.has_more_before = offset > 0
+        else:
+            self.has_more_before = len(rows) == self.page_size
+        if not rows or not self.pages:
+            return
+        top = self.top_item()
+        self.insert_page(rows, at_top=True)
+        self.pages.insert(0, [row['id'] for row in rows])
+        if len(self.pages) > self.max_pages:
+            self.drop_page(self.pages.pop())
+            self.has_more_after = True
+        self.restore_top(top)
+    
+    def apply_change(self, action, proposal_id, row=None):
+        if action == 'reload':
+            self.reload()
+        elif self.deferred is not None:
+            self.deferred.append((action, proposal_id, row))
+        elif action == 'delete':
+            self.apply_delete(proposal_id)
+        elif action == 'update':
+            self.apply_update(proposal_id, row)
+        elif action == 'insert':
+            self.apply_insert(row)
+    
+    def apply_update(self, proposal_id, row):
+        if not self.tree.exists(str(proposal_id)):
+            return
+        if all(field in row for field in self.LIST_FIELDS):
+            self.tree.item(str(proposal_id), values=self.format_row(row))
+            return
+        values = list(self.tree.item(str(proposal_id))['values'])
+        formatted = self.format_row(dict(self.EMPTY_ROW, **row))
+        for index, field in enumerate(self.LIST_FIELDS):
+            if field in row:
+                values[index] = formatted[index]
+        self.tree.item(str(proposal_id), values=values)
+    
+    def apply_insert(self, row):
+        proposal_id = row['id']
+        if self.text or self.filters or self.tree.exists(str(proposal_id)):
+            return
+        if self.pages:
+            if proposal_id < self.pages[0][0] and self.has_more_before:
+                return
+            if proposal_id > self.pages[-1][-1] and self.has_more_after:
+                return
+        else:
+            self.pages.append([])
+        page = next((page for page in self.pages if page and page[-1] > proposal_id), self.pages[-1])
+        bisect.insort(page, proposal_id)
+        index = bisect.bisect_left([item_id for page in self.pages for item_id in page], proposal_id)
+        self.tree.insert('', index, iid=str(proposal_id), values=self.format_row(row))
+    
+    def apply_delete(self, proposal_id):
+        if not self.tree.exists(str(proposal_id)):
+            return
+        self.tree.delete(str(proposal_id))
+        for page in self.pages:
+            if proposal_id in page:
+                page.remove(proposal_id)
+                break
+        self.pages = [page for page in self.pages if page]
+        if not self.pages and (self.has_more_before or self.has_more_after):
+            self.reload()
+    
+    def on_scroll(self, first, last):
+        if self.scrollbar:
+            self.scrollbar.set(first, last)
+        if self.loading or not self.pages:
+            return
+        if float(last) >= 1 - self.threshold and self.has_more_after:
+            self.load_next()
+        elif float(first) <= self.threshold and self.has_more_before:
+            self.load_previous()
+
 class MainForm:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Формирование предложений о расширении информационной системы")
-        self.root.geometry("900x400")
+        self.root.geometry("1150x500")
         
-        self.db = Database()
+        self.executor = DBExecutor(self.root)
+        log_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'slow_queries.log')
+        self.db = Database(autoconnect=False, slow_query_log=log_path)
+        self.db.error_handler = lambda title, message: self.executor.call_soon(messagebox.showerror, title, message)
+        
+        self.status_task = None
+        self.db.subscribe(self.on_db_change)
         
         self.setup_ui()
-        self.load_data()
+        self.executor.submit(self.db.connect, on_done=self.on_connected)
+        self.update_status()
         
         self.root.mainloop()
+        self.executor.shutdown()
     
     def setup_ui(self):
         main_frame = ttk.Frame(self.root, padding="10")
@@ -514,6 +2969,8 @@ class MainForm:
                                font=('Arial', 14, 'bold'))
         title_label.pack(pady=10)
         
+        self.setup_search(main_frame)
+        
         columns = ('ID', 'Подразделение', 'Предложение', 'Приоритет', 'Стоимость')
         self.tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=10)
         
@@ -530,7 +2987,8 @@ class MainForm:
         self.tree.column('Стоимость', width=150)
         
         scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.list_view = VirtualProposalList(self.tree, self.db, self.executor)
+        self.list_view.attach_scrollbar(scrollbar)
         
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -541,25 +2999,133 @@ class MainForm:
         ttk.Button(btn_frame, text="Добавить предложение", command=self.add_proposal, width=20).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Просмотр деталей", command=self.view_proposal, width=20).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Сформировать отчет", command=self.show_report, width=20).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Изменить выбранные", command=self.batch_edit, width=20).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Импорт", command=self.import_proposals, width=10).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Экспорт", command=self.export_proposals, width=10).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Выход", command=self.root.quit, width=15).pack(side=tk.RIGHT, padx=5)
         
         self.tree.bind('<Double-Button-1>', lambda e: self.view_proposal())
+        self.root.bind('<Control-Shift-D>', lambda e: self.show_diagnostics())
+        
+        status_frame = ttk.Frame(self.root, relief=tk.SUNKEN)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        self.spinner = ttk.Progressbar(status_frame, mode='indeterminate', length=80)
+        self.status_var = tk.StringVar()
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, anchor=tk.W)
+        status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.executor.busy_listeners.append(self.on_busy)
+    
+    def on_busy(self, pending):
+        if pending and not self.spinner.winfo_ismapped():
+            self.spinner.pack(side=tk.RIGHT, padx=5)
+            self.spinner.start(15)
+        elif not pending and self.spinner.winfo_ismapped():
+            self.spinner.stop()
+            self.spinner.pack_forget()
+    
+    def collect_status(self):
+        return self.db.get_cache_stats(), self.db.get_pool_stats(), self.db.get_backend_status()
+    
+    def update_status(self):
+        if self.status_task is None or self.status_task.done():
+            self.status_task = self.executor.submit(self.collect_status, on_done=self.show_status)
+        self.root.after(1000, self.update_status)
+    
+    def show_status(self, stats):
+        cache, pool, backend = stats
+        status = (
+            f"Хранилище: {'онлайн' if backend['online'] else 'автономно'}, в очереди {backend['pending']} | "
+            f"Кэш: попаданий {cache['hits']}, промахов {cache['misses']} "
+            f"({cache['hit_rate']*100:.0f}%), устаревших {cache['stale']}"
+        )
+        if pool:
+            status += f" | Пул: соединений {pool['size']}, ожидание {pool['wait_avg']*1000:.1f} мс"
+        self.status_var.set(status)
+    
+    def setup_search(self, parent):
+        search_frame = ttk.LabelFrame(parent, text="Поиск", padding="5")
+        search_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(search_frame, text="Текст:").grid(row=0, column=0, sticky=tk.W, padx=2)
+        self.search_entry = ttk.Entry(search_frame, width=30)
+        self.search_entry.grid(row=0, column=1, columnspan=3, sticky=tk.W, padx=2, pady=2)
+        self.search_entry.bind('<Return>', lambda e: self.search())
+        
+        ttk.Label(search_frame, text="Подразделение:").grid(row=0, column=4, sticky=tk.W, padx=2)
+        self.department_filter = ttk.Combobox(search_frame, width=20, postcommand=self.refresh_departments)
+        self.department_filter.grid(row=0, column=5, sticky=tk.W, padx=2)
+        
+        ttk.Label(search_frame, text="Приоритет:").grid(row=0, column=6, sticky=tk.W, padx=2)
+        self.priority_filter = ttk.Combobox(search_frame, values=('',) + Database.PRIORITIES, width=10, state='readonly')
+        self.priority_filter.grid(row=0, column=7, sticky=tk.W, padx=2)
+        
+        ttk.Label(search_frame, text="Стоимость от:").grid(row=1, column=0, sticky=tk.W, padx=2)
+        self.cost_min_entry = ttk.Entry(search_frame, width=10)
+        self.cost_min_entry.grid(row=1, column=1, sticky=tk.W, padx=2)
+        ttk.Label(search_frame, text="до:").grid(row=1, column=2, sticky=tk.W, padx=2)
+        self.cost_max_entry = ttk.Entry(search_frame, width=10)
+        self.cost_max_entry.grid(row=1, column=3, sticky=tk.W, padx=2)
+        
+        ttk.Label(search_frame, text="Срок с:").grid(row=1, column=4, sticky=tk.W, padx=2)
+        self.date_from_entry = ttk.Entry(search_frame, width=12)
+        self.date_from_entry.grid(row=1, column=5, sticky=tk.W, padx=2)
+        ttk.Label(search_frame, text="по:").grid(row=1, column=6, sticky=tk.W, padx=2)
+        self.date_to_entry = ttk.Entry(search_frame, width=12)
+        self.date_to_entry.grid(row=1, column=7, sticky=tk.W, padx=2)
+        
+        ttk.Button(search_frame, text="Найти", command=self.search, width=10).grid(row=0, column=8, padx=5)
+        ttk.Button(search_frame, text="Сбросить", command=self.reset_search, width=10).grid(row=1, column=8, padx=5)
+    
+    def refresh_departments(self):
+        self.executor.submit(self.db.get_departments, on_done=self.set_departments)
+    
+    def set_departments(self, departments):
+        self.department_filter['values'] = [''] + departments
+    
+    def read_filters(self):
+        filters = {
+            'department': self.department_filter.get().strip(),
+            'priority': self.priority_filter.get()
+        }
+        try:
+            for key, entry in (('cost_min', self.cost_min_entry), ('cost_max', self.cost_max_entry)):
+                value = entry.get().replace(' ', '').replace('₽', '')
+                filters[key] = float(value) if value else None
+        except ValueError:
+            messagebox.showwarning("Предупреждение", "Неверный формат стоимости")
+            return None
+        try:
+            for key, entry in (('date_from', self.date_from_entry), ('date_to', self.date_to_entry)):
+                value = entry.get().strip()
+                filters[key] = datetime.strptime(value, '%d.%m.%Y').strftime('%Y-%m-%d') if value else None
+        except ValueError:
+            messagebox.showwarning("Предупреждение", "Неверный формат даты. Используйте ДД.ММ.ГГГГ")
+            return None
+        return {key: value for key, value in filters.items() if value not in (None, '')}
+    
+    def search(self):
+        filters = self.read_filters()
+        if filters is None:
+            return
+        self.list_view.set_query(self.search_entry.get().strip(), filters)
+    
+    def reset_search(self):
+        for entry in (self.search_entry, self.cost_min_entry, self.cost_max_entry, self.date_from_entry, self.date_to_entry):
+            entry.delete(0, tk.END)
+        self.department_filter.set('')
+        self.priority_filter.set('')
+        self.list_view.set_query()
+    
+    def on_connected(self, result):
+        self.load_data()
+        self.refresh_departments()
     
     def load_data(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        proposals = self.db.get_all_proposals()
-        
-        for prop in proposals:
-            cost_str = f"{int(prop['cost']):,} ₽".replace(',', ' ') if prop['cost'] else '0 ₽'
-            self.tree.insert('', tk.END, values=(
-                prop['id'],
-                prop['department'],
-                prop['proposal_text'],
-                prop['priority'],
-                cost_str
-            ))
+        self.list_view.reload()
+    
+    def on_db_change(self, action, proposal_id, row):
+        # события приходят из потоков БД и синхронизации, в список они попадают через очередь потока Tk
+        self.executor.call_soon(self.list_view.apply_change, action, proposal_id, row)
     
     def get_selected_id(self):
         selection = self.tree.selection()
@@ -570,15 +3136,63 @@ class MainForm:
         return item['values'][0]
     
     def add_proposal(self):
-        AddProposalForm(self.root, self.db, self.load_data)
+        AddProposalForm(self.root, self.db, self.executor)
     
     def view_proposal(self):
         proposal_id = self.get_selected_id()
         if proposal_id:
-            DetailsForm(self.root, self.db, proposal_id, self.load_data)
+            DetailsForm(self.root, self.db, self.executor, proposal_id)
+    
+    def batch_edit(self):
+        ids = [int(item) for item in self.tree.selection()]
+        if not ids:
+            messagebox.showwarning("Предупреждение", "Выберите записи")
+            return
+        BatchEditForm(self.root, self.db, self.executor, ids)
     
     def show_report(self):
-        ReportForm(self.root, self.db)
+        ReportForm(self.root, self.db, self.executor)
+    
+    def show_diagnostics(self):
+        DiagnosticsForm(self.root, self.db)
+    
+    def import_proposals(self):
+        filename = filedialog.askopenfilename(
+            filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        
+        self.executor.submit(
+            self.db.bulk_import, filename, on_done=self.on_imported,
+            on_error=lambda e: messagebox.showerror("Ошибка", f"Не удалось импортировать данные:\n{e}")
+        )
+    
+    def on_imported(self, result):
+        if result is None:
+            return
+        
+        message = f"Импортировано записей: {result['imported']}\n" \
+                  f"Скорость: {result['rows_per_second']:.0f} строк/с"
+        if result['errors']:
+            details = "\n".join(f"Строка {line}: {error}" for line, error in result['errors'][:10])
+            message += f"\n\nПропущено строк: {len(result['errors'])}\n{details}"
+        messagebox.showinfo("Импорт", message)
+    
+    def export_proposals(self):
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        
+        self.executor.submit(self.db.bulk_export, filename, on_done=self.on_exported)
+    
+    def on_exported(self, result):
+        if result is not None:
+            messagebox.showinfo("Экспорт", f"Экспортировано записей: {result['exported']}\n"
+                                           f"Скорость: {result['rows_per_second']:.0f} строк/с")
 
 if __name__ == "__main__":
     app = MainForm()
\ No newline at end of file
@@ -0,0 +1,60 @@
+import unittest
+import gg
+
+class FakeTree:
+    def __init__(self):
+        self.items = []
+        self.values = {}
+    
+    def get_children(self, parent=''):
+        return tuple(self.items)
+    
+    def insert(self, parent, position, iid=None, values=()):
+        if position == 0:
+            self.items.insert(0, iid)
+        elif position == gg.tk.END:
+            self.items.append(iid)
+        else:
+            self.items.insert(position, iid)
+        self.values[iid] = values
+        return iid
+    
+    def delete(self, *iids):
+        for iid in iids:
+            self.items.remove(iid)
+            del self.values[iid]
+    
+    def exists(self, iid):
+        return iid in self.values
+
+class ImmediateExecutor:
+    def submit(self, func, *args, on_done=None, on_error=None, **kwargs):
+        on_done(func(*args, **kwargs))
+
+class OfflineProposalsTest(unittest.TestCase):
+    def setUp(self):
+        # сервер недоступен: записи получают временные отрицательные id
+        remote = gg.MySQLBackend(host='127.0.0.1', port=9, connect_timeout=1)
+        self.backend = gg.WriteBehindBackend(gg.SQLiteBackend(), remote, sync_interval=3600)
+        self.db = gg.Database(backend=self.backend, autoconnect=False)
+        self.errors = []
+        self.db.error_handler = lambda title, message: self.errors.append(title)
+        self.db.connect()
+    
+    def tearDown(self):
+        self.backend.close()
+    
+    def test_offline_row_survives_reload(self):
+        data = dict(zip(gg.Database.IMPORT_COLUMNS, ('ИТ', 'Новый сервер', 'Высокий', 1000, '', None)))
+        proposal_id = self.db.add_proposal(data)
+        self.assertFalse(self.backend.online)
+        self.assertEqual(self.errors, ["Автономный режим"])
+        self.assertLess(proposal_id, 0)
+        
+        view = gg.VirtualProposalList(FakeTree(), self.db, ImmediateExecutor())
+        view.reload()
+        self.assertIn(str(proposal_id), view.tree.get_children())
+        self.assertEqual([row['id'] for row in self.db.get_proposals_page()], [proposal_id])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,346 @@
+import csv
+import heapq
+import os
+import re
+from collections import deque
+from datetime import datetime
+import numpy as np
+from scipy.stats import chi2, f as fisher
+
+FLEET_COLUMNS = {
+    'system': ('system', 'name', 'система'),
+    't0': ('t0', 'mtbf', 'т0'),
+    'tv': ('tv', 'tr', 'mttr', 'тв')
+}
+
+def positive(values, dtype=float, allow_nan=False):
+    array = np.asarray(values, dtype=dtype)
+    if array.size == 0:
+        raise ValueError("Нет данных для расчета")
+    missing = np.isnan(array) if np.issubdtype(array.dtype, np.floating) else np.zeros(array.shape, dtype=bool)
+    if missing.any() and not allow_nan:
+        raise ValueError("Введите корректные числовые значения")
+    if np.any(array[~missing] <= 0):
+        raise ValueError("Значения должны быть положительными")
+    return array
+
+def mtbf_confidence(total_time, failures, confidence=0.95, time_truncated=False):
+    total_time = np.asarray(total_time, dtype=float)
+    failures = np.asarray(failures)
+    alpha = 1 - confidence
+    lower_dof = 2 * failures + 2 if time_truncated else 2 * failures
+    lower = 2 * total_time / chi2.ppf(1 - alpha / 2, lower_dof)
+    upper = 2 * total_time / chi2.ppf(alpha / 2, 2 * failures)
+    return lower, upper
+
+def mtbf_from_times(times, confidence=None):
+    times = positive(times, allow_nan=True)
+    failures = np.count_nonzero(~np.isnan(times), axis=-1)
+    if np.any(failures == 0):
+        raise ValueError("У каждой системы должен быть хотя бы один отказ")
+    total = np.nansum(times, axis=-1)
+    result = {'total': total, 'failures': failures, 'mtbf': total / failures}
+    if confidence is not None:
+        result['lower'], result['upper'] = mtbf_confidence(total, failures, confidence)
+    return result
+
+def pooled_mtbf(operating_times, failures, confidence=None):
+    operating_times = positive(operating_times)
+    failures = positive(failures, dtype=np.int64)
+    total = operating_times.sum(axis=-1)
+    total_failures = failures.sum(axis=-1)
+    result = {'total': total, 'failures': total_failures, 'mtbf': total / total_failures}
+    if confidence is not None:
+        result['lower'], result['upper'] = mtbf_confidence(total, total_failures, confidence, time_truncated=True)
+    return result
+
+def availability(t0, tv):
+    t0 = positive(t0)
+    tv = positive(tv)
+    return t0 / (t0 + tv)
+
+def rank(values, descending=True):
+    values = np.asarray(values, dtype=float)
+    order = np.argsort(-values if descending else values, kind='stable')
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[order] = np.arange(1, len(values) + 1)
+    return order, ranks
+
+def availability_interval(t0, tv, cycles, repair_cycles=None, confidence=0.95):
+    t0 = positive(t0)
+    tv = positive(tv)
+    up_cycles = np.broadcast_to(positive(cycles), t0.shape).astype(float)
+    repair_cycles = up_cycles if repair_cycles is None else np.broadcast_to(positive(repair_cycles), t0.shape).astype(float)
+    alpha = 1 - confidence
+    # оценка Kг = 1/(1 + Tв/T₀·F(2m, 2n)) монотонно убывает по F: границы - квантили F
+    ratio = tv / t0
+    lower = 1 / (1 + ratio * fisher.ppf(1 - alpha / 2, 2 * repair_cycles, 2 * up_cycles))
+    upper = 1 / (1 + ratio * fisher.ppf(alpha / 2, 2 * repair_cycles, 2 * up_cycles))
+    return lower, upper
+
+def compare_availability(t0, tv, cycles=None, confidence=0.95):
+    kg = availability(t0, tv)
+    order, ranks = rank(kg)
+    best = kg[order[0]]
+    result = {
+        'kg': kg,
+        'order': order,
+        'ranks': ranks,
+        'best': int(order[0]),
+        'tie': int(np.count_nonzero(kg == best)) > 1
+    }
+    if cycles is not None:
+        result['lower'], result['upper'] = availability_interval(t0, tv, cycles, confidence=confidence)
+    return result
+
+def find_columns(header):
+    normalized = [name.strip().lower() for name in header]
+    columns = {}
+    for key, aliases in FLEET_COLUMNS.items():
+        for alias in aliases:
+            if alias in normalized:
+                columns[key] = normalized.index(alias)
+                break
+    missing = {'t0', 'tv'} - set(columns)
+    if missing:
+        raise ValueError(f"В файле нет столбцов: {', '.join(sorted(missing))}")
+    return columns
+
+def parse_number(value, line, column):
+    try:
+        return float(value.replace(',', '.'))
+    except ValueError:
+        raise ValueError(f"Строка {line}: некорректное значение {column}")
+
+def iter_csv_fleet(path, chunk_size):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=';,\t')
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(f, dialect)
+        columns = find_columns(next(reader, []))
+        names, t0, tv = [], [], []
+        count = 0
+        for line, row in enumerate(reader, start=2):
+            if not any(cell.strip() for cell in row):
+                continue
+            if len(row) <= max(columns.values()):
+                raise ValueError(f"Строка {line}: недостаточно столбцов")
+            t0.append(parse_number(row[columns['t0']], line, 'T₀'))
+            tv.append(parse_number(row[columns['tv']], line, 'Tв'))
+            count += 1
+            names.append(row[columns['system']].strip() if 'system' in columns else str(count))
+            if len(names) >= chunk_size:
+                yield np.array(names), np.array(t0), np.array(tv)
+                names, t0, tv = [], [], []
+        if names:
+            yield np.array(names), np.array(t0), np.array(tv)
+
+def iter_parquet_fleet(path, chunk_size):
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(path)
+    columns = find_columns(parquet.schema_arrow.names)
+    count = 0
+    for batch in parquet.iter_batches(batch_size=chunk_size):
+        t0 = batch.column(columns['t0']).to_numpy(zero_copy_only=False).astype(float)
+        tv = batch.column(columns['tv']).to_numpy(zero_copy_only=False).astype(float)
+        if 'system' in columns:
+            names = batch.column(columns['system']).to_numpy(zero_copy_only=False).astype(str)
+        else:
+            names = np.arange(count + 1, count + len(t0) + 1).astype(str)
+        count += len(t0)
+        yield names, t0, tv
+
+def iter_fleet(path, chunk_size=10000):
+    if path.lower().endswith('.parquet'):
+        return iter_parquet_fleet(path, chunk_size)
+    return iter_csv_fleet(path, chunk_size)
+
+class FleetRanking:
+    def __init__(self, k=10):
+        self.k = k
+        self.top = []
+        self.bottom = []
+        self.count = 0
+        self.kg_sum = 0.0
+    
+    def candidates(self, values):
+        if len(values) <= self.k:
+            return range(len(values))
+        return np.argpartition(values, len(values) - self.k)[-self.k:]
+    
+    def push(self, heap, item):
+        if len(heap) < self.k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    
+    def add(self, names, t0, tv):
+        kg = availability(t0, tv)
+        for index in self.candidates(kg):
+            self.push(self.top, (kg[index], -(self.count + index), str(names[index]), t0[index], tv[index]))
+        for index in self.candidates(-kg):
+            self.push(self.bottom, (-kg[index], -(self.count + index), str(names[index]), t0[index], tv[index]))
+        self.count += len(kg)
+        self.kg_sum += float(kg.sum())
+    
+    @staticmethod
+    def as_row(place, item, kg):
+        _, seq, name, t0, tv = item
+        return {'place': place, 'index': int(-seq), 'name': name, 't0': float(t0), 'tv': float(tv), 'kg': float(kg)}
+    
+    def result(self):
+        top = sorted(self.top, reverse=True)
+        bottom = sorted(self.bottom, reverse=True)
+        return {
+            'count': self.count,
+            'mean_kg': self.kg_sum / self.count if self.count else 0.0,
+            'top': [self.as_row(place, item, item[0]) for place, item in enumerate(top, start=1)],
+            'bottom': [self.as_row(self.count - place, item, -item[0]) for place, item in enumerate(bottom)]
+        }
+
+def rank_fleet(path, k=10, chunk_size=10000):
+    ranking = FleetRanking(k)
+    for names, t0, tv in iter_fleet(path, chunk_size):
+        ranking.add(names, t0, tv)
+    if not ranking.count:
+        raise ValueError("Файл не содержит данных")
+    return ranking.result()
+
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+    
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+    
+    def remove(self, value):
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        delta = value - self.mean
+        self.count -= 1
+        self.mean -= delta / self.count
+        self.m2 = max(0.0, self.m2 - delta * (value - self.mean))
+    
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+def parse_event(line):
+    fields = [field.strip() for field in re.split(r'[;,\t]', line.strip())]
+    if len(fields) < 2 or not fields[0]:
+        raise ValueError(f"Некорректная строка журнала: {line.strip()}")
+    try:
+        timestamp = float(fields[0])
+    except ValueError:
+        timestamp = datetime.fromisoformat(fields[0]).timestamp() / 3600
+    kind = fields[1].lower()
+    if kind not in ('failure', 'repair'):
+        raise ValueError(f"Неизвестное событие: {fields[1]}")
+    value = float(fields[2].replace(',', '.')) if kind == 'repair' and len(fields) > 2 else None
+    if kind == 'repair' and (value is None or value <= 0):
+        raise ValueError(f"Не указана длительность ремонта: {line.strip()}")
+    return timestamp, kind, value
+
+class FailureMonitor:
+    def __init__(self, window=None):
+        self.window = window
+        self.intervals = RunningStats()
+        self.repairs = RunningStats()
+        self.window_intervals = RunningStats()
+        self.window_repairs = RunningStats()
+        self.recent = deque()
+        self.last_failure = None
+        self.failures = 0
+        self.skipped = 0
+        self.invalid = 0
+    
+    def add(self, timestamp, kind, value=None):
+        if kind == 'failure':
+            self.failures += 1
+            if self.last_failure is not None:
+                interval = timestamp - self.last_failure
+                if interval <= 0:
+                    self.skipped += 1
+                    return
+                self.intervals.add(interval)
+                self.track(timestamp, self.window_intervals, interval)
+            self.last_failure = timestamp
+        else:
+            self.repairs.add(value)
+            self.track(timestamp, self.window_repairs, value)
+        self.expire(timestamp)
+    
+    def track(self, timestamp, stats, value):
+        if self.window is not None:
+            stats.add(value)
+            self.recent.append((timestamp, stats, value))
+    
+    def expire(self, now):
+        if self.window is None:
+            return
+        while self.recent and self.recent[0][0] < now - self.window:
+            _, stats, value = self.recent.popleft()
+            stats.remove(value)
+    
+    @staticmethod
+    def estimate(intervals, repairs):
+        mtbf = intervals.mean if intervals.count else None
+        kg = mtbf / (mtbf + repairs.mean) if mtbf and repairs.count else None
+        return {
+            'intervals': intervals.count,
+            'mtbf': mtbf,
+            'std': intervals.variance ** 0.5,
+            'rate': 1 / mtbf if mtbf else None,
+            'repairs': repairs.count,
+            'mean_repair': repairs.mean if repairs.count else None,
+            'kg': kg
+        }
+    
+    def snapshot(self):
+        result = {
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'invalid': self.invalid,
+            'total': self.estimate(self.intervals, self.repairs)
+        }
+        if self.window is not None:
+            result['window'] = self.estimate(self.window_intervals, self.window_repairs)
+        return result
+
+class LogTailer:
+    def __init__(self, path, from_start=True):
+        self.path = path
+        self.file = open(path, 'r', encoding='utf-8')
+        if not from_start:
+            self.file.seek(0, os.SEEK_END)
+        self.buffer = ''
+    
+    def poll(self, max_lines=10000):
+        if os.path.getsize(self.path) < self.file.tell():
+            self.file.close()
+            self.file = open(self.path, 'r', encoding='utf-8')
+            self.buffer = ''
+        lines = []
+        while len(lines) < max_lines:
+            chunk = self.file.readline()
+            if not chunk:
+                break
+            self.buffer += chunk
+            if self.buffer.endswith('\n'):
+                if self.buffer.strip():
+                    lines.append(self.buffer)
+                self.buffer = ''
+        return lines
+    
+    def close(self):
+        self.file.close()
@@ -1,6 +1,171 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import math
+from tkinter import ttk, messagebox, filedialog
+import queue
+import threading
+import time
+import reliability_core
+
+class VirtualTable:
+    def __init__(self, parent, columns, height=15):
+        self.columns = columns
+        self.height = height
+        self.rows = []
+        self.offset = 0
+        self.sort_key = None
+        self.descending = False
+        
+        frame = ttk.Frame(parent)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.tree = ttk.Treeview(frame, columns=[title for title, _, _ in columns], show='headings', height=height)
+        for title, key, width in columns:
+            self.tree.heading(title, text=title, command=lambda key=key: self.sort_by(key))
+            self.tree.column(title, width=width)
+        self.scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-1))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(1))
+    
+    def set_rows(self, rows):
+        self.rows = list(rows)
+        if self.sort_key:
+            self.rows.sort(key=lambda row: row[self.sort_key], reverse=self.descending)
+        self.offset = 0
+        self.render()
+    
+    def sort_by(self, key):
+        self.descending = not self.descending if self.sort_key == key else False
+        self.sort_key = key
+        self.rows.sort(key=lambda row: row[key], reverse=self.descending)
+        self.render()
+    
+    def scroll(self, units):
+        self.offset = max(0, min(self.offset + units * 3, len(self.rows) - self.height))
+        self.render()
+    
+    def on_scrollbar(self, action, value, unit=None):
+        if action == 'moveto':
+            self.offset = int(float(value) * len(self.rows))
+        else:
+            self.offset += int(value) * (self.height if unit == 'pages' else 1)
+        self.offset = max(0, min(self.offset, len(self.rows) - self.height))
+        self.render()
+    
+    def render(self):
+        self.tree.delete(*self.tree.get_children())
+        for row in self.rows[self.offset:self.offset + self.height]:
+            self.tree.insert('', tk.END, values=[row[key] for _, key, _ in self.columns])
+        if self.rows:
+            self.scrollbar.set(self.offset / len(self.rows), min(1.0, (self.offset + self.height) / len(self.rows)))
+        else:
+            self.scrollbar.set(0, 1)
+
+class FleetWindow:
+    COLUMNS = (
+        ('Группа', 'group', 70),
+        ('Место', 'place', 60),
+        ('Система', 'name', 120),
+        ('T₀, ч', 't0', 80),
+        ('Tв, ч', 'tv', 80),
+        ('Кг', 'kg', 70),
+        ('Расчет', 'formula', 300)
+    )
+    
+    def __init__(self, parent):
+        self.window = tk.Toplevel(parent)
+        self.window.title("Сравнение парка систем по коэффициенту готовности")
+        self.window.geometry("850x500")
+        
+        self.results = queue.Queue()
+        self.poll_job = None
+        self.run_id = 0
+        self.setup_ui()
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+    
+    def setup_ui(self):
+        main_frame = ttk.Frame(self.window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        control_frame = ttk.Frame(main_frame)
+        control_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(control_frame, text="Лучших/худших (K):").pack(side=tk.LEFT, padx=5)
+        self.k_spinbox = ttk.Spinbox(control_frame, from_=1, to=10000, width=7)
+        self.k_spinbox.pack(side=tk.LEFT, padx=5)
+        self.k_spinbox.set(50)
+        ttk.Button(control_frame, text="Открыть файл...", command=self.open_file, width=18).pack(side=tk.LEFT, padx=5)
+        
+        self.status_label = ttk.Label(control_frame, text="Файл CSV или Parquet со столбцами system, t0, tv")
+        self.status_label.pack(side=tk.LEFT, padx=10)
+        
+        self.table = VirtualTable(main_frame, self.COLUMNS)
+    
+    def open_file(self):
+        path = filedialog.askopenfilename(
+            parent=self.window,
+            filetypes=[("CSV files", "*.csv"), ("Parquet files", "*.parquet"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            k = max(1, int(self.k_spinbox.get()))
+        except ValueError:
+            messagebox.showerror("Ошибка", "Введите корректное значение K", parent=self.window)
+            return
+        
+        self.status_label.config(text="Обработка...")
+        # результат предыдущего файла, если он еще считается, будет отброшен
+        self.run_id += 1
+        threading.Thread(target=self.rank, args=(self.run_id, path, k), daemon=True).start()
+        if self.poll_job is None:
+            self.poll_job = self.window.after(50, self.poll)
+    
+    def rank(self, run_id, path, k):
+        # в очередь всегда попадает результат или ошибка, иначе poll ждал бы вечно
+        try:
+            self.results.put((run_id, 'ok', reliability_core.rank_fleet(path, k)))
+        except Exception as e:
+            self.results.put((run_id, 'error', e))
+    
+    def poll(self):
+        self.poll_job = None
+        try:
+            run_id, status, payload = self.results.get_nowait()
+        except queue.Empty:
+            self.poll_job = self.window.after(50, self.poll)
+            return
+        if run_id != self.run_id:
+            self.poll_job = self.window.after(50, self.poll)
+            return
+        if status == 'error':
+            self.status_label.config(text="")
+            messagebox.showerror("Ошибка", f"Не удалось обработать файл:\n{payload}", parent=self.window)
+            return
+        self.show(payload)
+    
+    @staticmethod
+    def make_row(group, row):
+        return dict(
+            row,
+            group=group,
+            formula=f"Кг = T₀ / (T₀ + Tв) = {row['t0']:.2f} / ({row['t0']:.2f} + {row['tv']:.2f}) = {row['kg']:.4f}"
+        )
+    
+    def show(self, result):
+        rows = [self.make_row("Лучшие", row) for row in result['top']]
+        rows += [self.make_row("Худшие", row) for row in result['bottom']]
+        self.table.set_rows(rows)
+        self.status_label.config(text=f"Систем: {result['count']}, средний Кг = {result['mean_kg']:.4f}")
+    
+    def close(self):
+        if self.poll_job is not None:
+            self.window.after_cancel(self.poll_job)
+            self.poll_job = None
+        self.window.destroy()
 
 class ReliabilityApp:
     def __init__(self):
@@ -8,6 +173,12 @@ class ReliabilityApp:
         self.root.title("Определение показателей безотказности системы")
         self.root.geometry("700x500")
         
+        self.tailer = None
+        self.monitor = None
+        self.monitor_job = None
+        self.monitor_dirty = False
+        self.last_redraw = 0.0
+        
         self.setup_ui()
         
         self.root.mainloop()
@@ -20,20 +191,30 @@ class ReliabilityApp:
                                font=('Arial', 14, 'bold'))
         title_label.pack(pady=10)
         
+        confidence_frame = ttk.Frame(main_frame)
+        confidence_frame.pack()
+        ttk.Label(confidence_frame, text="Доверительная вероятность γ:").pack(side=tk.LEFT, padx=5)
+        self.confidence = ttk.Combobox(confidence_frame, values=("0.90", "0.95", "0.99"), width=6, state='readonly')
+        self.confidence.set("0.95")
+        self.confidence.pack(side=tk.LEFT)
+        
         notebook = ttk.Notebook(main_frame)
         notebook.pack(fill=tk.BOTH, expand=True, pady=10)
         
         task1_frame = ttk.Frame(notebook)
         task2_frame = ttk.Frame(notebook)
         task3_frame = ttk.Frame(notebook)
+        monitor_frame = ttk.Frame(notebook)
         
         notebook.add(task1_frame, text="Задание 1")
         notebook.add(task2_frame, text="Задание 2")
         notebook.add(task3_frame, text="Задание 3")
+        notebook.add(monitor_frame, text="Мониторинг")
         
         self.setup_task1(task1_frame)
         self.setup_task2(task2_frame)
         self.setup_task3(task3_frame)
+        self.setup_monitor(monitor_frame)
     
     def setup_task1(self, parent):
         frame = ttk.Frame(parent, padding="20")
@@ -164,8 +345,13 @@ class ReliabilityApp:
         self.task3_tv_2 = ttk.Entry(data_frame, width=10)
         self.task3_tv_2.grid(row=2, column=3, padx=5, pady=2)
         
-        ttk.Button(data_frame, text="Заполнить по варианту 1", command=self.fill_variant1, width=20).grid(row=3, column=0, columnspan=4, pady=10)
-        ttk.Button(data_frame, text="Заполнить по варианту 16", command=self.fill_variant16, width=20).grid(row=4, column=0, columnspan=4, pady=5)
+        ttk.Label(data_frame, text="Число циклов n:").grid(row=3, column=0, sticky=tk.W, padx=5)
+        self.task3_cycles = ttk.Entry(data_frame, width=10)
+        self.task3_cycles.insert(0, "10")
+        self.task3_cycles.grid(row=3, column=1, padx=5, pady=2)
+        
+        ttk.Button(data_frame, text="Заполнить по варианту 1", command=self.fill_variant1, width=20).grid(row=4, column=0, columnspan=4, pady=10)
+        ttk.Button(data_frame, text="Заполнить по варианту 16", command=self.fill_variant16, width=20).grid(row=5, column=0, columnspan=4, pady=5)
         
         result_frame = ttk.LabelFrame(frame, text="Результат", padding="10")
         result_frame.pack(fill=tk.X, pady=10)
@@ -184,88 +370,191 @@ class ReliabilityApp:
         
         ttk.Button(btn_frame, text="Рассчитать", command=self.calculate_task3, width=15).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Очистить", command=self.clear_task3, width=15).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Парк систем...", command=self.open_fleet, width=15).pack(side=tk.LEFT, padx=5)
     
-    def calculate_task1(self):
+    def setup_monitor(self, parent):
+        frame = ttk.Frame(parent, padding="20")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(frame, text="Мониторинг по журналу отказов", font=('Arial', 12, 'bold')).pack(anchor=tk.W, pady=10)
+        
+        desc_text = "Строки журнала: время;failure или время;repair;длительность ремонта (ч).\n" \
+                   "Время — в формате ISO (2024-01-31T12:00:00) или в часах."
+        
+        ttk.Label(frame, text=desc_text, justify=tk.LEFT).pack(anchor=tk.W, pady=10)
+        
+        input_frame = ttk.LabelFrame(frame, text="Параметры", padding="10")
+        input_frame.pack(fill=tk.X, pady=10)
+        
+        ttk.Label(input_frame, text="Скользящее окно (часы, пусто — без окна):").grid(row=0, column=0, sticky=tk.W, padx=5)
+        self.monitor_window_entry = ttk.Entry(input_frame, width=10)
+        self.monitor_window_entry.grid(row=0, column=1, padx=5, pady=2)
+        self.monitor_window_entry.insert(0, "168")
+        
+        result_frame = ttk.LabelFrame(frame, text="Результат", padding="10")
+        result_frame.pack(fill=tk.X, pady=10)
+        
+        self.monitor_result = ttk.Label(result_frame, text="", font=('Arial', 11), justify=tk.LEFT)
+        self.monitor_result.pack(anchor=tk.W)
+        
+        btn_frame = ttk.Frame(frame)
+        btn_frame.pack(pady=20)
+        
+        ttk.Button(btn_frame, text="Открыть журнал...", command=self.start_monitor, width=18).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Остановить", command=self.stop_monitor, width=15).pack(side=tk.LEFT, padx=5)
+    
+    def start_monitor(self):
+        window = self.monitor_window_entry.get().strip()
         try:
-            times = []
-            for entry in self.task1_entries:
-                value = float(entry.get())
-                if value <= 0:
-                    messagebox.showerror("Ошибка", "Значения должны быть положительными")
-                    return
-                times.append(value)
-            
-            total_time = sum(times)
-            n = len(times)
-            mtbf = total_time / n
-            
-            result_text = f"Суммарная наработка: {total_time:.2f} часов\n" \
-                         f"Количество отказов: {n}\n" \
-                         f"Средняя наработка на отказ (T₀) = {mtbf:.2f} часов"
-            
-            self.task1_result.config(text=result_text)
-            
+            window = float(window) if window else None
         except ValueError:
             messagebox.showerror("Ошибка", "Введите корректные числовые значения")
+            return
+        if window is not None and window <= 0:
+            messagebox.showerror("Ошибка", "Значения должны быть положительными")
+            return
+        
+        path = filedialog.askopenfilename(filetypes=[("Log files", "*.log *.csv *.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        
+        self.stop_monitor()
+        try:
+            self.tailer = reliability_core.LogTailer(path)
+        except OSError as e:
+            messagebox.showerror("Ошибка", f"Не удалось открыть журнал:\n{e}")
+            return
+        self.monitor = reliability_core.FailureMonitor(window)
+        self.monitor_dirty = True
+        self.poll_monitor()
     
-    def calculate_task2(self):
+    def stop_monitor(self):
+        if self.monitor_job:
+            self.root.after_cancel(self.monitor_job)
+            self.monitor_job = None
+        if self.tailer:
+            self.tailer.close()
+            self.tailer = None
+    
+    def poll_monitor(self, interval=200, redraw_interval=1.0):
         try:
-            total_time = 0
-            total_failures = 0
-            
-            for i in range(3):
-                t = float(self.task2_entries_t[i].get())
-                n = int(self.task2_entries_n[i].get())
-                
-                if t <= 0 or n <= 0:
-                    messagebox.showerror("Ошибка", "Значения должны быть положительными")
-                    return
-                
-                total_time += t
-                total_failures += n
-            
-            mtbf = total_time / total_failures
-            
-            result_text = f"Суммарная наработка всех систем: {total_time:.2f} часов\n" \
-                         f"Общее количество отказов: {total_failures}\n" \
-                         f"Средняя наработка на отказ (T₀) = {mtbf:.2f} часов"
-            
-            self.task2_result.config(text=result_text)
-            
+            for line in self.tailer.poll():
+                try:
+                    self.monitor.add(*reliability_core.parse_event(line))
+                except ValueError:
+                    self.monitor.invalid += 1
+                self.monitor_dirty = True
+        except OSError as e:
+            self.stop_monitor()
+            messagebox.showerror("Ошибка", f"Ошибка чтения журнала:\n{e}")
+            return
+        
+        now = time.monotonic()
+        if self.monitor_dirty and now - self.last_redraw >= redraw_interval:
+            self.redraw_monitor()
+            self.last_redraw = now
+            self.monitor_dirty = False
+        self.monitor_job = self.root.after(interval, self.poll_monitor)
+    
+    @staticmethod
+    def format_estimate(title, estimate):
+        if estimate['mtbf'] is None:
+            return f"{title}: недостаточно отказов"
+        text = f"{title}: T₀ = {estimate['mtbf']:.2f} ± {estimate['std']:.2f} ч, λ = {estimate['rate']:.5f} 1/ч"
+        if estimate['kg'] is not None:
+            text += f", Tв = {estimate['mean_repair']:.2f} ч, Кг = {estimate['kg']:.4f}"
+        return text
+    
+    def redraw_monitor(self):
+        snapshot = self.monitor.snapshot()
+        lines = [
+            f"Отказов: {snapshot['failures']}, пропущено событий: {snapshot['skipped']}, "
+            f"нераспознанных строк: {snapshot['invalid']}",
+            self.format_estimate("Всего", snapshot['total'])
+        ]
+        if 'window' in snapshot:
+            lines.append(self.format_estimate(f"Окно {self.monitor.window:g} ч", snapshot['window']))
+        self.monitor_result.config(text="\n".join(lines))
+    
+    def read_values(self, entries, convert=float):
+        try:
+            return [convert(entry.get()) for entry in entries]
         except ValueError:
             messagebox.showerror("Ошибка", "Введите корректные числовые значения")
+            return None
+    
+    def format_interval(self, result):
+        return f"Доверительный интервал: T₀ ∈ [{result['lower']:.2f}; {result['upper']:.2f}] ч (γ = {self.confidence.get()})"
+    
+    def calculate_task1(self):
+        times = self.read_values(self.task1_entries)
+        if times is None:
+            return
+        
+        try:
+            result = reliability_core.mtbf_from_times(times, float(self.confidence.get()))
+        except ValueError as e:
+            messagebox.showerror("Ошибка", str(e))
+            return
+        
+        result_text = f"Суммарная наработка: {result['total']:.2f} часов\n" \
+                     f"Количество отказов: {result['failures']}\n" \
+                     f"Средняя наработка на отказ (T₀) = {result['mtbf']:.2f} часов\n" \
+                     f"{self.format_interval(result)}"
+        
+        self.task1_result.config(text=result_text)
+    
+    def calculate_task2(self):
+        times = self.read_values(self.task2_entries_t)
+        failures = self.read_values(self.task2_entries_n, int)
+        if times is None or failures is None:
+            return
+        
+        try:
+            result = reliability_core.pooled_mtbf(times, failures, float(self.confidence.get()))
+        except ValueError as e:
+            messagebox.showerror("Ошибка", str(e))
+            return
+        
+        result_text = f"Суммарная наработка всех систем: {result['total']:.2f} часов\n" \
+                     f"Общее количество отказов: {result['failures']}\n" \
+                     f"Средняя наработка на отказ (T₀) = {result['mtbf']:.2f} часов\n" \
+                     f"{self.format_interval(result)}"
+        
+        self.task2_result.config(text=result_text)
     
     def calculate_task3(self):
+        t0 = self.read_values((self.task3_t0_1, self.task3_t0_2))
+        tv = self.read_values((self.task3_tv_1, self.task3_tv_2))
+        cycles = self.read_values((self.task3_cycles,), int)
+        if t0 is None or tv is None or cycles is None:
+            return
+        
         try:
-            t0_1 = float(self.task3_t0_1.get())
-            tv_1 = float(self.task3_tv_1.get())
-            t0_2 = float(self.task3_t0_2.get())
-            tv_2 = float(self.task3_tv_2.get())
-            
-            if t0_1 <= 0 or tv_1 <= 0 or t0_2 <= 0 or tv_2 <= 0:
-                messagebox.showerror("Ошибка", "Все значения должны быть положительными")
-                return
-            
-            kg1 = t0_1 / (t0_1 + tv_1)
-            kg2 = t0_2 / (t0_2 + tv_2)
-            
-            result1_text = f"Система 1: T₀ = {t0_1:.2f} ч, Tв = {tv_1:.2f} ч, Кг = {kg1:.4f}"
-            result2_text = f"Система 2: T₀ = {t0_2:.2f} ч, Tв = {tv_2:.2f} ч, Кг = {kg2:.4f}"
-            
-            self.task3_result1.config(text=result1_text)
-            self.task3_result2.config(text=result2_text)
-            
-            if kg1 > kg2:
-                compare_text = f"✓ Система 1 более надежна (Кг = {kg1:.4f} > {kg2:.4f})"
-            elif kg2 > kg1:
-                compare_text = f"✓ Система 2 более надежна (Кг = {kg2:.4f} > {kg1:.4f})"
-            else:
-                compare_text = f"Системы одинаково надежны (Кг = {kg1:.4f})"
-            
-            self.task3_result_compare.config(text=compare_text)
-            
-        except ValueError:
-            messagebox.showerror("Ошибка", "Введите корректные числовые значения")
+            result = reliability_core.compare_availability(t0, tv, cycles[0], float(self.confidence.get()))
+        except ValueError as e:
+            messagebox.showerror("Ошибка", str(e))
+            return
+        
+        kg, lower, upper = result['kg'], result['lower'], result['upper']
+        result1_text = f"Система 1: T₀ = {t0[0]:.2f} ч, Tв = {tv[0]:.2f} ч, Кг = {kg[0]:.4f} [{lower[0]:.4f}; {upper[0]:.4f}]"
+        result2_text = f"Система 2: T₀ = {t0[1]:.2f} ч, Tв = {tv[1]:.2f} ч, Кг = {kg[1]:.4f} [{lower[1]:.4f}; {upper[1]:.4f}]"
+        
+        self.task3_result1.config(text=result1_text)
+        self.task3_result2.config(text=result2_text)
+        
+        if result['tie']:
+            compare_text = f"Системы одинаково надежны (Кг = {kg[0]:.4f})"
+        else:
+            best, other = result['order'][0], result['order'][1]
+            compare_text = f"✓ Система {best + 1} более надежна (Кг = {kg[best]:.4f} > {kg[other]:.4f})"
+            if lower[best] <= upper[other]:
+                compare_text += f"\nИнтервалы перекрываются: различие незначимо при γ = {self.confidence.get()}"
+        
+        self.task3_result_compare.config(text=compare_text)
+    
+    def open_fleet(self):
+        FleetWindow(self.root)
     
     def fill_variant1(self):
         self.task3_t0_1.delete(0, tk.END)
@@ -0,0 +1,63 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+COLD_START = """
+import time
+start = time.perf_counter()
+import reliability_core
+curves = reliability_core.normal_curves([1000, 2000, 3000], 1333.33, 400, exact={exact})
+print(time.perf_counter() - start)
+"""
+
+NUMPY_START = """
+import time
+start = time.perf_counter()
+import numpy
+print(time.perf_counter() - start)
+"""
+
+def cold_start(code, runs):
+    here = os.path.dirname(os.path.abspath(__file__))
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], cwd=here,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(float(output))
+    return samples
+
+def check_table(points):
+    import numpy as np
+    from scipy import stats
+    import reliability_core
+    
+    u = np.linspace(-reliability_core.TABLE_LIMIT, reliability_core.TABLE_LIMIT, points)[1:-1]
+    log_p, log_q = reliability_core.normal_tails(u)
+    laplace_error = np.abs(np.exp(log_q) - stats.norm.cdf(u)).max()
+    tail_error = max(np.abs(np.expm1(log_p - stats.norm.logsf(u))).max(),
+                     np.abs(np.expm1(log_q - stats.norm.logcdf(u))).max())
+    print(f"Ф(u), |u| < {reliability_core.TABLE_LIMIT:g}: макс. абс. погрешность {laplace_error:.2e} "
+          f"(граница {reliability_core.LAPLACE_ERROR:.2e})")
+    print(f"P(t), Q(t): макс. отн. погрешность {tail_error:.2e} (граница {reliability_core.TAIL_ERROR:.2e})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Время холодного старта расчета показателей надежности")
+    parser.add_argument('--runs', type=int, default=10, help="количество запусков интерпретатора")
+    parser.add_argument('--points', type=int, default=1000001, help="точек для проверки таблицы")
+    args = parser.parse_args()
+    
+    print(f"{'Режим':<16}{'медиана, мс':>14}{'мин, мс':>10}{'макс, мс':>10}")
+    # импорт numpy - нижняя граница: он нужен в любом режиме
+    modes = (("только numpy", NUMPY_START), ("таблица Ф(u)", COLD_START.format(exact=False)),
+             ("SciPy", COLD_START.format(exact=True)))
+    for title, code in modes:
+        samples = cold_start(code, args.runs)
+        print(f"{title:<16}{statistics.median(samples) * 1000:>14.1f}"
+              f"{min(samples) * 1000:>10.1f}{max(samples) * 1000:>10.1f}")
+    print()
+    check_table(args.points)
+
+if __name__ == "__main__":
+    main()
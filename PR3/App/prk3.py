@@ -1,28 +1,222 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import math
-import numpy as np
-from scipy import stats
+import queue
+import threading
+import reliability_core
+from report_builder import ReportBuilder
+
+NORMAL_INPUT = """• Среднее квадратическое отклонение (σ): {sigma:.2f} часов
+• Коэффициент вариации (vx): {vx:.3f}
+• Средняя наработка на отказ (M): {mean:.2f} часов
+• Закон распределения: нормальный"""
+
+POINT_TAIL = """
+Вероятность безотказной работы P(t) = 1 - Q(t) = {p:.6f}
+или {p:.2%}
+
+Частота отказов f(t): {f:.8f} 1/час
+Интенсивность отказов λ(t): {lambda_t:.8f} 1/час"""
+
+NORMAL_POINT = """Квантиль Up: {u:.4f}
+Функция Лапласа Ф(Up): {q:.6f}
+
+Вероятность отказа Q(t) = Ф(Up) = {q:.6f}
+или {q:.2%}
+""" + POINT_TAIL
+
+LAW_POINT = """Вероятность отказа Q(t) = F(t) = {q:.6f}
+или {q:.2%}
+""" + POINT_TAIL
+
+NORMAL_NOTES = """• При нормальном законе распределения:
+  Q(t) = Ф((t - M)/σ) - вероятность отказа
+  P(t) = 1 - Q(t) - вероятность безотказной работы
+  f(t) = φ((t-M)/σ)/σ - частота отказов
+  λ(t) = f(t)/P(t) - интенсивность отказов"""
+
+LAW_NOTES = """• Закон распределения: {title}, F(t) - его функция распределения
+  Q(t) = F(t) - вероятность отказа
+  P(t) = 1 - Q(t) - вероятность безотказной работы
+  f(t) = F'(t) - частота отказов
+  λ(t) = f(t)/P(t) - интенсивность отказов"""
+
+class SweepWindow:
+    """Анализ P(t) на сетке σ × vx × t: тепловая карта среза и изолинии надежности"""
+    SLICES = (
+        ("σ × vx при фиксированном t", 't'),
+        ("t × σ при фиксированном vx", 'vx'),
+        ("t × vx при фиксированном σ", 'sigma')
+    )
+    LABELS = {'sigma': 'σ, ч', 'vx': 'vx', 't': 'Наработка t, ч'}
+    SYMBOLS = {'sigma': 'σ', 'vx': 'vx', 't': 't'}
+    LEVELS = (0.5, 0.9, 0.95, 0.99)
+    
+    def __init__(self, parent, exact=False):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib import cm, colors
+        
+        self.exact = exact
+        self.grid = None
+        self.window = tk.Toplevel(parent)
+        self.window.title("Параметрический анализ вероятности безотказной работы")
+        self.window.geometry("900x750")
+        
+        input_frame = ttk.LabelFrame(self.window, text="Диапазоны (от, до, точек)", padding=10)
+        input_frame.pack(fill="x", padx=10, pady=10)
+        
+        self.ranges = {}
+        defaults = {'sigma': ("200", "600", "81"), 'vx': ("0.1", "0.5", "81"), 't': ("0", "4000", "401")}
+        for row, key in enumerate(('sigma', 'vx', 't')):
+            ttk.Label(input_frame, text=self.LABELS[key] + ":").grid(row=row, column=0, sticky="w", pady=2)
+            self.ranges[key] = []
+            for column, value in enumerate(defaults[key], 1):
+                var = tk.StringVar(value=value)
+                ttk.Entry(input_frame, textvariable=var, width=10).grid(row=row, column=column, padx=5, pady=2)
+                self.ranges[key].append(var)
+        
+        ttk.Button(input_frame, text="Рассчитать сетку", command=self.calculate).grid(
+            row=0, column=4, rowspan=3, padx=20)
+        
+        slice_frame = ttk.Frame(self.window)
+        slice_frame.pack(fill="x", padx=10)
+        ttk.Label(slice_frame, text="Срез:").pack(side=tk.LEFT)
+        self.slice_var = tk.StringVar(value=self.SLICES[0][0])
+        slice_box = ttk.Combobox(slice_frame, textvariable=self.slice_var, values=[title for title, _ in self.SLICES],
+                                 state="readonly", width=30)
+        slice_box.pack(side=tk.LEFT, padx=5)
+        slice_box.bind("<<ComboboxSelected>>", lambda event: self.on_slice_change())
+        self.index_var = tk.IntVar(value=0)
+        self.scale = ttk.Scale(slice_frame, from_=0, to=0, orient=tk.HORIZONTAL, length=250,
+                               command=lambda value: self.on_index_change(value))
+        self.scale.pack(side=tk.LEFT, padx=10)
+        self.value_var = tk.StringVar()
+        ttk.Label(slice_frame, textvariable=self.value_var, width=20).pack(side=tk.LEFT)
+        
+        self.status_var = tk.StringVar(value="Задайте диапазоны и рассчитайте сетку")
+        ttk.Label(self.window, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W).pack(
+            side=tk.BOTTOM, fill=tk.X)
+        
+        self.fig = Figure(figsize=(8, 6))
+        self.ax = self.fig.add_subplot(111)
+        self.fig.colorbar(cm.ScalarMappable(norm=colors.Normalize(0, 1), cmap='viridis'), ax=self.ax, label='P(t)')
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.window)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        self.calculate()
+    
+    def read_range(self, key):
+        start, stop, count = (var.get() for var in self.ranges[key])
+        return float(start), float(stop), int(count)
+    
+    def fixed_axis(self):
+        return dict(self.SLICES)[self.slice_var.get()]
+    
+    def calculate(self):
+        """Сетка берется из кэша, если диапазоны не менялись"""
+        try:
+            ranges = [self.read_range(key) for key in ('sigma', 'vx', 't')]
+            hits = reliability_core.sweep_grid.cache_info().hits
+            self.grid = reliability_core.sweep_grid(*ranges, exact=self.exact)
+        except ValueError as e:
+            messagebox.showerror("Ошибка", f"Некорректные диапазоны: {str(e)}")
+            return
+        cached = reliability_core.sweep_grid.cache_info().hits > hits
+        self.status_var.set(f"Сетка {'×'.join(str(n) for n in self.grid['p'].shape)} точек"
+                            f"{' (из кэша)' if cached else ''}")
+        self.on_slice_change()
+    
+    def on_slice_change(self):
+        if self.grid is None:
+            return
+        size = len(self.grid[self.fixed_axis()])
+        self.scale.configure(to=size - 1)
+        index = min(self.index_var.get(), size - 1)
+        self.scale.set(index)
+        self.on_index_change(index)
+    
+    def on_index_change(self, value):
+        if self.grid is None:
+            return
+        self.index_var.set(int(round(float(value))))
+        self.draw_slice()
+    
+    def draw_slice(self):
+        """Перерисовка только среза - сама сетка не пересчитывается"""
+        fixed, index = self.fixed_axis(), self.index_var.get()
+        grid = self.grid
+        if fixed == 't':
+            x, y, z = grid['vx'], grid['sigma'], grid['p'][:, :, index]
+            x_key, y_key = 'vx', 'sigma'
+        elif fixed == 'vx':
+            x, y, z = grid['t'], grid['sigma'], grid['p'][:, index, :]
+            x_key, y_key = 't', 'sigma'
+        else:
+            x, y, z = grid['t'], grid['vx'], grid['p'][index, :, :]
+            x_key, y_key = 't', 'vx'
+        caption = f"{self.SYMBOLS[fixed]} = {grid[fixed][index]:.4g}"
+        self.value_var.set(caption)
+        
+        self.ax.clear()
+        self.ax.pcolormesh(x, y, z, cmap='viridis', vmin=0, vmax=1, shading='auto')
+        if len(x) > 1 and len(y) > 1:
+            contours = self.ax.contour(x, y, z, levels=self.LEVELS, colors='white', linewidths=1)
+            self.ax.clabel(contours, fmt='P=%.2f', fontsize=8)
+        self.ax.set_xlabel(self.LABELS[x_key])
+        self.ax.set_ylabel(self.LABELS[y_key])
+        self.ax.set_title(f"P(t) при {caption}")
+        self.canvas.draw_idle()
 
 class ReliabilityCalculator:
     def __init__(self, root):
         self.root = root
         self.root.title("Расчет показателей надежности (Вариант 5)")
-        self.root.geometry("700x800")
+        self.root.geometry("1300x820")
         self.root.resizable(False, False)
+        self.curves = None
+        self.points = None
+        self.fig = None
+        self.law = None
+        self.fit_results = queue.Queue()
+        
+        # Статус бар
+        self.status_var = tk.StringVar(value="Готов к расчетам")
+        status_bar = ttk.Label(root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
+        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # Левая панель - ввод и текстовые результаты, правая - подбор закона и графики
+        left_frame = ttk.Frame(root, width=700)
+        left_frame.pack(side=tk.LEFT, fill=tk.Y)
+        right_frame = ttk.Frame(root)
+        right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10)
+        
+        # Подбор закона распределения по выборке наработок
+        fit_frame = ttk.LabelFrame(right_frame, text="Подбор закона по выборке", padding=5)
+        fit_frame.pack(fill="x", pady=10)
+        ttk.Button(fit_frame, text="Загрузить выборку...", command=self.load_sample).grid(row=0, column=0, sticky="w")
+        self.use_fit_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(fit_frame, text="Использовать подобранный закон", variable=self.use_fit_var,
+                        command=self.calculate_reliability).grid(row=0, column=1, sticky="w", padx=10)
+        self.fit_var = tk.StringVar(value="Выборка не загружена")
+        ttk.Label(fit_frame, textvariable=self.fit_var, font=("Courier", 9), justify=tk.LEFT).grid(
+            row=1, column=0, columnspan=2, sticky="w", pady=5)
+        
+        plot_frame = ttk.LabelFrame(right_frame, text="Графики показателей", padding=5)
+        plot_frame.pack(fill=tk.BOTH, expand=True, pady=10)
         
         # Заголовок
-        title_label = ttk.Label(root, text="Расчет показателей надежности", 
+        title_label = ttk.Label(left_frame, text="Расчет показателей надежности", 
                                  font=("Arial", 16, "bold"))
         title_label.pack(pady=10)
         
         # Вариант 5
-        var_label = ttk.Label(root, text="Вариант 5: Среднее квадратическое отклонение ресурса = 400 часов, "
+        var_label = ttk.Label(left_frame, text="Вариант 5: Среднее квадратическое отклонение ресурса = 400 часов, "
                               "коэффициент вариации = 0,3", font=("Arial", 10))
         var_label.pack(pady=5)
         
         # Основная рамка для ввода данных
-        input_frame = ttk.LabelFrame(root, text="Исходные данные", padding=10)
+        input_frame = ttk.LabelFrame(left_frame, text="Исходные данные", padding=10)
         input_frame.pack(padx=20, pady=10, fill="x")
         
         # Среднее квадратическое отклонение
@@ -53,7 +247,7 @@ class ReliabilityCalculator:
         mean_label.grid(row=3, column=1, sticky="w", pady=5)
         
         # Рамка для ввода наработок
-        time_frame = ttk.LabelFrame(root, text="Ввод наработок для расчета", padding=10)
+        time_frame = ttk.LabelFrame(left_frame, text="Ввод наработок для расчета", padding=10)
         time_frame.pack(padx=20, pady=10, fill="x")
         
         ttk.Label(time_frame, text="Наработка t1 (часы):").grid(row=0, column=0, sticky="w", pady=5)
@@ -71,14 +265,33 @@ class ReliabilityCalculator:
         t3_entry = ttk.Entry(time_frame, textvariable=self.t3_var, width=15)
         t3_entry.grid(row=2, column=1, sticky="w", pady=5, padx=10)
         
+        # Диапазон сетки для графиков и экспорта
+        ttk.Label(time_frame, text="Сетка графика: от / до (часы), точек:").grid(row=3, column=0, sticky="w", pady=5)
+        grid_frame = ttk.Frame(time_frame)
+        grid_frame.grid(row=3, column=1, sticky="w", pady=5, padx=10)
+        self.grid_start_var = tk.StringVar(value="0")
+        self.grid_stop_var = tk.StringVar(value="4000")
+        self.grid_points_var = tk.StringVar(value="100000")
+        ttk.Entry(grid_frame, textvariable=self.grid_start_var, width=8).pack(side=tk.LEFT)
+        ttk.Entry(grid_frame, textvariable=self.grid_stop_var, width=8).pack(side=tk.LEFT, padx=5)
+        ttk.Entry(grid_frame, textvariable=self.grid_points_var, width=10).pack(side=tk.LEFT)
+        
+        # Быстрый режим - табличная функция Лапласа, точный - SciPy
+        self.exact_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(time_frame, text="Точный расчет Ф(u) через SciPy", variable=self.exact_var).grid(
+            row=4, column=0, columnspan=2, sticky="w", pady=5)
+        
+        ttk.Button(time_frame, text="Экспорт в CSV", command=self.export_csv).grid(row=5, column=0, pady=5)
+        ttk.Button(time_frame, text="Параметрический анализ...", command=self.open_sweep).grid(row=5, column=1, pady=5)
+        
         # Кнопка расчета
-        calc_all_button = ttk.Button(root, text="РАССЧИТАТЬ ПОКАЗАТЕЛИ НАДЕЖНОСТИ", 
+        calc_all_button = ttk.Button(left_frame, text="РАССЧИТАТЬ ПОКАЗАТЕЛИ НАДЕЖНОСТИ", 
                                       command=self.calculate_reliability, 
                                       style="Accent.TButton")
         calc_all_button.pack(pady=20)
         
         # Рамка для результатов
-        result_frame = ttk.LabelFrame(root, text="Результаты расчета", padding=10)
+        result_frame = ttk.LabelFrame(left_frame, text="Результаты расчета", padding=10)
         result_frame.pack(padx=20, pady=10, fill="both", expand=True)
         
         # Создаем текстовое поле для вывода результатов с прокруткой
@@ -87,12 +300,11 @@ class ReliabilityCalculator:
         self.result_text.configure(yscrollcommand=scrollbar.set)
         
         self.result_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.report = ReportBuilder(self.result_text, width=70)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # Статус бар
-        self.status_var = tk.StringVar(value="Готов к расчетам")
-        status_bar = ttk.Label(root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
-        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        # Графики создаются при первой отрисовке, чтобы matplotlib не задерживал запуск
+        self.plot_frame = plot_frame
         
         # Стиль для кнопки
         style = ttk.Style()
@@ -114,7 +326,7 @@ class ReliabilityCalculator:
             mean_value = sigma / vx
             self.mean_var.set(f"{mean_value:.2f}")
             self.status_var.set(f"Средняя наработка рассчитана: {mean_value:.2f} часов")
-            
+        
         except ValueError:
             messagebox.showerror("Ошибка", "Введите корректные числовые значения")
     
@@ -140,83 +352,172 @@ class ReliabilityCalculator:
             
             times = [t1, t2, t3]
             
-            # Очищаем текстовое поле
-            self.result_text.delete(1.0, tk.END)
+            # Закон: подобранный по выборке или нормальный по введенным σ и vx
+            if self.use_fit_var.get() and self.law is not None:
+                law = self.law
+            else:
+                law = {'name': 'normal', 'title': reliability_core.LAWS['normal'],
+                       'params': {'mean': mean_value, 'sigma': sigma}}
+            normal = law['name'] == 'normal'
             
-            # Заголовок результатов
-            self.result_text.insert(tk.END, "="*70 + "\n")
-            self.result_text.insert(tk.END, "РАСЧЕТ ПОКАЗАТЕЛЕЙ НАДЕЖНОСТИ (ВАРИАНТ 5)\n")
-            self.result_text.insert(tk.END, "="*70 + "\n\n")
+            # Все показатели для t1-t3 и для сетки графика - одним векторным проходом
+            exact = self.exact_var.get()
+            points = reliability_core.law_curves(times, law, exact)
+            grid = reliability_core.time_grid(float(self.grid_start_var.get()), float(self.grid_stop_var.get()),
+                                              int(self.grid_points_var.get()))
+            self.curves = reliability_core.law_curves(grid, law, exact)
+            self.points = points
             
-            # Исходные данные
-            self.result_text.insert(tk.END, "ИСХОДНЫЕ ДАННЫЕ:\n")
-            self.result_text.insert(tk.END, f"• Среднее квадратическое отклонение (σ): {sigma:.2f} часов\n")
-            self.result_text.insert(tk.END, f"• Коэффициент вариации (vx): {vx:.3f}\n")
-            self.result_text.insert(tk.END, f"• Средняя наработка на отказ (M): {mean_value:.2f} часов\n")
-            self.result_text.insert(tk.END, f"• Закон распределения: нормальный\n\n")
+            # Отчет собирается вне виджета и выводится одним вызовом
+            report = self.report.begin()
+            report.rule().add("РАСЧЕТ ПОКАЗАТЕЛЕЙ НАДЕЖНОСТИ (ВАРИАНТ 5)").rule().add()
+            report.add("ИСХОДНЫЕ ДАННЫЕ:")
+            if law is self.law:
+                report.add("• Закон распределения: {title} (подобран по выборке из {size} наработок, AIC = {aic:.2f})",
+                           **law)
+                for line in self.describe_law(law):
+                    report.add(f"• {line}")
+            else:
+                report.add(NORMAL_INPUT, sigma=sigma, vx=vx, mean=mean_value)
+            report.add().section("РЕЗУЛЬТАТЫ РАСЧЕТА:")
             
-            # Расчет для каждого значения наработки
-            self.result_text.insert(tk.END, "РЕЗУЛЬТАТЫ РАСЧЕТА:\n")
-            self.result_text.insert(tk.END, "-"*70 + "\n")
-            
-            for i, t in enumerate(times, 1):
-                self.result_text.insert(tk.END, f"\nДЛЯ НАРАБОТКИ t{i} = {t:.0f} часов:\n")
-                self.result_text.insert(tk.END, "-"*50 + "\n")
-                
-                # Квантиль нормированного нормального распределения
-                u = (t - mean_value) / sigma
-                
-                # Функция Лапласа (нормированная функция распределения)
-                # Используем функцию распределения нормального закона
-                phi = stats.norm.cdf(u)
-                
-                # Вероятность отказа Q(t)
-                q = phi
-                
-                # Вероятность безотказной работы P(t)
-                p = 1 - q
-                
-                # Частота отказов f(t) - плотность вероятности
-                f = stats.norm.pdf(u) / sigma  # делим на sigma для корректной плотности
-                
-                # Интенсивность отказов λ(t)
-                lambda_t = f / p if p > 0 else float('inf')
-                
-                # Вывод результатов
-                self.result_text.insert(tk.END, f"Квантиль Up: {u:.4f}\n")
-                self.result_text.insert(tk.END, f"Функция Лапласа Ф(Up): {phi:.6f}\n\n")
-                
-                self.result_text.insert(tk.END, f"Вероятность отказа Q(t) = Ф(Up) = {q:.6f}\n")
-                self.result_text.insert(tk.END, f"или {q*100:.2f}%\n\n")
-                
-                self.result_text.insert(tk.END, f"Вероятность безотказной работы P(t) = 1 - Q(t) = {p:.6f}\n")
-                self.result_text.insert(tk.END, f"или {p*100:.2f}%\n\n")
-                
-                self.result_text.insert(tk.END, f"Частота отказов f(t): {f:.8f} 1/час\n")
-                
-                if lambda_t != float('inf'):
-                    self.result_text.insert(tk.END, f"Интенсивность отказов λ(t): {lambda_t:.8f} 1/час\n")
-                else:
-                    self.result_text.insert(tk.END, f"Интенсивность отказов λ(t): бесконечность\n")
-                
-                self.result_text.insert(tk.END, "-"*50 + "\n")
+            for i, (t, u, q, p, f, lambda_t) in enumerate(zip(*(points[key] for key in reliability_core.CURVE_COLUMNS)), 1):
+                report.add().section(f"ДЛЯ НАРАБОТКИ t{i} = {t:.0f} часов:", width=50)
+                report.add(NORMAL_POINT if normal else LAW_POINT, u=u, q=q, p=p, f=f, lambda_t=lambda_t)
+                report.rule("-", 50)
             
             # Дополнительная информация
-            self.result_text.insert(tk.END, "\n" + "="*70 + "\n")
-            self.result_text.insert(tk.END, "ПОЯСНЕНИЯ:\n")
-            self.result_text.insert(tk.END, "• При нормальном законе распределения:\n")
-            self.result_text.insert(tk.END, "  Q(t) = Ф((t - M)/σ) - вероятность отказа\n")
-            self.result_text.insert(tk.END, "  P(t) = 1 - Q(t) - вероятность безотказной работы\n")
-            self.result_text.insert(tk.END, "  f(t) = φ((t-M)/σ)/σ - частота отказов\n")
-            self.result_text.insert(tk.END, "  λ(t) = f(t)/P(t) - интенсивность отказов\n")
-            self.result_text.insert(tk.END, "="*70 + "\n")
+            report.add().rule().add("ПОЯСНЕНИЯ:")
+            report.add(NORMAL_NOTES if normal else LAW_NOTES, title=law['title'])
+            report.rule()
+            report.render()
             
-            self.status_var.set(f"Расчет выполнен успешно для t = {t1}, {t2}, {t3} часов")
+            if self.fig is None:
+                # первый график строится уже после показа окна с результатами
+                self.root.after(100, self.update_plots)
+            else:
+                self.update_plots()
             
+            self.status_var.set(f"Расчет выполнен успешно для t = {t1}, {t2}, {t3} часов")
+        
         except ValueError:
             messagebox.showerror("Ошибка", "Введите корректные числовые значения")
         except Exception as e:
             messagebox.showerror("Ошибка", f"Произошла ошибка: {str(e)}")
+    
+    @staticmethod
+    def describe_law(law):
+        """Параметры закона в читаемом виде"""
+        params = law['params']
+        if law['name'] == 'normal':
+            return [f"M = {params['mean']:.2f} ч, σ = {params['sigma']:.2f} ч"]
+        if law['name'] == 'exponential':
+            return [f"λ = {params['rate']:.6g} 1/ч (T₀ = {1 / params['rate']:.2f} ч)"]
+        if law['name'] == 'weibull':
+            return [f"k = {params['shape']:.4f}, c = {params['scale']:.2f} ч"]
+        return [f"μ = {params['mu']:.4f}, s = {params['s']:.4f} (по ln t)"]
+    
+    def load_sample(self):
+        """Загрузка выборки наработок и подбор закона в фоновом потоке"""
+        path = filedialog.askopenfilename(filetypes=[("Data files", "*.csv *.txt *.dat"), ("All files", "*.*")])
+        if not path:
+            return
+        self.fit_var.set("Загрузка выборки...")
+        threading.Thread(target=self.fit_sample, args=(path,), daemon=True).start()
+        self.root.after(50, self.poll_fit)
+    
+    def fit_sample(self, path):
+        """Сначала оценки по подвыборке (быстро), затем уточнение по всей выборке"""
+        try:
+            samples = reliability_core.load_samples(path)
+            preview = reliability_core.fit_laws(reliability_core.subsample(samples))
+            if preview['normal']['size'] < len(samples):
+                self.fit_results.put(('preview', preview, len(samples)))
+            self.fit_results.put(('final', reliability_core.fit_laws(samples, preview), len(samples)))
+        except (OSError, ValueError) as e:
+            self.fit_results.put(('error', str(e), 0))
+    
+    def poll_fit(self):
+        try:
+            kind, result, total = self.fit_results.get_nowait()
+        except queue.Empty:
+            self.root.after(50, self.poll_fit)
+            return
+        
+        if kind == 'error':
+            self.fit_var.set("Выборка не загружена")
+            messagebox.showerror("Ошибка", f"Не удалось подобрать закон: {result}")
+            return
+        
+        self.law = reliability_core.best_law(result)
+        header = "Предварительно" if kind == 'preview' else "Итог"
+        lines = [f"{header}: по {self.law['size']} из {total} наработок"]
+        for law in sorted(result.values(), key=lambda law: law['aic']):
+            mark = "✓" if law is self.law else " "
+            lines.append(f"{mark} {law['title']:<26} AIC = {law['aic']:.2f}  {self.describe_law(law)[0]}")
+        self.fit_var.set("\n".join(lines))
+        self.use_fit_var.set(True)
+        self.calculate_reliability()
+        if kind == 'preview':
+            self.root.after(50, self.poll_fit)
+    
+    def open_sweep(self):
+        SweepWindow(self.root, self.exact_var.get())
+    
+    def setup_plots(self):
+        """Графики P(t), Q(t) и f(t), λ(t)"""
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
+        self.fig = Figure(figsize=(6, 5.5))
+        self.ax1, self.ax2 = self.fig.subplots(2, 1)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    
+    def update_plots(self):
+        """Отрисовка кривых по прореженной сетке с отметками t1-t3"""
+        if self.fig is None:
+            self.setup_plots()
+        curves = reliability_core.thin(self.curves)
+        points = self.points
+        
+        self.ax1.clear()
+        self.ax1.plot(curves['t'], curves['p'], 'b-', label='P(t)')
+        self.ax1.plot(curves['t'], curves['q'], 'r-', label='Q(t)')
+        self.ax1.plot(points['t'], points['p'], 'bo')
+        self.ax1.set_xlabel('Наработка t, ч')
+        self.ax1.set_ylabel('Вероятность')
+        self.ax1.grid(True, alpha=0.3)
+        self.ax1.legend()
+        
+        self.ax2.clear()
+        self.ax2.plot(curves['t'], curves['f'], 'g-', label='f(t)')
+        self.ax2.plot(curves['t'], curves['lambda'], 'm-', label='λ(t)')
+        self.ax2.plot(points['t'], points['lambda'], 'mo')
+        self.ax2.set_yscale('log')
+        self.ax2.set_xlabel('Наработка t, ч')
+        self.ax2.set_ylabel('1/ч')
+        self.ax2.grid(True, alpha=0.3)
+        self.ax2.legend()
+        
+        self.fig.tight_layout()
+        self.canvas.draw()
+    
+    def export_csv(self):
+        """Экспорт полной сетки Q(t), P(t), f(t), λ(t) в CSV"""
+        if self.curves is None:
+            messagebox.showerror("Ошибка", "Сначала выполните расчет")
+            return
+        
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
+        if not path:
+            return
+        
+        try:
+            reliability_core.write_curves_csv(path, self.curves)
+            self.status_var.set(f"Экспортировано точек: {len(self.curves['t'])} в {path}")
+        except OSError as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить файл: {str(e)}")
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,263 @@
+import math
+from functools import lru_cache
+# numpy загружается сразу: без него не считается ни одна кривая, а первый график строится
+# сразу после запуска окна, так что отложенный импорт лишь сдвинул бы его на первый расчет
+import numpy as np
+
+CURVE_COLUMNS = ('t', 'u', 'q', 'p', 'f', 'lambda')
+
+# Таблица функции Лапласа хранится в виде отношения Миллса R(u) = (1 - Ф(u)) / φ(u)
+# на [0; 8] и интерполируется кубическим многочленом Эрмита с точными R'(u) = u·R(u) - 1.
+# R⁗(u) = ∫ x⁴·exp(-ux - x²/2) dx убывает по u, поэтому |R⁗| ≤ R⁗(0) = 3·√(π/2) и
+# погрешность интерполяции не превышает 3·√(π/2)·h⁴/384. Хвостовые вероятности
+# получаются как R(|u|)·φ(u), т.е. с той же относительной точностью, что и R.
+TABLE_LIMIT = 8.0
+TABLE_STEP = 1 / 128
+TABLE_ERROR = 3 * math.sqrt(math.pi / 2) * TABLE_STEP ** 4 / 384
+TAIL_ERROR = TABLE_ERROR / (math.erfc(TABLE_LIMIT / math.sqrt(2)) / 2 * math.sqrt(2 * math.pi) * math.exp(TABLE_LIMIT ** 2 / 2))
+LAPLACE_ERROR = TABLE_ERROR / math.sqrt(2 * math.pi)
+
+def mills_ratio(u):
+    return math.erfc(u / math.sqrt(2)) / 2 * math.sqrt(2 * math.pi) * math.exp(u * u / 2)
+
+MILLS_TABLE = np.array([mills_ratio(i * TABLE_STEP) for i in range(int(TABLE_LIMIT / TABLE_STEP) + 1)])
+
+def norm():
+    """SciPy подключается только при первом обращении к точному расчету"""
+    from scipy import stats
+    return stats.norm
+
+def table_mills(x):
+    """R(x) для 0 <= x < 8 по таблице (погрешность не более TABLE_ERROR)"""
+    position = x / TABLE_STEP
+    index = np.minimum(position.astype(np.int64), len(MILLS_TABLE) - 2)
+    s = position - index
+    r0, r1 = MILLS_TABLE[index], MILLS_TABLE[index + 1]
+    d0 = index * TABLE_STEP * r0 - 1
+    d1 = (index + 1) * TABLE_STEP * r1 - 1
+    return ((1 + 2 * s) * (1 - s) ** 2 * r0 + s * (1 - s) ** 2 * TABLE_STEP * d0
+            + s * s * (3 - 2 * s) * r1 + s * s * (s - 1) * TABLE_STEP * d1)
+
+def normal_tails(u, exact=False):
+    """log P и log Q стандартного нормального закона: таблица при |u| < 8, SciPy в хвостах"""
+    u = np.asarray(u, dtype=float)
+    x = np.abs(u)
+    if exact:
+        return norm().logsf(u), norm().logcdf(u)
+    inside = x < TABLE_LIMIT
+    log_p, log_q = np.empty_like(u), np.empty_like(u)
+    if not inside.all():
+        outside = u[~inside]
+        log_p[~inside], log_q[~inside] = norm().logsf(outside), norm().logcdf(outside)
+    
+    # логарифм хвоста: log R(|u|) + log φ(u)
+    ux = u[inside]
+    log_tail = np.log(table_mills(x[inside])) - ux * ux / 2 - 0.5 * math.log(2 * math.pi)
+    log_body = np.log1p(-np.exp(log_tail))
+    right = ux >= 0
+    log_p[inside] = np.where(right, log_tail, log_body)
+    log_q[inside] = np.where(right, log_body, log_tail)
+    return log_p, log_q
+
+def time_grid(start, stop, points):
+    """Равномерная сетка наработок [start; stop]"""
+    if points < 2 or stop <= start:
+        raise ValueError("Некорректный диапазон наработок")
+    return np.linspace(start, stop, int(points))
+
+def normal_curves(times, mean, sigma, exact=False):
+    """Q(t), P(t), f(t) и λ(t) нормального закона на всей сетке за один проход.
+    
+    Хвосты считаются в логарифмах: P(t) = exp(log P), λ(t) = exp(log f - log P),
+    поэтому λ(t) остается конечной там, где P(t) уже не представима в float.
+    По умолчанию Ф(u) берется из таблицы, exact=True - только SciPy.
+    """
+    if sigma <= 0 or mean <= 0:
+        raise ValueError("Значения должны быть положительными")
+    t = np.asarray(times, dtype=float)
+    u = (t - mean) / sigma
+    log_p, log_q = normal_tails(u, exact)
+    log_f = -u * u / 2 - 0.5 * math.log(2 * math.pi) - math.log(sigma)
+    return {
+        't': t,
+        'u': u,
+        'q': np.exp(log_q),
+        'p': np.exp(log_p),
+        'f': np.exp(log_f),
+        'lambda': np.exp(log_f - log_p)
+    }
+
+LAWS = {
+    'normal': "нормальный",
+    'exponential': "экспоненциальный",
+    'weibull': "Вейбулла",
+    'lognormal': "логарифмически нормальный"
+}
+LOG_SQRT_2PI = 0.5 * math.log(2 * math.pi)
+
+def load_samples(path):
+    """Наработки до отказа из файла: первый числовой столбец, заголовок допускается"""
+    with open(path, encoding='utf-8') as f:
+        first = f.readline()
+    delimiter = next((d for d in (';', ',', '\t') if d in first), None)
+    try:
+        float(first.split(delimiter)[0])
+        header = 0
+    except ValueError:
+        header = 1
+    samples = np.loadtxt(path, delimiter=delimiter, usecols=0, skiprows=header, ndmin=1, encoding='utf-8')
+    if samples.size < 2:
+        raise ValueError("В выборке должно быть не менее двух наработок")
+    if not np.isfinite(samples).all():
+        raise ValueError("Введите корректные числовые значения")
+    return samples
+
+def subsample(samples, size=100000, seed=0):
+    if len(samples) <= size:
+        return samples
+    return np.random.default_rng(seed).choice(samples, size, replace=False)
+
+def fit_normal(x):
+    mean, sigma = x.mean(), x.std()
+    loglik = -len(x) * (LOG_SQRT_2PI + math.log(sigma) + 0.5)
+    return {'mean': mean, 'sigma': sigma}, loglik
+
+def fit_exponential(x):
+    rate = 1 / x.mean()
+    loglik = len(x) * (math.log(rate) - 1)
+    return {'rate': rate}, loglik
+
+def fit_lognormal(x, log_x):
+    mu, s = log_x.mean(), log_x.std()
+    loglik = -len(x) * (LOG_SQRT_2PI + math.log(s) + 0.5) - log_x.sum()
+    return {'mu': mu, 's': s}, loglik
+
+def fit_weibull(x, log_x, shape=None, tolerance=1e-10, max_iter=100):
+    """Форма k - метод Ньютона по уравнению правдоподобия, масштаб - в замкнутом виде"""
+    # нормировка на среднее исключает переполнение y^k при больших k
+    log_y = log_x - math.log(x.mean())
+    mean_log = log_y.mean()
+    k = shape or 1.2 / max(log_y.std(), 1e-12)
+    for _ in range(max_iter):
+        w = np.exp(k * log_y)
+        sw = w.sum()
+        a = (w * log_y).sum() / sw
+        b = (w * log_y * log_y).sum() / sw
+        step = (a - 1 / k - mean_log) / (b - a * a + 1 / (k * k))
+        k = k - step if step < k else k / 2
+        if abs(step) <= tolerance * k:
+            break
+    w_mean = np.exp(k * log_y).mean()
+    scale = x.mean() * w_mean ** (1 / k)
+    # в точке максимума Σ(x/c)^k = n
+    loglik = len(x) * (math.log(k) - k * math.log(scale) - 1) + (k - 1) * log_x.sum()
+    return {'shape': k, 'scale': scale}, loglik
+
+def fit_laws(samples, start=None):
+    """MLE всех законов и ранжирование по AIC; start - оценки по подвыборке для уточнения"""
+    x = np.asarray(samples, dtype=float)
+    if x.size < 2:
+        raise ValueError("В выборке должно быть не менее двух наработок")
+    if np.any(x <= 0):
+        raise ValueError("Наработки должны быть положительными")
+    log_x = np.log(x)
+    shape = start['weibull']['params']['shape'] if start else None
+    fits = {
+        'normal': fit_normal(x),
+        'exponential': fit_exponential(x),
+        'weibull': fit_weibull(x, log_x, shape),
+        'lognormal': fit_lognormal(x, log_x)
+    }
+    laws = {}
+    for name, (params, loglik) in fits.items():
+        laws[name] = {
+            'name': name,
+            'title': LAWS[name],
+            'params': params,
+            'loglik': loglik,
+            'aic': 2 * len(params) - 2 * loglik,
+            'size': x.size
+        }
+    return laws
+
+def best_law(laws):
+    return min(laws.values(), key=lambda law: law['aic'])
+
+def law_curves(times, law, exact=False):
+    """Q(t), P(t), f(t) и λ(t) для подобранного закона (в логарифмах, как normal_curves)"""
+    params = law['params']
+    if law['name'] == 'normal':
+        return normal_curves(times, params['mean'], params['sigma'], exact)
+    
+    t = np.asarray(times, dtype=float)
+    positive = t > 0
+    tp = np.where(positive, t, 1.0)
+    u = np.full_like(t, np.nan)
+    with np.errstate(divide='ignore'):
+        if law['name'] == 'exponential':
+            rate = params['rate']
+            log_p = -rate * tp
+            log_q = np.log(-np.expm1(log_p))
+            log_h = np.full_like(t, math.log(rate))
+        elif law['name'] == 'weibull':
+            k, scale = params['shape'], params['scale']
+            z = (tp / scale) ** k
+            log_p = -z
+            log_q = np.log(-np.expm1(log_p))
+            log_h = math.log(k / scale) + (k - 1) * np.log(tp / scale)
+        else:
+            u = (np.log(tp) - params['mu']) / params['s']
+            log_p, log_q = normal_tails(u, exact)
+            log_h = -u * u / 2 - LOG_SQRT_2PI - np.log(params['s'] * tp) - log_p
+    
+    # до начала работы отказов нет: P = 1, f = λ = 0
+    log_p = np.where(positive, log_p, 0.0)
+    log_q = np.where(positive, log_q, -np.inf)
+    return {
+        't': t,
+        'u': np.where(positive, u, np.nan),
+        'q': np.exp(log_q),
+        'p': np.exp(log_p),
+        'f': np.where(positive, np.exp(log_h + log_p), 0.0),
+        'lambda': np.where(positive, np.exp(log_h), 0.0)
+    }
+
+def axis(start, stop, count):
+    if count < 1 or (count > 1 and stop <= start):
+        raise ValueError("Некорректный диапазон параметров")
+    return np.linspace(start, stop, int(count))
+
+@lru_cache(maxsize=8)
+def sweep_grid(sigma_range, vx_range, time_range, exact=False, chunk_elements=2000000):
+    """P(t) нормального закона на сетке σ × vx × t.
+    
+    Диапазоны передаются кортежами (от, до, число точек), по ним же кэшируется результат,
+    так что смена отображаемого среза не пересчитывает сетку. u = t/σ - 1/vx считается
+    через broadcasting блоками по σ не более chunk_elements элементов.
+    """
+    sigmas, vxs, times = axis(*sigma_range), axis(*vx_range), axis(*time_range)
+    if sigmas[0] <= 0 or vxs[0] <= 0:
+        raise ValueError("Значения должны быть положительными")
+    p = np.empty((len(sigmas), len(vxs), len(times)))
+    rows = max(1, chunk_elements // (len(vxs) * len(times)))
+    for start in range(0, len(sigmas), rows):
+        sigma = sigmas[start:start + rows, None, None]
+        u = times[None, None, :] / sigma - 1 / vxs[None, :, None]
+        log_p, _ = normal_tails(u, exact)
+        p[start:start + rows] = np.exp(log_p)
+    p.flags.writeable = False
+    return {'sigma': sigmas, 'vx': vxs, 't': times, 'p': p}
+
+def thin(curves, points=2000):
+    """Прореживание сетки для отрисовки (в CSV уходит полная сетка)"""
+    step = max(1, len(curves['t']) // points)
+    return {key: values[::step] for key, values in curves.items()}
+
+def write_curves_csv(path, curves, chunk_size=100000):
+    """Экспорт кривых в CSV блоками, чтобы не форматировать 10⁶ строк разом"""
+    columns = [curves[key] for key in CURVE_COLUMNS]
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(','.join(CURVE_COLUMNS) + '\n')
+        for start in range(0, len(columns[0]), chunk_size):
+            block = np.column_stack([column[start:start + chunk_size] for column in columns])
+            np.savetxt(f, block, fmt=('%.6f', '%.6f', '%.10g', '%.10g', '%.10g', '%.10g'), delimiter=',')
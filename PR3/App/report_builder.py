@@ -0,0 +1,64 @@
+import difflib
+import tkinter as tk
+
+class ReportBuilder:
+    """Отчет для текстового поля: собирается вне виджета и выводится одним вызовом.
+    
+    Показанный текст запоминается, и render() заменяет в виджете только изменившиеся
+    строки, поэтому повторный расчет с близкими данными почти ничего не перерисовывает.
+    
+    Каждое приложение запускается из своей папки, поэтому модуль лежит в PR3, PR4 и PR7
+    одинаковыми копиями: правка вносится во все три файла.
+    """
+    
+    def __init__(self, widget, width=60):
+        self.widget = widget
+        self.width = width
+        self.lines = []
+        self.shown = []
+    
+    def begin(self):
+        """Начало нового отчета: строки прерванной сборки не попадут в него"""
+        self.lines = []
+        return self
+    
+    def add(self, template="", **values):
+        """Строки по шаблону str.format, многострочный шаблон дает несколько строк"""
+        text = template.format(**values) if values else template
+        self.lines.extend(text.split("\n"))
+        return self
+    
+    def rule(self, char="=", width=None):
+        self.lines.append(char * (width or self.width))
+        return self
+    
+    def section(self, title, char="-", width=None):
+        self.lines.append(title)
+        return self.rule(char, width)
+    
+    def text(self, lines):
+        return "".join(line + "\n" for line in lines)
+    
+    def render(self):
+        """Вывод собранного отчета: целиком в первый раз, далее - разницей с предыдущим"""
+        lines, self.lines = self.lines, []
+        # если текст правили вручную, сравнивать не с чем - выводим заново
+        if not self.shown or self.widget.get("1.0", "end-1c") != self.text(self.shown):
+            self.widget.delete("1.0", tk.END)
+            self.widget.insert(tk.END, self.text(lines))
+        else:
+            matcher = difflib.SequenceMatcher(None, self.shown, lines, autojunk=False)
+            # с конца, чтобы номера строк еще не измененной части оставались верными
+            for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+                if tag == 'equal':
+                    continue
+                if i2 > i1:
+                    self.widget.delete(f"{i1 + 1}.0", f"{i2 + 1}.0")
+                if j2 > j1:
+                    self.widget.insert(f"{i1 + 1}.0", self.text(lines[j1:j2]))
+        self.shown = lines
+    
+    def clear(self):
+        self.lines = []
+        self.shown = []
+        self.widget.delete("1.0", tk.END)
@@ -4,12 +4,64 @@ import math
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
+import reliability_core
+from report_builder import ReportBuilder
+
+KTI_REPORT = """============================================================
+РАСЧЕТ КОЭФФИЦИЕНТА ТЕХНИЧЕСКОГО ИСПОЛЬЗОВАНИЯ
+============================================================
+
+ИСХОДНЫЕ ДАННЫЕ:
+----------------------------------------
+Средняя наработка на отказ T = {T:.2f} ч
+Среднее время восстановления Tв = {Tb:.2f} ч
+Средняя продолжительность ТО Tто = {Tto:.2f} ч
+Период между ТО rто = {rto:.2f} ч
+
+ПРОМЕЖУТОЧНЫЕ РАСЧЕТЫ:
+----------------------------------------
+Интенсивность отказов λ = 1/T = {lambda_rate:.6f} 1/ч
+Интенсивность восстановления μ = 1/Tв = {mu_rate:.6f} 1/ч
+Коэффициент готовности Kг = T/(T+Tв) = {Kg:.6f}
+Коэффициент простоя Kп = Tв/(T+Tв) = {Kp:.6f}
+Среднее число отказов за период ТО = T/rто = {n_failures:.4f}
+
+РЕЗУЛЬТАТЫ РАСЧЕТА (модель методики, без скрытых отказов):
+----------------------------------------
+ПОЛНАЯ ФОРМУЛА (с учетом периодичности ТО):
+Kти = T / (T + Tв + (T × Tто)/rто) = 
+     = {T:.2f} / ({T:.2f} + {Tb:.2f} + ({T:.2f} × {Tto:.2f})/{rto:.2f})
+     = {Kti_full:.8f}
+     = {Kti_full:.4%}
+
+УПРОЩЕННАЯ ФОРМУЛА (без учета периодичности):
+Kти(упр) = T / (T + Tв + Tто) = 
+         = {T:.2f} / ({T:.2f} + {Tb:.2f} + {Tto:.2f})
+         = {Kti_simple:.8f}
+         = {Kti_simple:.4%}
+
+Разница между формулами: {difference:.4%}
+
+ОПТИМАЛЬНЫЙ ПЕРИОД МЕЖДУ ТО (максимум Kти модели со скрытыми отказами):
+rто(опт) = √(2 × Tто × T) = √(2 × {Tto:.2f} × {T:.2f}) = {rto_opt:.2f} ч
+Текущий период rто = {rto:.2f} ч
+{advice}"""
+
+OPT_REPORT = """
+ОПТИМИЗАЦИЯ ТО (модель со скрытыми отказами):
+----------------------------------------
+Kти = 1 / (1 + Tв/T + Tто/rто + rто/(2T))
+Отказ между ТО обнаруживается в среднем через rто/2, поэтому здесь Kти ниже, чем по полной формуле выше.
+Затраты на ТО = C × Tто(ном) / (Tто × rто)
+Текущий режим: Kти = {current_kti:.4%}, затраты = {current_cost:.3f} усл. ед./ч
+{period}
+{joint}"""
 
 class TechUtilizationCalculator:
     def __init__(self, root):
         self.root = root
         self.root.title("Расчет коэффициента технического использования (Вариант 5)")
-        self.root.geometry("900x750")
+        self.root.geometry("1000x900")
         self.root.resizable(False, False)
         
         # Заголовок
@@ -55,10 +107,35 @@ class TechUtilizationCalculator:
         rto_entry = ttk.Entry(input_frame, textvariable=self.rto_var, width=15, font=("Arial", 10))
         rto_entry.grid(row=3, column=1, sticky="w", pady=8, padx=10)
         
+        # Ограничения оптимизации ТО
+        ttk.Label(input_frame, text="Стоимость одного ТО C (усл. ед.):").grid(
+            row=0, column=2, sticky="w", pady=8, padx=(20, 0))
+        self.cost_var = tk.StringVar(value="100")
+        ttk.Entry(input_frame, textvariable=self.cost_var, width=10, font=("Arial", 10)).grid(
+            row=0, column=3, sticky="w", pady=8, padx=10)
+        
+        ttk.Label(input_frame, text="Бюджет на ТО (усл. ед./ч):").grid(
+            row=1, column=2, sticky="w", pady=8, padx=(20, 0))
+        self.budget_var = tk.StringVar(value="2")
+        ttk.Entry(input_frame, textvariable=self.budget_var, width=10, font=("Arial", 10)).grid(
+            row=1, column=3, sticky="w", pady=8, padx=10)
+        
+        ttk.Label(input_frame, text="Допустимый простой (%):").grid(
+            row=2, column=2, sticky="w", pady=8, padx=(20, 0))
+        self.downtime_var = tk.StringVar(value="10")
+        ttk.Entry(input_frame, textvariable=self.downtime_var, width=10, font=("Arial", 10)).grid(
+            row=2, column=3, sticky="w", pady=8, padx=10)
+        
+        ttk.Label(input_frame, text="Минимальная Tто (часы):").grid(
+            row=3, column=2, sticky="w", pady=8, padx=(20, 0))
+        self.tto_min_var = tk.StringVar(value="0.5")
+        ttk.Entry(input_frame, textvariable=self.tto_min_var, width=10, font=("Arial", 10)).grid(
+            row=3, column=3, sticky="w", pady=8, padx=10)
+        
         # Кнопка расчета
         calc_button = ttk.Button(input_frame, text="РАССЧИТАТЬ КОЭФФИЦИЕНТ ТЕХНИЧЕСКОГО ИСПОЛЬЗОВАНИЯ", 
                                   command=self.calculate_kti, style="Accent.TButton")
-        calc_button.grid(row=4, column=0, columnspan=2, pady=15)
+        calc_button.grid(row=4, column=0, columnspan=4, pady=15)
         
         # Рамка для результатов
         result_frame = ttk.LabelFrame(root, text="Результаты расчета", padding=15)
@@ -74,6 +151,7 @@ class TechUtilizationCalculator:
         self.result_text.configure(yscrollcommand=scrollbar.set)
         
         self.result_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.report = ReportBuilder(self.result_text)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Рамка для графика
@@ -81,11 +159,21 @@ class TechUtilizationCalculator:
         plot_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(10, 0))
         
         # Создаем фигуру для графика
-        self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(5, 6))
-        self.fig.tight_layout(pad=3.0)
+        self.fig, (self.ax1, self.ax2, self.ax3) = plt.subplots(3, 1, figsize=(5, 7))
+        
+        # Ползунок rто: при перетаскивании перерисовываются только маркеры
+        slider_frame = ttk.Frame(plot_frame)
+        slider_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        ttk.Label(slider_frame, text="rто:").pack(side=tk.LEFT)
+        self.rto_scale = ttk.Scale(slider_frame, from_=10, to=500, orient=tk.HORIZONTAL, command=self.on_rto_slide)
+        self.rto_scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.rto_scale.bind("<ButtonRelease-1>", self.on_rto_release)
+        self.slider_var = tk.StringVar()
+        ttk.Label(slider_frame, textvariable=self.slider_var, width=10).pack(side=tk.LEFT)
         
         self.canvas = FigureCanvasTkAgg(self.fig, master=plot_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.setup_plots()
         
         # Статус бар
         self.status_var = tk.StringVar(value="Введите данные и нажмите 'Рассчитать'")
@@ -141,117 +229,188 @@ class TechUtilizationCalculator:
             # Расчет оптимального периода между ТО
             rto_opt = math.sqrt(2 * Tto * T)
             
-            # Очищаем текстовое поле
-            self.result_text.delete(1.0, tk.END)
-            
-            # Заголовок результатов
-            self.result_text.insert(tk.END, "="*60 + "\n")
-            self.result_text.insert(tk.END, "РАСЧЕТ КОЭФФИЦИЕНТА ТЕХНИЧЕСКОГО ИСПОЛЬЗОВАНИЯ\n")
-            self.result_text.insert(tk.END, "="*60 + "\n\n")
-            
-            # Исходные данные
-            self.result_text.insert(tk.END, "ИСХОДНЫЕ ДАННЫЕ:\n")
-            self.result_text.insert(tk.END, "-"*40 + "\n")
-            self.result_text.insert(tk.END, f"Средняя наработка на отказ T = {T:.2f} ч\n")
-            self.result_text.insert(tk.END, f"Среднее время восстановления Tв = {Tb:.2f} ч\n")
-            self.result_text.insert(tk.END, f"Средняя продолжительность ТО Tто = {Tto:.2f} ч\n")
-            self.result_text.insert(tk.END, f"Период между ТО rто = {rto:.2f} ч\n\n")
-            
-            # Промежуточные расчеты
-            self.result_text.insert(tk.END, "ПРОМЕЖУТОЧНЫЕ РАСЧЕТЫ:\n")
-            self.result_text.insert(tk.END, "-"*40 + "\n")
-            self.result_text.insert(tk.END, f"Интенсивность отказов λ = 1/T = {lambda_rate:.6f} 1/ч\n")
-            self.result_text.insert(tk.END, f"Интенсивность восстановления μ = 1/Tв = {mu_rate:.6f} 1/ч\n")
-            self.result_text.insert(tk.END, f"Коэффициент готовности Kг = T/(T+Tв) = {Kg:.6f}\n")
-            self.result_text.insert(tk.END, f"Коэффициент простоя Kп = Tв/(T+Tв) = {Kp:.6f}\n")
-            self.result_text.insert(tk.END, f"Среднее число отказов за период ТО = T/rто = {n_failures:.4f}\n\n")
-            
-            # Основные результаты
-            self.result_text.insert(tk.END, "РЕЗУЛЬТАТЫ РАСЧЕТА:\n")
-            self.result_text.insert(tk.END, "-"*40 + "\n")
-            
-            self.result_text.insert(tk.END, "ПОЛНАЯ ФОРМУЛА (с учетом периодичности ТО):\n")
-            self.result_text.insert(tk.END, f"Kти = T / (T + Tв + (T × Tто)/rто) = \n")
-            self.result_text.insert(tk.END, f"     = {T:.2f} / ({T:.2f} + {Tb:.2f} + ({T:.2f} × {Tto:.2f})/{rto:.2f})\n")
-            self.result_text.insert(tk.END, f"     = {Kti_full:.8f}\n")
-            self.result_text.insert(tk.END, f"     = {Kti_full*100:.4f}%\n\n")
-            
-            self.result_text.insert(tk.END, "УПРОЩЕННАЯ ФОРМУЛА (без учета периодичности):\n")
-            self.result_text.insert(tk.END, f"Kти(упр) = T / (T + Tв + Tто) = \n")
-            self.result_text.insert(tk.END, f"         = {T:.2f} / ({T:.2f} + {Tb:.2f} + {Tto:.2f})\n")
-            self.result_text.insert(tk.END, f"         = {Kti_simple:.8f}\n")
-            self.result_text.insert(tk.END, f"         = {Kti_simple*100:.4f}%\n\n")
-            
-            self.result_text.insert(tk.END, f"Разница между формулами: {abs(Kti_full - Kti_simple)*100:.4f}%\n\n")
-            
-            self.result_text.insert(tk.END, "ОПТИМАЛЬНЫЙ ПЕРИОД МЕЖДУ ТО:\n")
-            self.result_text.insert(tk.END, f"rто(опт) = √(2 × Tто × T) = √(2 × {Tto:.2f} × {T:.2f}) = {rto_opt:.2f} ч\n")
-            self.result_text.insert(tk.END, f"Текущий период rто = {rto:.2f} ч\n")
-            
             if rto < rto_opt:
-                self.result_text.insert(tk.END, "▶ Рекомендуется увеличить период между ТО\n")
+                advice = "▶ Рекомендуется увеличить период между ТО"
             elif rto > rto_opt:
-                self.result_text.insert(tk.END, "▶ Рекомендуется уменьшить период между ТО\n")
+                advice = "▶ Рекомендуется уменьшить период между ТО"
             else:
-                self.result_text.insert(tk.END, "✓ Период между ТО оптимальный\n")
+                advice = "✓ Период между ТО оптимальный"
+            
+            # Оптимизация rто и Tто с ограничениями по затратам и простою
+            optimum = reliability_core.optimize_maintenance(
+                T, Tb, Tto, rto, float(self.cost_var.get()), float(self.budget_var.get()),
+                float(self.downtime_var.get()) / 100, float(self.tto_min_var.get())
+            )
+            period = optimum['period']
+            if period is None:
+                period_text = f"По rто при Tто = {Tto:.2f} ч: ограничения несовместны"
+            else:
+                period_text = (f"По rто при Tто = {Tto:.2f} ч: rто = {period['rto']:.2f} ч, "
+                               f"Kти = {period['kti']:.4%}, затраты = {period['cost']:.3f} усл. ед./ч")
+            joint = optimum['joint']
+            if joint is None:
+                joint_text = "Совместно по rто и Tто: ограничения несовместны"
+            else:
+                joint_text = (f"Совместно: rто = {joint['rto']:.2f} ч, Tто = {joint['Tto']:.2f} ч, "
+                              f"Kти = {joint['kti']:.4%}, затраты = {joint['cost']:.3f} усл. ед./ч")
+            
+            # Отчет собирается по шаблону и выводится одним вызовом
+            self.report.begin()
+            self.report.add(KTI_REPORT, T=T, Tb=Tb, Tto=Tto, rto=rto, lambda_rate=lambda_rate, mu_rate=mu_rate,
+                            Kg=Kg, Kp=Kp, n_failures=n_failures, Kti_full=Kti_full, Kti_simple=Kti_simple,
+                            difference=abs(Kti_full - Kti_simple), rto_opt=rto_opt, advice=advice)
+            self.report.add(OPT_REPORT, current_kti=optimum['current']['kti'],
+                            current_cost=optimum['current']['cost'], period=period_text, joint=joint_text)
+            self.report.render()
             
             # Обновляем графики
-            self.update_plots(T, Tb, Tto, rto, Kti_full, Kg)
+            self.update_plots(T, Tb, Tto, rto, Kti_full, Kg, optimum)
             
             self.status_var.set(f"Расчет выполнен. Kти = {Kti_full*100:.2f}%")
-            
+        
         except ValueError:
             messagebox.showerror("Ошибка", "Введите корректные числовые значения")
         except Exception as e:
             messagebox.showerror("Ошибка", f"Произошла ошибка: {str(e)}")
     
-    def update_plots(self, T, Tb, Tto, rto, Kti, Kg):
-        """Обновление графиков"""
-        # Очищаем оси
-        self.ax1.clear()
-        self.ax2.clear()
+    def setup_plots(self):
+        """Создание всех элементов графиков один раз - далее меняются только их данные"""
+        self.params = None
+        self.background = None
+        self.slide_job = None
+        self.slider_rto = None
+        self.setting_scale = False
         
         # График 1: Зависимость Kти от периода ТО
-        r_values = np.linspace(10, 500, 100)
-        kti_values = T / (T + Tb + (T * Tto) / r_values)
-        
-        self.ax1.plot(r_values, kti_values * 100, 'b-', linewidth=2, label='Kти(rто)')
-        self.ax1.axhline(y=Kg*100, color='r', linestyle='--', label=f'Kг = {Kg*100:.1f}%')
-        self.ax1.axvline(x=rto, color='g', linestyle='--', label=f'Текущий rто = {rto:.0f}')
-        
-        # Оптимальная точка
-        rto_opt = math.sqrt(2 * Tto * T)
-        kti_opt = T / (T + Tb + (T * Tto) / rto_opt)
-        self.ax1.plot(rto_opt, kti_opt * 100, 'ro', markersize=8, label=f'Оптимум: rто={rto_opt:.0f}')
-        
+        self.kti_line, = self.ax1.plot([], [], 'b-', linewidth=2, label='Kти(rто), полная формула')
+        self.hidden_line, = self.ax1.plot([], [], 'm-', linewidth=1.5, label='Kти со скрытыми отказами')
+        self.kg_line = self.ax1.axhline(y=0, color='r', linestyle='--', label='Kг')
+        self.rto_line = self.ax1.axvline(x=0, color='g', linestyle='--', label='Текущий rто', animated=True)
+        self.rto_point, = self.ax1.plot([], [], 'go', markersize=6, animated=True)
+        self.opt_point, = self.ax1.plot([], [], 'ro', markersize=8, label='Оптимум (скрытые отказы)')
         self.ax1.set_xlabel('Период между ТО rто (часы)')
         self.ax1.set_ylabel('Kти, %')
         self.ax1.set_title('Зависимость Kти от периода ТО')
         self.ax1.grid(True, alpha=0.3)
-        self.ax1.legend(loc='best')
+        self.ax1_legend = self.ax1.legend(loc='best')
+        self.ax1.set_xlim([0, 510])
         self.ax1.set_ylim([90, 100])
         
         # График 2: Сравнение коэффициентов
         categories = ['Kг', 'Kти (полн)', 'Kти (упр)']
-        values = [Kg * 100, Kti * 100, (T / (T + Tb + Tto)) * 100]
         colors = ['#2ecc71', '#3498db', '#e74c3c']
-        
-        bars = self.ax2.bar(categories, values, color=colors, alpha=0.7)
+        self.bars = self.ax2.bar(categories, [0, 0, 0], color=colors, alpha=0.7)
+        self.bar_labels = [
+            self.ax2.text(bar.get_x() + bar.get_width()/2., 0, '', ha='center', va='bottom', fontweight='bold')
+            for bar in self.bars
+        ]
         self.ax2.set_ylabel('Значение, %')
         self.ax2.set_title('Сравнение коэффициентов')
         self.ax2.set_ylim([90, 100])
+        self.ax2.grid(True, alpha=0.3, axis='y')
         
-        # Добавляем значения на столбцы
-        for bar, val in zip(bars, values):
-            height = bar.get_height()
-            self.ax2.text(bar.get_x() + bar.get_width()/2., height + 0.2,
-                         f'{val:.2f}%', ha='center', va='bottom', fontweight='bold')
+        # График 3: Фронт Парето Kти - затраты на ТО
+        self.front_line, = self.ax3.plot([], [], 'b-', linewidth=2, label='Фронт Парето')
+        self.current_point, = self.ax3.plot([], [], 'gs', label='Текущий режим', animated=True)
+        self.joint_point, = self.ax3.plot([], [], 'ro', markersize=8, label='Оптимум')
+        self.budget_line = self.ax3.axvline(x=0, color='gray', linestyle='--', label='Бюджет')
+        self.ax3.set_xlabel('Затраты на ТО (усл. ед./ч)')
+        self.ax3.set_ylabel('Kти со скрытыми отказами, %')
+        self.ax3.set_title('Kти и затраты на ТО')
+        self.ax3.set_ylim([80, 100])
+        self.ax3.grid(True, alpha=0.3)
+        self.ax3.legend(loc='lower right', fontsize=8)
         
-        self.ax2.grid(True, alpha=0.3, axis='y')
+        self.markers = (self.rto_line, self.rto_point, self.current_point)
+        self.fig.tight_layout(pad=1.5)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+    
+    def update_plots(self, T, Tb, Tto, rto, Kti, Kg, optimum):
+        """Обновление данных графиков без пересоздания элементов"""
+        self.params = (T, Tb, Tto, float(self.cost_var.get()))
+        budget = float(self.budget_var.get())
+        # диапазон по rто расширяется, чтобы введенное значение не обрезалось ползунком и осью
+        low, high = min(10, rto), max(500, rto)
+        self.r_values = np.linspace(low, high, 100)
         
-        # Обновляем канву
-        self.fig.tight_layout()
-        self.canvas.draw()
+        # График 1
+        self.kti_line.set_data(self.r_values, T / (T + Tb + (T * Tto) / self.r_values) * 100)
+        self.hidden_line.set_data(self.r_values, reliability_core.kti(T, Tb, Tto, self.r_values) * 100)
+        self.kg_line.set_ydata([Kg * 100, Kg * 100])
+        period = optimum['period']
+        self.opt_point.set_data([period['rto']] if period else [], [period['kti'] * 100] if period else [])
+        legend_texts = self.ax1_legend.get_texts()
+        legend_texts[2].set_text(f'Kг = {Kg*100:.1f}%')
+        legend_texts[4].set_text(f"Оптимум (скрытые отказы): rто={period['rto']:.0f}" if period else "Оптимум: нет")
+        self.ax1.set_xlim([0, high * 1.02])
+        
+        # График 2
+        values = [Kg * 100, Kti * 100, (T / (T + Tb + Tto)) * 100]
+        for bar, label, val in zip(self.bars, self.bar_labels, values):
+            bar.set_height(val)
+            label.set_y(val + 0.2)
+            label.set_text(f'{val:.2f}%')
+        
+        # График 3
+        costs, kti_values = optimum['front']
+        step = max(1, len(costs) // 300)
+        self.front_line.set_data(costs[::step], kti_values[::step] * 100)
+        joint = optimum['joint']
+        self.joint_point.set_data([joint['cost']] if joint else [], [joint['kti'] * 100] if joint else [])
+        self.budget_line.set_xdata([budget, budget])
+        self.ax3.set_xlim([0, 3 * budget])
+        
+        self.move_markers(rto)
+        # set() вызывает command ползунка, программная установка маркеры не двигает
+        self.setting_scale = True
+        try:
+            self.rto_scale.configure(from_=low, to=high)
+            self.rto_scale.set(rto)
+        finally:
+            self.setting_scale = False
+        self.canvas.draw_idle()
+    
+    def move_markers(self, rto):
+        """Положение маркеров текущего rто на графиках 1 и 3"""
+        T, Tb, Tto, cost = self.params
+        kti = reliability_core.kti(T, Tb, Tto, rto)
+        self.rto_line.set_xdata([rto, rto])
+        self.rto_point.set_data([rto], [T / (T + Tb + (T * Tto) / rto) * 100])
+        self.current_point.set_data([reliability_core.maintenance_cost(cost, Tto, Tto, rto)], [kti * 100])
+        self.slider_var.set(f"{rto:.0f} ч")
+    
+    def on_draw(self, event):
+        """После полной перерисовки запоминаем фон без маркеров и дорисовываем маркеры"""
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self.markers:
+            self.fig.draw_artist(artist)
+    
+    def on_rto_slide(self, value):
+        if self.setting_scale:
+            return
+        self.slider_rto = float(value)
+        # не чаще ~60 кадров в секунду
+        if self.slide_job is None:
+            self.slide_job = self.root.after(16, self.blit_markers)
+    
+    def blit_markers(self):
+        self.slide_job = None
+        if self.params is None or self.background is None or self.slider_rto is None:
+            return
+        self.move_markers(self.slider_rto)
+        self.canvas.restore_region(self.background)
+        for artist in self.markers:
+            self.fig.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+    
+    def on_rto_release(self, event):
+        """По окончании перетаскивания - полный пересчет с новым rто"""
+        # щелчок без перемещения ползунка введенное значение не меняет
+        if self.slider_rto is None:
+            return
+        self.rto_var.set(f"{self.slider_rto:.0f}")
+        self.slider_rto = None
+        self.calculate_kti()
 
 def main():
     root = tk.Tk()
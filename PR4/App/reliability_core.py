@@ -0,0 +1,111 @@
+import math
+import numpy as np
+
+def kti(T, Tb, Tto, rto):
+    """Kти с учетом скрытых отказов: 1 / (1 + Tв/T + Tто/rто + rто/(2T)).
+    
+    Отказ, возникший между ТО, в среднем обнаруживается через rто/2, поэтому к простою
+    на ТО добавляется rто/(2T). Максимум по rто - классическое rто = √(2·Tто·T).
+    Аргументы могут быть массивами NumPy (вычисление по сетке за один проход).
+    """
+    return 1 / (1 + Tb / T + Tto / rto + rto / (2 * T))
+
+def maintenance_cost(cost, Tto_nominal, Tto, rto):
+    """Затраты на ТО в единицу времени: сокращение ТО до Tто обходится пропорционально дороже"""
+    return cost * Tto_nominal / (Tto * rto)
+
+def optimal_period(T, Tto, rto_min=0.0, rto_max=math.inf):
+    """Оптимальный rто при заданном Tто: простой выпуклый по rто, поэтому оптимум с ограничениями -
+    это замкнутое решение, приведенное к допустимому отрезку"""
+    return min(max(math.sqrt(2 * Tto * T), rto_min), rto_max)
+
+def downtime_interval(T, Tb, Tto, max_downtime):
+    """Отрезок rто, на котором доля простоя 1 - Kти не превышает max_downtime, или None.
+    
+    Условие сводится к квадратному неравенству rто² - 2T·c·rто + 2T·Tто <= 0,
+    где c = D/(1-D) - Tв/T.
+    """
+    if max_downtime >= 1:
+        return 0.0, math.inf
+    c = max_downtime / (1 - max_downtime) - Tb / T
+    disc = (T * c) ** 2 - 2 * T * Tto
+    if c <= 0 or disc < 0:
+        return None
+    root = math.sqrt(disc)
+    return T * c - root, T * c + root
+
+def pareto_front(costs, values):
+    """Недоминируемые точки (меньше затраты, больше Kти)"""
+    order = np.argsort(costs, kind='stable')
+    costs, values = costs[order], values[order]
+    best = np.maximum.accumulate(values)
+    keep = np.empty(len(values), dtype=bool)
+    keep[0] = True
+    keep[1:] = values[1:] > best[:-1]
+    return costs[keep], values[keep]
+
+def optimize_maintenance(T, Tb, Tto, rto, cost, budget, max_downtime, Tto_min, grid_size=(400, 200)):
+    """Оптимизация периодичности и продолжительности ТО.
+    
+    Везде используется модель Kти со скрытыми отказами (kti). По rто при текущем Tто -
+    замкнутое решение с учетом бюджета и доли простоя. Совместно по rто и Tто -
+    векторная оценка Kти на сетке дает начальную точку, которую уточняет SLSQP
+    с ограничениями на затраты и долю простоя. По той же сетке строится фронт Парето
+    Kти - затраты на ТО.
+    """
+    if min(T, Tb, Tto, rto, cost, budget, max_downtime, Tto_min) <= 0:
+        raise ValueError("Все значения должны быть положительными числами")
+    Tto_max = max(Tto, Tto_min) * 4
+    
+    # по rто: бюджет ограничивает период снизу, доля простоя - отрезком допустимых rто
+    rto_min = maintenance_cost(cost, Tto, Tto, 1.0) / budget
+    period = None
+    allowed = downtime_interval(T, Tb, Tto, max_downtime)
+    if allowed is not None and max(rto_min, allowed[0]) <= allowed[1]:
+        rto_best = optimal_period(T, Tto, max(rto_min, allowed[0]), allowed[1])
+        period = {
+            'rto': rto_best,
+            'kti': kti(T, Tb, Tto, rto_best),
+            'cost': maintenance_cost(cost, Tto, Tto, rto_best),
+            'unconstrained': math.sqrt(2 * Tto * T)
+        }
+    
+    # совместно по rто и Tто: сетка
+    r = np.geomspace(1.0, 10 * T, grid_size[0])[:, None]
+    tau = np.linspace(Tto_min, Tto_max, grid_size[1])[None, :]
+    values = kti(T, Tb, tau, r)
+    costs = maintenance_cost(cost, Tto, tau, r)
+    feasible = (costs <= budget) & (1 - values <= max_downtime)
+    front = pareto_front(costs.ravel(), values.ravel())
+    
+    joint = None
+    if feasible.any():
+        from scipy.optimize import minimize
+        
+        i, j = np.unravel_index(np.argmax(np.where(feasible, values, -np.inf)), values.shape)
+        # оптимизация в логарифмах rто для равномерного масштаба переменных
+        result = minimize(
+            lambda x: -kti(T, Tb, x[1], math.exp(x[0])),
+            x0=[math.log(r[i, 0]), tau[0, j]],
+            method='SLSQP',
+            bounds=[(0.0, math.log(10 * T)), (Tto_min, Tto_max)],
+            constraints=[
+                {'type': 'ineq', 'fun': lambda x: budget - maintenance_cost(cost, Tto, x[1], math.exp(x[0]))},
+                {'type': 'ineq', 'fun': lambda x: max_downtime - 1 + kti(T, Tb, x[1], math.exp(x[0]))}
+            ],
+            options={'ftol': 1e-12}
+        )
+        best = (math.exp(result.x[0]), result.x[1]) if result.success else (r[i, 0], tau[0, j])
+        joint = {
+            'rto': best[0],
+            'Tto': float(best[1]),
+            'kti': float(kti(T, Tb, best[1], best[0])),
+            'cost': float(maintenance_cost(cost, Tto, best[1], best[0]))
+        }
+    
+    return {
+        'current': {'kti': kti(T, Tb, Tto, rto), 'cost': maintenance_cost(cost, Tto, Tto, rto)},
+        'period': period,
+        'joint': joint,
+        'front': front
+    }
@@ -4,6 +4,59 @@ import math
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
+from report_builder import ReportBuilder
+
+STATS_REPORT = """ИСХОДНЫЕ ДАННЫЕ:
+----------------------------------------
+Количество ошибок: {n}
+Времена коррекции (мин):
+{columns}
+
+СТАТИСТИЧЕСКИЕ ПОКАЗАТЕЛИ:
+----------------------------------------
+Суммарное время: {sum_times:.2f} мин
+Минимальное время: {min_time:.2f} мин
+Максимальное время: {max_time:.2f} мин
+Медиана: {median_time:.2f} мин
+Дисперсия: {variance:.4f}
+Ср. кв. отклонение: {std_dev:.4f} мин
+Коэффициент вариации: {cv:.4f}"""
+
+RESULT_REPORT = """============================================================
+РЕЗУЛЬТАТ РАСЧЕТА ПО ВАРИАНТУ 5
+============================================================
+
+ЗАДАНИЕ:
+В системе было зафиксировано 10 ошибок.
+Время на их идентификацию и исправление составило:
+{times} минут
+
+РЕШЕНИЕ:
+------------------------------------------------------------
+Среднее время коррекции информации Tи вычисляется по формуле:
+
+      1   N
+Tи = - * Σ ti
+      N  i=1
+
+где:
+N = 10 - количество ошибок
+ti - время коррекции i-й ошибки
+
+ПОДСТАНОВКА ЗНАЧЕНИЙ:
+Tи = (1/10) * ({terms})
+Tи = (1/10) * {sum_times:.2f}
+
+РЕЗУЛЬТАТ:
+════════════════════════════════════════════════════════════
+Среднее время коррекции информации Tи = {mean_time:.2f} минут
+════════════════════════════════════════════════════════════
+
+ДОПОЛНИТЕЛЬНАЯ ИНФОРМАЦИЯ:
+------------------------------------------------------------
+• Доверительный интервал (95%): [{ci_lower:.2f}; {ci_upper:.2f}] мин
+• С вероятностью 95% истинное среднее время коррекции
+  находится в указанном интервале"""
 
 class ReliabilityCalculator:
     def __init__(self, root):
@@ -64,6 +117,7 @@ class ReliabilityCalculator:
         
         self.stats_text = tk.Text(stats_frame, height=10, width=40, font=("Consolas", 10))
         self.stats_text.pack(fill=tk.BOTH, expand=True)
+        self.stats_report = ReportBuilder(self.stats_text, width=40)
         
         # Правая панель - результаты и графики
         right_frame = ttk.Frame(main_container)
@@ -75,6 +129,7 @@ class ReliabilityCalculator:
         
         self.result_text = tk.Text(result_frame, height=15, font=("Consolas", 11))
         self.result_text.pack(fill=tk.BOTH, expand=True)
+        self.result_report = ReportBuilder(self.result_text)
         
         # График
         plot_frame = ttk.LabelFrame(right_frame, text="Визуализация", padding=10)
@@ -152,69 +207,20 @@ class ReliabilityCalculator:
             ci_lower = mean_time - margin_error
             ci_upper = mean_time + margin_error
             
-            # Очищаем текстовые поля
-            self.result_text.delete(1.0, tk.END)
-            self.stats_text.delete(1.0, tk.END)
-            
-            # Вывод исходных данных
-            self.stats_text.insert(tk.END, "ИСХОДНЫЕ ДАННЫЕ:\n")
-            self.stats_text.insert(tk.END, "-" * 40 + "\n")
-            self.stats_text.insert(tk.END, f"Количество ошибок: {n}\n")
-            self.stats_text.insert(tk.END, f"Времена коррекции (мин):\n")
-            
             # Выводим времена в несколько столбцов
-            for i, t in enumerate(times):
-                self.stats_text.insert(tk.END, f"{t:8.2f}")
-                if (i + 1) % 5 == 0:
-                    self.stats_text.insert(tk.END, "\n")
-            self.stats_text.insert(tk.END, "\n\n")
-            
-            self.stats_text.insert(tk.END, "СТАТИСТИЧЕСКИЕ ПОКАЗАТЕЛИ:\n")
-            self.stats_text.insert(tk.END, "-" * 40 + "\n")
-            self.stats_text.insert(tk.END, f"Суммарное время: {sum_times:.2f} мин\n")
-            self.stats_text.insert(tk.END, f"Минимальное время: {min_time:.2f} мин\n")
-            self.stats_text.insert(tk.END, f"Максимальное время: {max_time:.2f} мин\n")
-            self.stats_text.insert(tk.END, f"Медиана: {median_time:.2f} мин\n")
-            self.stats_text.insert(tk.END, f"Дисперсия: {variance:.4f}\n")
-            self.stats_text.insert(tk.END, f"Ср. кв. отклонение: {std_dev:.4f} мин\n")
-            self.stats_text.insert(tk.END, f"Коэффициент вариации: {cv:.4f}\n")
-            
-            # Вывод результатов
-            self.result_text.insert(tk.END, "=" * 60 + "\n")
-            self.result_text.insert(tk.END, "РЕЗУЛЬТАТ РАСЧЕТА ПО ВАРИАНТУ 5\n")
-            self.result_text.insert(tk.END, "=" * 60 + "\n\n")
-            
-            self.result_text.insert(tk.END, "ЗАДАНИЕ:\n")
-            self.result_text.insert(tk.END, "В системе было зафиксировано 10 ошибок.\n")
-            self.result_text.insert(tk.END, "Время на их идентификацию и исправление составило:\n")
-            self.result_text.insert(tk.END, f"{', '.join([str(t) for t in times])} минут\n\n")
-            
-            self.result_text.insert(tk.END, "РЕШЕНИЕ:\n")
-            self.result_text.insert(tk.END, "-" * 60 + "\n")
+            columns = "".join(f"{t:8.2f}" + ("\n" if (i + 1) % 5 == 0 else "") for i, t in enumerate(times))
             
-            self.result_text.insert(tk.END, "Среднее время коррекции информации Tи вычисляется по формуле:\n\n")
-            self.result_text.insert(tk.END, "      1   N\n")
-            self.result_text.insert(tk.END, "Tи = - * Σ ti\n")
-            self.result_text.insert(tk.END, "      N  i=1\n\n")
+            # Отчеты собираются по шаблонам и выводятся одним вызовом на поле
+            self.stats_report.begin()
+            self.stats_report.add(STATS_REPORT, n=n, columns=columns, sum_times=sum_times, min_time=min_time,
+                                  max_time=max_time, median_time=median_time, variance=variance, std_dev=std_dev, cv=cv)
+            self.stats_report.render()
             
-            self.result_text.insert(tk.END, "где:\n")
-            self.result_text.insert(tk.END, "N = 10 - количество ошибок\n")
-            self.result_text.insert(tk.END, "ti - время коррекции i-й ошибки\n\n")
-            
-            self.result_text.insert(tk.END, "ПОДСТАНОВКА ЗНАЧЕНИЙ:\n")
-            self.result_text.insert(tk.END, f"Tи = (1/10) * ({' + '.join([str(t) for t in times])})\n")
-            self.result_text.insert(tk.END, f"Tи = (1/10) * {sum_times:.2f}\n\n")
-            
-            self.result_text.insert(tk.END, "РЕЗУЛЬТАТ:\n")
-            self.result_text.insert(tk.END, "═" * 60 + "\n")
-            self.result_text.insert(tk.END, f"Среднее время коррекции информации Tи = {mean_time:.2f} минут\n")
-            self.result_text.insert(tk.END, "═" * 60 + "\n\n")
-            
-            self.result_text.insert(tk.END, "ДОПОЛНИТЕЛЬНАЯ ИНФОРМАЦИЯ:\n")
-            self.result_text.insert(tk.END, "-" * 60 + "\n")
-            self.result_text.insert(tk.END, f"• Доверительный интервал (95%): [{ci_lower:.2f}; {ci_upper:.2f}] мин\n")
-            self.result_text.insert(tk.END, f"• С вероятностью 95% истинное среднее время коррекции\n")
-            self.result_text.insert(tk.END, f"  находится в указанном интервале\n")
+            self.result_report.begin()
+            self.result_report.add(RESULT_REPORT, times=', '.join([str(t) for t in times]),
+                                   terms=' + '.join([str(t) for t in times]), sum_times=sum_times,
+                                   mean_time=mean_time, ci_lower=ci_lower, ci_upper=ci_upper)
+            self.result_report.render()
             
             # Обновляем графики
             self.update_plots(times, mean_time, std_dev, ci_lower, ci_upper)
@@ -237,15 +243,10 @@ class ReliabilityCalculator:
         sum_times = sum(times)
         mean_time = sum_times / n
         
-        # Очищаем текстовые поля
-        self.result_text.delete(1.0, tk.END)
-        
-        self.result_text.insert(tk.END, "=" * 60 + "\n")
-        self.result_text.insert(tk.END, "РЕЗУЛЬТАТ РАСЧЕТА ПО ВАРИАНТУ 5\n")
-        self.result_text.insert(tk.END, "=" * 60 + "\n\n")
-        
-        self.result_text.insert(tk.END, f"Среднее время коррекции информации Tи = {mean_time:.2f} минут\n\n")
-        self.result_text.insert(tk.END, f"(рассчитано по {n} значениям)\n")
+        self.result_report.begin().rule().add("РЕЗУЛЬТАТ РАСЧЕТА ПО ВАРИАНТУ 5").rule().add()
+        self.result_report.add("Среднее время коррекции информации Tи = {mean_time:.2f} минут\n", mean_time=mean_time)
+        self.result_report.add("(рассчитано по {n} значениям)", n=n)
+        self.result_report.render()
     
     def update_plots(self, times, mean_time, std_dev, ci_lower, ci_upper):
         """Обновление графиков"""
@@ -292,8 +293,8 @@ class ReliabilityCalculator:
     def clear_fields(self):
         """Очищает поля ввода"""
         self.times_text.delete(1.0, tk.END)
-        self.result_text.delete(1.0, tk.END)
-        self.stats_text.delete(1.0, tk.END)
+        self.result_report.clear()
+        self.stats_report.clear()
         self.status_var.set("Поля очищены")
         
         # Очищаем графики